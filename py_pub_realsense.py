@@ -30,11 +30,8 @@ def main():
         # start = time.perf_counter()
         frames = pipeline.wait_for_frames()
         color_frame = frames.get_color_frame()
-        img = bytes(color_frame.get_data())
-        info = commonCamera_640480(
-            image=img,
-        )
-        pub.write(info)
+        # written straight from the frame buffer, no bytes()/dataclass copy
+        pub.write(color_frame.get_data())
         
         # time.sleep(max(1/60 - abs(time.perf_counter() - start), 0))
 
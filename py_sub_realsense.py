@@ -1,40 +1,48 @@
 import numpy as np
 # import cv2
 
-import time
+import threading
 import cv2
 
-from teleai_dds_wrapper.wrapper import TeleaiCommonSub_1q
+from teleai_dds_wrapper.wrapper import TeleaiCommonSub_1q, TeleaiScheduler
 from teleai_dds_wrapper.commonInfo.msg.dds_._commoninfo import commonCamera_640480
 
 def main():
     sub = TeleaiCommonSub_1q(domain_id=0,
                             topic = "rt/commonCamera_t",
-                            struct_type=commonCamera_640480
+                            struct_type=commonCamera_640480,
+                            array_shape=(480, 640, 3),
                             )
     print("sub waiting.")
     sub.wait_for_connection()
     print("sub start.")
 
 
+    # 30 Hz on absolute deadlines instead of sleep(1/30 - elapsed)
+    done = threading.Event()
     cnt = 0
-    while True:
-        start = time.perf_counter()
-        msg = sub.read()
-    
-        img_bytes = msg.image
-        img_array = np.frombuffer(img_bytes, dtype=np.uint8).reshape((480, 640, 3))
+    def show():
+        nonlocal cnt
+        # read-only (480, 640, 3) uint8 view over the received sample, None if no new frame came in time
+        img_array = sub.read(timeout=1/30)
+        if img_array is None:
+            return
         
-        # print((time.time_ns() - nanots) / 1e6)
         # cv2.imshow('Received RealSense Stream', img_array)
-        # if cv2.waitKey(1) & 0xFF == ord('q'):
-        #     cv2.destroyAllWindows()
-        #     return -1
+        # cv2.waitKey(1)
         if cnt >= 99:
-            cv2.imwrite("test.png", img_array)
-            break
+            if not done.is_set():
+                cv2.imwrite("test.png", img_array)
+                done.set()
+            return
         cnt += 1
-        time.sleep(max(1/30 - (time.perf_counter() - start), 0))
+
+    sched = TeleaiScheduler()
+    sched.add(show, 30)
+    sched.start()
+    done.wait()
+    sched.stop()
+    print(sched.stats())
 
 if __name__ == "__main__":
     main()
\ No newline at end of file
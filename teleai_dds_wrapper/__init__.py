@@ -1,16 +1,52 @@
-from . import commonInfo
-from ._bootstrap import _check_and_start_roudi
-from .wrapper.wrapper import TeleaiCommonPub_1, TeleaiCommonSub_1, TeleaiCommonSub_1q
-from .wrapper import TeleaiCommonPub_1, TeleaiCommonSub_1, TeleaiCommonSub_1q
 from pathlib import Path
-import multiprocessing
-multiprocessing.set_start_method("spawn", force=True)
+import importlib
 
+from ._bootstrap import ROUDI_EXECUTABLE, EXPECTED_CONFIG_PATH
+
+# Importing the package has no side effects: cyclonedds and the wrappers are loaded on first
+# attribute access, and RouDi is checked when the first participant is created (see _bootstrap.ensure_roudi).
 package_root = Path(__file__).parent.resolve()
-ROUDI_EXECUTABLE = "iox-roudi"
-EXPECTED_CONFIG_PATH = f"{package_root}/configs/shm_confil.toml"
-_check_and_start_roudi(ROUDI_EXECUTABLE, EXPECTED_CONFIG_PATH)
+
+_LAZY = {
+    "commonInfo": (".commonInfo", None),
+    "TeleaiCommonPub_1": (".wrapper", "TeleaiCommonPub_1"),
+    "TeleaiCommonSub_1": (".wrapper", "TeleaiCommonSub_1"),
+    "TeleaiCommonSub_1q": (".wrapper", "TeleaiCommonSub_1q"),
+    "AsyncTeleaiPub": (".wrapper", "AsyncTeleaiPub"),
+    "AsyncTeleaiSub": (".wrapper", "AsyncTeleaiSub"),
+    "TeleaiRingSub": (".wrapper", "TeleaiRingSub"),
+    "TeleaiFanoutSub": (".wrapper", "TeleaiFanoutSub"),
+    "TeleaiKeyedSub": (".wrapper", "TeleaiKeyedSub"),
+    "TeleaiSync": (".wrapper", "TeleaiSync"),
+    "TeleaiRecorder": (".wrapper", "TeleaiRecorder"),
+    "TeleaiLog": (".wrapper", "TeleaiLog"),
+    "TeleaiReplayer": (".wrapper", "TeleaiReplayer"),
+    "TeleaiScheduler": (".wrapper", "TeleaiScheduler"),
+    "TeleaiRpcClient": (".wrapper", "TeleaiRpcClient"),
+    "TeleaiRpcServer": (".wrapper", "TeleaiRpcServer"),
+    "RpcError": (".wrapper", "RpcError"),
+    "TeleaiTensor": (".wrapper", "TeleaiTensor"),
+    "TeleaiClockSync": (".wrapper", "TeleaiClockSync"),
+    "qos_profile": (".wrapper", "qos_profile"),
+    "qos_profiles": (".wrapper", "qos_profiles"),
+    "register_qos_profile": (".wrapper", "register_qos_profile"),
+    "load_qos_profiles": (".wrapper", "load_qos_profiles"),
+    "ensure_roudi": ("._bootstrap", "ensure_roudi"),
+}
+
+def __getattr__(name):
+    if name not in _LAZY:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    module_name, attr = _LAZY[name]
+    module = importlib.import_module(module_name, __name__)
+    value = module if attr is None else getattr(module, attr)
+    globals()[name] = value
+    return value
+
+def __dir__():
+    return sorted(list(globals()) + list(_LAZY))
+
+__all__ = list(_LAZY)
 
 __version__ = "0.1.1"
 __version_info__ = tuple(map(int, __version__.split('.')))
-
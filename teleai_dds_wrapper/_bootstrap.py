@@ -1,14 +1,26 @@
-import psutil
 import subprocess
+import threading
 import time
+import socket
+from pathlib import Path
 from teleai_dds_wrapper.utils import logger
 import os
 
+ROUDI_EXECUTABLE = "iox-roudi"
+EXPECTED_CONFIG_PATH = str(Path(__file__).parent.resolve() / "configs" / "shm_confil.toml")
+# iceoryx RouDi endpoints: the unix datagram socket runtimes register on and the management segment.
+ROUDI_SOCKET_PATH = "/tmp/roudi"
+ROUDI_MGMT_SHM_PATH = "/dev/shm/iceoryx_mgmt"
+
+_roudi_lock = threading.Lock()
+_roudi_ready:dict = {}   # pid -> bool, so a forked child checks again
+
 def _get_running_roudi_process():
     """
     find iox-roudi process.
     return: psutil.Process | None
     """
+    import psutil
     for proc in psutil.process_iter(['pid', 'name', 'cmdline']):
         try:
             if proc.info['name'] and 'iox-roudi' in proc.info['name']:
@@ -28,12 +40,14 @@ def _is_config_match(proc, config_path):
         logger.info(f"[RouDi Monitor] Found process PID {proc.pid}, but config doesn't match.")
         logger.info(f"[RouDi Monitor] Current cmdline: {cmdline}")
         return False
-    except (psutil.NoSuchProcess, psutil.AccessDenied):
+    except Exception:
+        # psutil.NoSuchProcess / AccessDenied
         return False
 
 def _start_roudi(executable, config_path):
     """
     Start iox-roudi process.
+    return: whether the start command was issued
     """
     if not os.path.exists(config_path):
         print(f"[RouDi Monitor] Warning: Config file not found at {config_path}")
@@ -49,11 +63,12 @@ def _start_roudi(executable, config_path):
             preexec_fn=os.setsid
         )
         logger.info(f"[RouDi Monitor] Start command issued.")
-        time.sleep(1)
+        return True
     except FileNotFoundError:
         logger.error(f"[RouDi Monitor] Error: Executable '{executable}' not found in PATH.")
     except Exception as e:
         logger.error(f"[RouDi Monitor] Failed to start process: {e}")
+    return False
 
 def _check_and_start_roudi(ROUDI_EXECUTABLE, EXPECTED_CONFIG_PATH):
     logger.debug(f"[RouDi Monitor] Checking system status...")
@@ -64,6 +79,7 @@ def _check_and_start_roudi(ROUDI_EXECUTABLE, EXPECTED_CONFIG_PATH):
         logger.debug(f"[RouDi Monitor] iox-roudi is running (PID: {roudi_proc.info['pid']}).")
         if not _is_config_match(roudi_proc, EXPECTED_CONFIG_PATH):
             logger.warning(f"[RouDi Monitor] Config mismatch! Killing old process...")
+            import psutil
             try:
                 roudi_proc.terminate()
                 roudi_proc.wait(timeout=3)
@@ -81,8 +97,76 @@ def _check_and_start_roudi(ROUDI_EXECUTABLE, EXPECTED_CONFIG_PATH):
     if should_start:
         _start_roudi(ROUDI_EXECUTABLE, EXPECTED_CONFIG_PATH)
         
-        time.sleep(1)
-        if _get_running_roudi_process():
+        if _wait_roudi_ready(2.0):
             logger.info(f"[RouDi Monitor] Recovery successful. RouDi is up.")
         else:
-            logger.error(f"[RouDi Monitor] Recovery failed.")
\ No newline at end of file
+            logger.error(f"[RouDi Monitor] Recovery failed.")
+
+def _shm_enabled() -> bool:
+    """
+    Whether CycloneDDS is configured with the iceoryx PSMX plugin (CYCLONEDDS_URI inline XML or file).
+    """
+    uri = os.environ.get("CYCLONEDDS_URI", "")
+    for part in uri.split(","):
+        part = part.strip()
+        if part.startswith("file://"):
+            try:
+                part = Path(part[len("file://"):]).read_text()
+            except OSError:
+                continue
+        if "psmx_iox" in part or 'type="iox"' in part:
+            return True
+    return False
+
+def _roudi_alive() -> bool:
+    """
+    Probe RouDi directly: its management segment exists and its socket accepts a connect.
+    """
+    if not os.path.exists(ROUDI_MGMT_SHM_PATH):
+        return False
+    sock = socket.socket(socket.AF_UNIX, socket.SOCK_DGRAM)
+    try:
+        sock.connect(ROUDI_SOCKET_PATH)
+        return True
+    except OSError:
+        # missing or stale socket file
+        return False
+    finally:
+        sock.close()
+
+def _wait_roudi_ready(timeout:float, interval:float = 0.01) -> bool:
+    deadline = time.monotonic() + timeout
+    while True:
+        if _roudi_alive():
+            return True
+        if time.monotonic() >= deadline:
+            return False
+        time.sleep(interval)
+
+def ensure_roudi(timeout:float = 5.0, force:bool = False) -> bool:
+    """
+    Make sure RouDi is up before the first SHM-backed participant is created; called by the
+    participant cache. Checked once per process, and only when the iceoryx PSMX is configured.
+    If RouDi is not reachable it is started with configs/shm_confil.toml and polled until ready.
+    return: whether RouDi is reachable (True as well when SHM is not in use).
+    """
+    pid = os.getpid()
+    with _roudi_lock:
+        if not force and pid in _roudi_ready:
+            return _roudi_ready[pid]
+        if not _shm_enabled():
+            ready = True
+        elif _roudi_alive():
+            logger.debug(f"[RouDi Monitor] RouDi is reachable at {ROUDI_SOCKET_PATH}.")
+            ready = True
+        else:
+            logger.warning(f"[RouDi Monitor] RouDi is not reachable, starting {ROUDI_EXECUTABLE}...")
+            ready = False
+            if _start_roudi(ROUDI_EXECUTABLE, EXPECTED_CONFIG_PATH):
+                ready = _wait_roudi_ready(timeout)
+                if ready:
+                    logger.info(f"[RouDi Monitor] RouDi is up.")
+                else:
+                    logger.error(f"[RouDi Monitor] RouDi did not come up within {timeout}s.")
+        _roudi_ready[pid] = ready
+        return ready
@@ -0,0 +1,3 @@
+"""
+Local benchmarks for the wrapper. Each module is runnable with `python -m`.
+"""
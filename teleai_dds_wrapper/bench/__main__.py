@@ -0,0 +1,3 @@
+from teleai_dds_wrapper.bench.latency import main
+
+main()
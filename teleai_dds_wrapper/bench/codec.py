@@ -0,0 +1,97 @@
+"""
+Per-codec size and CPU cost of camera frames.
+
+    python -m teleai_dds_wrapper.bench.codec --codecs raw,zlib,lz4,jpeg --fps 30
+    python -m teleai_dds_wrapper.bench.codec --log /data/run_01 --topic camera
+
+Frames come from a recording (TeleaiLog) or a synthetic 640x480 scene. For every codec
+that is importable: compression ratio, encode/decode time, and the link bandwidth one
+camera needs at --fps (UDP/IP headers not included).
+"""
+import argparse
+import json
+import time
+
+import numpy as np
+
+from teleai_dds_wrapper.utils.codec import encode, decode_into, get_codec
+
+def synthetic_frames(n:int, shape:tuple = (480, 640, 3), seed:int = 0) -> list:
+    """
+    Smooth gradients, a few moving blocks and sensor noise: compresses like a real scene,
+    unlike uniform random data.
+    """
+    rng = np.random.default_rng(seed)
+    h, w, c = shape
+    y, x = np.mgrid[0:h, 0:w]
+    base = np.stack([(x * 255 // w), (y * 255 // h), ((x + y) * 255 // (w + h))], axis=-1)[..., :c]
+    frames = []
+    for i in range(n):
+        frame = base.copy()
+        for k in range(4):
+            y0, x0 = (37 * (i + 5 * k)) % (h - 60), (53 * (i + 3 * k)) % (w - 80)
+            frame[y0:y0 + 60, x0:x0 + 80] = (64 * k + 30) % 256
+        frame = frame + rng.integers(-4, 5, size=shape)
+        frames.append(np.clip(frame, 0, 255).astype(np.uint8))
+    return frames
+
+def logged_frames(path:str, topic:str, n:int, shape:tuple) -> list:
+    from teleai_dds_wrapper.wrapper.record import TeleaiLog
+    log = TeleaiLog(path)
+    return [log.array(i, shape).copy() for i in log.indices(topic)[:n]]
+
+def run_codec(name:str, frames:list, fps:float) -> dict:
+    codec = get_codec(name)
+    out = np.empty_like(frames[0])
+    encode_s, decode_s, sizes = [], [], []
+    for frame in frames:
+        t0 = time.perf_counter()
+        data = encode(codec, frame)
+        t1 = time.perf_counter()
+        decode_into(data, out)
+        t2 = time.perf_counter()
+        encode_s.append(t1 - t0)
+        decode_s.append(t2 - t1)
+        sizes.append(len(data))
+    raw = frames[0].nbytes
+    mean_size = float(np.mean(sizes))
+    return {
+        "codec": name,
+        "raw_bytes": raw,
+        "encoded_bytes_mean": mean_size,
+        "ratio": raw / mean_size,
+        "encode_ms_p50": float(np.median(encode_s)) * 1e3,
+        "decode_ms_p50": float(np.median(decode_s)) * 1e3,
+        "added_latency_ms_p50": float(np.median(np.add(encode_s, decode_s))) * 1e3,
+        "bandwidth_mbit_s": mean_size * 8 * fps / 1e6,
+        "lossless": bool(np.array_equal(out, frames[-1])),
+    }
+
+def run(codecs:list, frames:list, fps:float) -> dict:
+    results = []
+    for name in codecs:
+        try:
+            results.append(run_codec(name, frames, fps))
+        except ImportError as e:
+            results.append({"codec": name, "error": str(e)})
+    return {"frames": len(frames), "shape": list(frames[0].shape), "fps": fps, "results": results}
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m teleai_dds_wrapper.bench.codec", description=__doc__,
+                                     formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--codecs", default="raw,zlib,lz4,jpeg")
+    parser.add_argument("--frames", type=int, default=50)
+    parser.add_argument("--fps", type=float, default=30.0)
+    parser.add_argument("--log", default="", help="take frames from this recording instead of a synthetic scene")
+    parser.add_argument("--topic", default="", help="camera topic in --log")
+    parser.add_argument("--shape", default="480,640,3")
+    args = parser.parse_args(argv)
+    shape = tuple(int(d) for d in args.shape.split(","))
+    if args.log:
+        frames = logged_frames(args.log, args.topic, args.frames, shape)
+    else:
+        frames = synthetic_frames(args.frames, shape)
+    print(json.dumps(run([c for c in args.codecs.split(",") if c], frames, args.fps), indent=2))
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,78 @@
+import os
+import time
+from pathlib import Path
+
+import numpy as np
+
+from teleai_dds_wrapper.utils.idl_utils import generated_types
+
+CONFIG_DIR = Path(__file__).parent.parent.resolve() / "configs"
+
+# Plain loopback UDP, no PSMX/iceoryx: the baseline the SHM path is compared against.
+UDP_LOOPBACK_CONFIG = (
+    '<CycloneDDS><Domain id="any">'
+    '<General><Interfaces><NetworkInterface address="127.0.0.1"/></Interfaces>'
+    '<AllowMulticast>false</AllowMulticast></General>'
+    '<Discovery><ParticipantIndex>auto</ParticipantIndex><MaxAutoParticipantIndex>200</MaxAutoParticipantIndex>'
+    '<Peers><Peer address="127.0.0.1"/></Peers></Discovery>'
+    '</Domain></CycloneDDS>'
+)
+
+TRANSPORTS = ("shm", "udp")
+
+def transport_uri(transport:str) -> str:
+    if transport == "shm":
+        return f"file://{CONFIG_DIR / 'cyclonedds.xml'}"
+    if transport == "udp":
+        return UDP_LOOPBACK_CONFIG
+    raise ValueError(f"Unknown transport {transport}, expected one of {TRANSPORTS}")
+
+def use_transport(transport:str):
+    """
+    Must run in the benchmark child before its first DomainParticipant is created.
+    """
+    os.environ["CYCLONEDDS_URI"] = transport_uri(transport)
+
+# QoS profile file registered in every benchmark child (they start from a fresh interpreter)
+PROFILES_ENV = "TELEAI_BENCH_QOS_PROFILES"
+
+def use_profiles():
+    path = os.environ.get(PROFILES_ENV)
+    if path:
+        from teleai_dds_wrapper.wrapper.qos_profiles import load_qos_profiles
+        load_qos_profiles(path)
+
+def type_by_name(name:str):
+    for struct_type in generated_types():
+        if struct_type.__name__ == name:
+            return struct_type
+    raise ValueError(f"Unknown message type {name}")
+
+def cpu_seconds() -> float:
+    t = os.times()
+    return t.user + t.system
+
+def latency_summary(latencies_ns) -> dict:
+    if len(latencies_ns) == 0:
+        return {"p50_us": None, "p99_us": None, "max_us": None, "mean_us": None}
+    lat = np.asarray(latencies_ns, dtype=np.float64) / 1e3
+    p50, p99 = np.percentile(lat, [50, 99])
+    return {"p50_us": float(p50), "p99_us": float(p99), "max_us": float(lat.max()), "mean_us": float(lat.mean())}
+
+def paced(rate:float, duration:float):
+    """
+    Yield once per period for `duration` seconds, on absolute deadlines. rate <= 0 means as fast as possible.
+    """
+    from teleai_dds_wrapper.utils import nano_sleep
+    period = int(1e9 / rate) if rate > 0 else 0
+    now = time.perf_counter_ns()
+    end = now + int(duration * 1e9)
+    deadline = now
+    while True:
+        now = time.perf_counter_ns()
+        if now >= end:
+            return
+        if period and now < deadline:
+            nano_sleep(deadline - now)
+        yield
+        deadline += period
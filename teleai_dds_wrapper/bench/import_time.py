@@ -0,0 +1,79 @@
+"""
+Cold import cost of the package, each sample in a fresh interpreter.
+
+    python -m teleai_dds_wrapper.bench.import_time --repeat 10
+
+Stages: bare interpreter, `import teleai_dds_wrapper`, first wrapper class access
+(loads cyclonedds and the wrappers), and creating the first publisher (RouDi check
+plus participant). Also lists the slowest modules from `python -X importtime`.
+"""
+import argparse
+import json
+import statistics
+import subprocess
+import sys
+import time
+
+_STAGES = {
+    "interpreter": "pass",
+    "import": "import teleai_dds_wrapper",
+    "first_access": "import teleai_dds_wrapper; teleai_dds_wrapper.TeleaiCommonPub_1",
+    "first_pub": (
+        "import teleai_dds_wrapper\n"
+        "from teleai_dds_wrapper.commonInfo.msg.dds_._commoninfo import float_7d\n"
+        "teleai_dds_wrapper.TeleaiCommonPub_1({domain}, 'bench/import_time', float_7d).close()"
+    ),
+}
+
+_TIMER = (
+    "import time\n"
+    "t0 = time.perf_counter()\n"
+    "{code}\n"
+    "print(time.perf_counter() - t0)\n"
+)
+
+def _time_stage(code:str) -> float:
+    out = subprocess.run([sys.executable, "-c", _TIMER.format(code=code)],
+                         check=True, capture_output=True, text=True).stdout
+    return float(out.strip().splitlines()[-1])
+
+def _wall_stage(code:str) -> float:
+    t0 = time.perf_counter()
+    subprocess.run([sys.executable, "-c", code], check=True, capture_output=True)
+    return time.perf_counter() - t0
+
+def _slowest_modules(top:int) -> list:
+    err = subprocess.run([sys.executable, "-X", "importtime", "-c", "import teleai_dds_wrapper"],
+                         check=True, capture_output=True, text=True).stderr
+    rows = []
+    for line in err.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        _, cumulative, name = line[len("import time:"):].split("|")
+        rows.append({"module": name.strip(), "cumulative_us": int(cumulative)})
+    return sorted(rows, key=lambda r: r["cumulative_us"], reverse=True)[:top]
+
+def run(repeat:int, domain_id:int, top:int) -> dict:
+    results = {}
+    for stage, code in _STAGES.items():
+        code = code.format(domain=domain_id)
+        in_process = [_time_stage(code) for _ in range(repeat)]
+        wall = [_wall_stage(code) for _ in range(repeat)]
+        results[stage] = {
+            "in_process_median_ms": statistics.median(in_process) * 1e3,
+            "process_wall_median_ms": statistics.median(wall) * 1e3,
+            "process_wall_max_ms": max(wall) * 1e3,
+        }
+    return {"repeat": repeat, "stages": results, "slowest_modules": _slowest_modules(top)}
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m teleai_dds_wrapper.bench.import_time", description=__doc__,
+                                     formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--repeat", type=int, default=10)
+    parser.add_argument("--domain", type=int, default=42)
+    parser.add_argument("--top", type=int, default=10, help="number of slowest modules to list")
+    args = parser.parse_args(argv)
+    print(json.dumps(run(args.repeat, args.domain, args.top), indent=2))
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,172 @@
+"""
+Latency/throughput sweep over the generated commonInfo message types.
+
+    python -m teleai_dds_wrapper.bench --types float_7d,commonCamera_640480 --rates 100,1000 --output bench.json
+
+Every case runs one publisher and one subscriber process on this machine, for each
+transport (iceoryx SHM from configs/cyclonedds.xml, plain loopback UDP) and each rate
+(0 = as fast as possible). Latency is source_timestamp -> subscriber callback.
+"""
+import argparse
+import json
+import multiprocessing
+import platform
+import time
+
+from teleai_dds_wrapper.bench.common import TRANSPORTS, use_transport, use_profiles, type_by_name, cpu_seconds, latency_summary, paced
+from teleai_dds_wrapper.utils import get_nano, logger
+from teleai_dds_wrapper.utils.idl_utils import generated_types, make_sample, serialized_size
+from teleai_dds_wrapper.wrapper.qos_profiles import DEFAULT_PROFILE
+
+_DISCOVERY_SETTLE_S = 1.0
+_DRAIN_S = 0.5
+
+def _sub_main(transport:str, domain_id:int, topic:str, type_name:str, results, ready, stop, qos:str = None):
+    use_transport(transport)
+    use_profiles()
+    from teleai_dds_wrapper.wrapper.wrapper import _TeleaiSubBase
+
+    class _LatencySub(_TeleaiSubBase):
+        def __init__(self, *args, **kwargs):
+            self.latencies = []
+            super().__init__(*args, **kwargs)
+
+        def _store(self, msg):
+            self.latencies.append(get_nano() - self.last_recv_time)
+
+    sub = _LatencySub(domain_id, topic, type_by_name(type_name), qos)
+    cpu0, t0 = cpu_seconds(), time.perf_counter()
+    ready.set()
+    stop.wait()
+    cpu, wall = cpu_seconds() - cpu0, time.perf_counter() - t0
+    latencies = list(sub.latencies)
+    sub.close()
+    results.put({"role": "sub", "received": len(latencies), "cpu_pct": 100 * cpu / wall,
+                 **latency_summary(latencies)})
+
+def _pub_main(transport:str, domain_id:int, topic:str, type_name:str, rate:float, duration:float, results, ready, go,
+              qos:str = None):
+    use_transport(transport)
+    use_profiles()
+    from teleai_dds_wrapper.wrapper import TeleaiCommonPub_1
+
+    struct_type = type_by_name(type_name)
+    pub = TeleaiCommonPub_1(domain_id, topic, struct_type, qos)
+    sample = make_sample(struct_type)
+    ready.set()
+    go.wait()
+    sent = 0
+    cpu0, t0 = cpu_seconds(), time.perf_counter()
+    for _ in paced(rate, duration):
+        pub.write(sample)
+        sent += 1
+    cpu, wall = cpu_seconds() - cpu0, time.perf_counter() - t0
+    pub.close()
+    results.put({"role": "pub", "sent": sent, "elapsed_s": wall, "cpu_pct": 100 * cpu / wall})
+
+def run_case(transport:str, struct_type, rate:float, duration:float, domain_id:int, qos:str = None) -> dict:
+    """
+    qos: QoS profile name for both ends, None for the "legacy" default.
+    """
+    ctx = multiprocessing.get_context("spawn")
+    results = ctx.Queue()
+    sub_ready, pub_ready, go, stop = ctx.Event(), ctx.Event(), ctx.Event(), ctx.Event()
+    topic = f"bench/{struct_type.__name__}/{transport}/{rate:g}/{qos or 'default'}"
+    name = struct_type.__name__
+
+    sub = ctx.Process(target=_sub_main, args=(transport, domain_id, topic, name, results, sub_ready, stop, qos))
+    pub = ctx.Process(target=_pub_main, args=(transport, domain_id, topic, name, rate, duration, results, pub_ready, go, qos))
+    sub.start()
+    sub_ready.wait(30)
+    pub.start()
+    pub_ready.wait(30)
+    time.sleep(_DISCOVERY_SETTLE_S)
+    go.set()
+
+    reports = {}
+    try:
+        report = results.get(timeout=duration + 30)
+        reports[report["role"]] = report
+        time.sleep(_DRAIN_S)
+        stop.set()
+        report = results.get(timeout=30)
+        reports[report["role"]] = report
+    finally:
+        stop.set()
+        for proc in (pub, sub):
+            proc.join(5)
+            if proc.is_alive():
+                proc.terminate()
+
+    pub_r, sub_r = reports.get("pub", {}), reports.get("sub", {})
+    size = serialized_size(struct_type)
+    sent, received = pub_r.get("sent", 0), sub_r.get("received", 0)
+    elapsed = pub_r.get("elapsed_s") or duration
+    return {
+        "transport": transport,
+        "type": name,
+        "qos": qos or DEFAULT_PROFILE,
+        "payload_bytes": size,
+        "target_rate_hz": rate,
+        "sent": sent,
+        "received": received,
+        "drops": sent - received,
+        "achieved_rate_hz": received / elapsed,
+        "throughput_mib_s": received * size / elapsed / 2**20,
+        "p50_us": sub_r.get("p50_us"),
+        "p99_us": sub_r.get("p99_us"),
+        "max_us": sub_r.get("max_us"),
+        "mean_us": sub_r.get("mean_us"),
+        "pub_cpu_pct": pub_r.get("cpu_pct"),
+        "sub_cpu_pct": sub_r.get("cpu_pct"),
+    }
+
+def run(types:list, rates:list, transports:list, duration:float, domain_id:int) -> dict:
+    results = []
+    for transport in transports:
+        for struct_type in types:
+            for rate in rates:
+                logger.info(f"[bench] {transport} {struct_type.__name__} @ {rate:g} Hz")
+                try:
+                    results.append(run_case(transport, struct_type, rate, duration, domain_id))
+                except Exception as e:
+                    logger.error(f"[bench] {transport} {struct_type.__name__} @ {rate:g} Hz failed: {e}")
+                    results.append({"transport": transport, "type": struct_type.__name__,
+                                    "target_rate_hz": rate, "error": str(e)})
+    return {
+        "meta": {
+            "host": platform.node(),
+            "python": platform.python_version(),
+            "timestamp": time.time(),
+            "duration_s": duration,
+        },
+        "results": results,
+    }
+
+def _parse_args(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m teleai_dds_wrapper.bench", description=__doc__,
+                                     formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--types", default="", help="comma separated type names (default: all generated types)")
+    parser.add_argument("--rates", default="100,1000,0", help="comma separated publish rates in Hz, 0 = max")
+    parser.add_argument("--transports", default=",".join(TRANSPORTS))
+    parser.add_argument("--duration", type=float, default=3.0, help="seconds per case")
+    parser.add_argument("--domain", type=int, default=42)
+    parser.add_argument("--output", default="", help="write JSON here instead of stdout")
+    return parser.parse_args(argv)
+
+def main(argv=None):
+    args = _parse_args(argv)
+    types = [type_by_name(n) for n in args.types.split(",") if n] or generated_types()
+    rates = [float(r) for r in args.rates.split(",") if r]
+    transports = [t for t in args.transports.split(",") if t]
+    report = run(types, rates, transports, args.duration, args.domain)
+    text = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, "w") as f:
+            f.write(text)
+        logger.info(f"[bench] results written to {args.output}")
+    else:
+        print(text)
+
+if __name__ == "__main__":
+    main()
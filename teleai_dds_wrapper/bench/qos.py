@@ -0,0 +1,59 @@
+"""
+Compare QoS profiles for one message type on this machine.
+
+    python -m teleai_dds_wrapper.bench.qos --type commonCamera_640480 --profiles sensor,control,bulk --rates 30,0
+
+Each profile runs the same publisher/subscriber process pair as the latency benchmark
+(bench/latency.py), with the profile on both ends. Profiles from a file can be added with
+--load (TOML or DDS-XML, see wrapper/qos_profiles.py); they are loaded in the child processes too.
+"""
+import argparse
+import json
+import os
+
+from teleai_dds_wrapper.bench.common import TRANSPORTS, PROFILES_ENV, type_by_name
+from teleai_dds_wrapper.bench.latency import run_case
+from teleai_dds_wrapper.utils import logger
+from teleai_dds_wrapper.wrapper.qos_profiles import qos_profiles, load_qos_profiles, default_profile
+
+def run(struct_type, profiles:list, rates:list, transports:list, duration:float, domain_id:int) -> dict:
+    results = []
+    for transport in transports:
+        for rate in rates:
+            for profile in profiles:
+                logger.info(f"[bench.qos] {transport} {struct_type.__name__} @ {rate:g} Hz, profile {profile}")
+                try:
+                    results.append(run_case(transport, struct_type, rate, duration, domain_id, profile))
+                except Exception as e:
+                    logger.error(f"[bench.qos] profile {profile} failed: {e}")
+                    results.append({"transport": transport, "qos": profile, "target_rate_hz": rate, "error": str(e)})
+    return {"type": struct_type.__name__, "auto_profile": default_profile(struct_type), "results": results}
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m teleai_dds_wrapper.bench.qos", description=__doc__,
+                                     formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--type", required=True, help="generated message type name")
+    parser.add_argument("--profiles", default="", help="comma separated, default every registered profile (legacy is the baseline)")
+    parser.add_argument("--load", default="", help="profile file to register first")
+    parser.add_argument("--rates", default="100,0", help="comma separated publish rates in Hz, 0 = max")
+    parser.add_argument("--transports", default=",".join(TRANSPORTS))
+    parser.add_argument("--duration", type=float, default=3.0, help="seconds per case")
+    parser.add_argument("--domain", type=int, default=42)
+    parser.add_argument("--output", default="", help="write JSON here instead of stdout")
+    args = parser.parse_args(argv)
+    if args.load:
+        load_qos_profiles(args.load)
+        os.environ[PROFILES_ENV] = os.path.abspath(args.load)
+    profiles = [p for p in args.profiles.split(",") if p] or list(qos_profiles())
+    report = run(type_by_name(args.type), profiles, [float(r) for r in args.rates.split(",") if r],
+                 [t for t in args.transports.split(",") if t], args.duration, args.domain)
+    text = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, "w") as f:
+            f.write(text)
+        logger.info(f"[bench.qos] results written to {args.output}")
+    else:
+        print(text)
+
+if __name__ == "__main__":
+    main()
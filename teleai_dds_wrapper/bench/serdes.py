@@ -0,0 +1,74 @@
+"""
+Per-message serialize/deserialize cost, generic cyclonedds.idl codec vs fast_codec.
+
+    python -m teleai_dds_wrapper.bench.serdes --types float_7d,roboticArm_double_all_state_info
+
+Runs in-process, no DDS traffic. Types without a fast codec (process_state, ...) only
+report the generic numbers.
+"""
+import argparse
+import json
+import time
+
+import numpy as np
+
+from teleai_dds_wrapper.bench.common import type_by_name
+from teleai_dds_wrapper.utils.fast_codec import fast_codec, _probe
+from teleai_dds_wrapper.utils.idl_utils import generated_types, make_sample
+
+_REPEATS = 5
+
+def _per_call_us(fn, arg, n:int) -> float:
+    """
+    Best of _REPEATS timings of n calls, in microseconds per call.
+    """
+    best = float("inf")
+    for _ in range(_REPEATS):
+        t0 = time.perf_counter()
+        for _ in range(n):
+            fn(arg)
+        best = min(best, time.perf_counter() - t0)
+    return best / n * 1e6
+
+def run_type(struct_type, n:int) -> dict:
+    codec = fast_codec(struct_type)
+    sample = _probe(struct_type, codec._fields) if codec is not None else make_sample(struct_type)
+    data = sample.serialize()
+    result = {
+        "type": struct_type.__name__,
+        "bytes": len(data),
+        "generic_serialize_us": _per_call_us(struct_type.serialize, sample, n),
+        "generic_deserialize_us": _per_call_us(struct_type.deserialize, data, n),
+        "fast": codec is not None,
+    }
+    if codec is not None:
+        result["fast_serialize_us"] = _per_call_us(codec.serialize, sample, n)
+        result["fast_deserialize_us"] = _per_call_us(codec.deserialize, data, n)
+        result["serialize_speedup"] = result["generic_serialize_us"] / result["fast_serialize_us"]
+        result["deserialize_speedup"] = result["generic_deserialize_us"] / result["fast_deserialize_us"]
+    return result
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m teleai_dds_wrapper.bench.serdes", description=__doc__,
+                                     formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--types", default="", help="comma separated, default every generated type")
+    parser.add_argument("--n", type=int, default=2000, help="calls per timing")
+    parser.add_argument("--output", default="", help="also write the JSON results to this file")
+    args = parser.parse_args(argv)
+    types = [type_by_name(t) for t in args.types.split(",") if t] or generated_types()
+    results = [run_type(t, args.n) for t in types]
+    fast = [r for r in results if r["fast"]]
+    report = {
+        "n": args.n,
+        "results": results,
+        "median_serialize_speedup": float(np.median([r["serialize_speedup"] for r in fast])) if fast else None,
+        "median_deserialize_speedup": float(np.median([r["deserialize_speedup"] for r in fast])) if fast else None,
+    }
+    text = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, "w") as f:
+            f.write(text)
+    print(text)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,369 @@
+"""
+Soak / scaling harness: N publisher and M subscriber processes over K topics of mixed types.
+
+    python -m teleai_dds_wrapper.bench.soak --ramp 1:1:4,2:2:16,4:4:64 --duration 10
+    python -m teleai_dds_wrapper.bench.soak --ramp 4:4:32 --duration 1800 --output soak.json   # leak check
+
+Each stage of the ramp (PUBS:SUBS:TOPICS) starts fresh processes built on the wrapper classes.
+Topic t has type types[t % len(types)], is written by publisher t % PUBS and read by --fanout
+subscribers. Per stage the report has:
+    discovery       seconds from a subscriber creating its readers until all of them matched a writer
+    latency         source_timestamp -> subscriber (same host, no clock correction needed)
+    delivery        delivered / expected samples per second
+    cpu, rss        per process, sampled every --sample-interval seconds with psutil
+    rss slope       KiB/min per process after --warmup, a leak suspect above --leak-kib-min
+                    (only flagged with at least a minute of samples after the warmup)
+    chunk exhaustion  iceoryx MEPOO errors on the children's stderr plus writes failing with OUT_OF_RESOURCES
+The knee is the first stage that no longer keeps up (delivery < --min-delivery), whose delivered
+rate grew by less than --min-efficiency of the added load, or whose p99 latency exceeds
+--max-latency-growth times the first stage's.
+"""
+import argparse
+import itertools
+import json
+import multiprocessing
+import os
+import platform
+import queue
+import re
+import tempfile
+import time
+
+import numpy as np
+import psutil
+
+from teleai_dds_wrapper.bench.common import TRANSPORTS, use_transport, type_by_name, latency_summary, paced
+from teleai_dds_wrapper.utils import get_nano, logger
+
+DEFAULT_TYPES = "float_7d,roboticArm_double_state_info,vla_inference_result_single,commonCamera_224@30"
+
+_READY_TIMEOUT_S = 60
+_DISCOVERY_TIMEOUT_S = 60
+_DRAIN_S = 0.5
+# latencies kept per subscriber process (ring), so long runs do not grow the process being measured
+_LATENCY_RING = 1 << 17
+# shorter windows mostly see allocator warm-up, their slope is reported but not flagged
+_MIN_LEAK_WINDOW_S = 60
+_CHUNK_EXHAUSTION = re.compile(r"MEPOO__|OUT_OF_CHUNKS|TOO_MANY_CHUNKS")
+
+def _redirect_stderr(log_path:str):
+    # iceoryx reports mempool errors on stderr of the process that hit them
+    fd = os.open(log_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o644)
+    os.dup2(fd, 2)
+    os.close(fd)
+
+def _pub_main(index:int, topics:list, transport:str, domain_id:int, duration:float, log_path:str,
+              results, ready, go):
+    """
+    topics: [(topic, type name, rate), ...]; each topic is paced on its own schedule.
+    """
+    _redirect_stderr(log_path)
+    use_transport(transport)
+    from cyclonedds.core import DDSException
+    from teleai_dds_wrapper.utils.idl_utils import make_sample
+    from teleai_dds_wrapper.wrapper import TeleaiCommonPub_1
+
+    pubs = []
+    for topic, type_name, rate in topics:
+        struct_type = type_by_name(type_name)
+        pubs.append((TeleaiCommonPub_1(domain_id, topic, struct_type), make_sample(struct_type), int(1e9 / rate)))
+    ready.set()
+    go.wait()
+    sent = failed = out_of_resources = 0
+    due = [time.perf_counter_ns()] * len(pubs)
+    for _ in paced(max(rate for _, _, rate in topics), duration):
+        now = time.perf_counter_ns()
+        for i, (pub, sample, period) in enumerate(pubs):
+            if now < due[i]:
+                continue
+            due[i] += period
+            try:
+                pub.write(sample)
+                sent += 1
+            except DDSException as e:
+                failed += 1
+                out_of_resources += e.code == DDSException.DDS_RETCODE_OUT_OF_RESOURCES
+    for pub, _, _ in pubs:
+        pub.close()
+    results.put({"role": "pub", "index": index, "sent": sent, "write_failures": failed,
+                 "out_of_resources": out_of_resources})
+
+def _sub_main(index:int, topics:list, transport:str, domain_id:int, log_path:str, results, ready, stop):
+    """
+    topics: [(topic, type name), ...]
+    """
+    _redirect_stderr(log_path)
+    use_transport(transport)
+    from teleai_dds_wrapper.wrapper import TeleaiCommonSub_1q
+
+    latencies = np.zeros(_LATENCY_RING, dtype=np.int64)
+    slots = itertools.count()   # next() is atomic, the readers' listen threads share it
+
+    def on_sample(sub):
+        # callbacks run after the receive bookkeeping, so last_latency belongs to this sample
+        def callback(msg, source_timestamp):
+            latencies[next(slots) % _LATENCY_RING] = sub.last_latency
+        return callback
+
+    t0 = get_nano()
+    subs = [TeleaiCommonSub_1q(domain_id, topic, type_by_name(type_name)) for topic, type_name in topics]
+    for sub in subs:
+        sub.add_callback(on_sample(sub))
+    deadline = time.monotonic() + _DISCOVERY_TIMEOUT_S
+    for sub in subs:
+        sub.wait_for_writers(1, max(0.0, deadline - time.monotonic()))
+    matched = sum(sub.matched_writers > 0 for sub in subs)
+    discovery_s = (get_nano() - t0) / 1e9
+    ready.set()
+    stop.wait()
+    for sub in subs:
+        sub.close()
+    received = next(slots)
+    results.put({"role": "sub", "index": index, "received": received, "discovery_s": discovery_s,
+                 "matched": matched, "readers": len(subs), "latencies": latencies[:min(received, _LATENCY_RING)]})
+
+def _assign(n_pubs:int, n_subs:int, n_topics:int, fanout:int, types:list, stage:int) -> tuple:
+    """
+    types: [(type name, rate)]
+    return: (topics of each publisher, topics of each subscriber, expected deliveries per second)
+    """
+    pub_topics = [[] for _ in range(n_pubs)]
+    sub_topics = [[] for _ in range(n_subs)]
+    fanout = min(fanout, n_subs)
+    expected = 0.0
+    for t in range(n_topics):
+        type_name, rate = types[t % len(types)]
+        topic = f"soak/{stage}/{t}"
+        pub_topics[t % n_pubs].append((topic, type_name, rate))
+        for j in range(fanout):
+            sub_topics[(t + j) % n_subs].append((topic, type_name))
+        expected += rate * fanout
+    return pub_topics, sub_topics, expected
+
+def _sample(procs:dict, series:dict, t0:float):
+    for name, proc in procs.items():
+        try:
+            series[name].append((time.monotonic() - t0, proc.cpu_percent(None), proc.memory_info().rss))
+        except psutil.Error:
+            pass
+
+def _rss_slope_kib_min(samples:list, warmup:float) -> float | None:
+    """
+    Least-squares RSS growth of one process after warmup seconds.
+    """
+    points = [(t, rss) for t, _, rss in samples if t >= warmup]
+    if len(points) < 3:
+        return None
+    t, rss = np.asarray(points, dtype=np.float64).T
+    return float(np.polyfit(t / 60, rss / 1024, 1)[0])
+
+def _count_exhaustion(log_paths:list) -> int:
+    count = 0
+    for path in log_paths:
+        try:
+            with open(path, errors="replace") as f:
+                count += sum(1 for line in f if _CHUNK_EXHAUSTION.search(line))
+        except OSError:
+            pass
+    return count
+
+def run_stage(stage:int, n_pubs:int, n_subs:int, n_topics:int, types:list, fanout:int, transport:str,
+              duration:float, domain_id:int, sample_interval:float, warmup:float, leak_kib_min:float,
+              log_dir:str) -> dict:
+    ctx = multiprocessing.get_context("spawn")
+    results = ctx.Queue()
+    go, stop = ctx.Event(), ctx.Event()
+    pub_topics, sub_topics, expected = _assign(n_pubs, n_subs, n_topics, fanout, types, stage)
+    log_paths = []
+    children = {}
+
+    # writers first, so subscriber discovery is timed against writers that already exist
+    for role, assignment in (("pub", pub_topics), ("sub", sub_topics)):
+        stage_readies = []
+        for i, topics in enumerate(assignment):
+            if not topics:
+                continue
+            log_path = os.path.join(log_dir, f"stage{stage}_{role}{i}.log")
+            log_paths.append(log_path)
+            ready = ctx.Event()
+            if role == "pub":
+                args = (i, topics, transport, domain_id, duration, log_path, results, ready, go)
+                proc = ctx.Process(target=_pub_main, args=args, daemon=True)
+            else:
+                args = (i, topics, transport, domain_id, log_path, results, ready, stop)
+                proc = ctx.Process(target=_sub_main, args=args, daemon=True)
+            proc.start()
+            children[f"{role}{i}"] = proc
+            stage_readies.append(ready)
+        for ready in stage_readies:
+            if not ready.wait(_READY_TIMEOUT_S + _DISCOVERY_TIMEOUT_S):
+                raise TimeoutError(f"stage {stage}: a {role} process did not come up")
+
+    procs = {name: psutil.Process(proc.pid) for name, proc in children.items()}
+    series = {name: [] for name in procs}
+    t0 = time.monotonic()
+    _sample(procs, series, t0)    # primes cpu_percent
+    go.set()
+    reports = {"pub": [], "sub": []}
+    n_pub_procs = sum(1 for name in children if name.startswith("pub"))
+    try:
+        next_sample = t0 + sample_interval
+        while len(reports["pub"]) < n_pub_procs:
+            if time.monotonic() > t0 + duration + _READY_TIMEOUT_S:
+                raise TimeoutError(f"stage {stage}: publishers did not finish")
+            try:
+                report = results.get(timeout=max(0.0, min(sample_interval, next_sample - time.monotonic())))
+                reports[report["role"]].append(report)
+            except queue.Empty:
+                pass
+            if time.monotonic() >= next_sample:
+                _sample(procs, series, t0)
+                next_sample += sample_interval
+        time.sleep(_DRAIN_S)
+        stop.set()
+        while len(reports["sub"]) < len(children) - n_pub_procs:
+            report = results.get(timeout=_READY_TIMEOUT_S)
+            reports[report["role"]].append(report)
+    finally:
+        go.set()
+        stop.set()
+        for proc in children.values():
+            proc.join(5)
+            if proc.is_alive():
+                proc.terminate()
+
+    subs, pubs = reports["sub"], reports["pub"]
+    received = sum(r["received"] for r in subs)
+    latencies = np.concatenate([r["latencies"] for r in subs]) if subs else []
+    discovery = [r["discovery_s"] for r in subs]
+    processes = {}
+    for name, samples in series.items():
+        cpu = [c for _, c, _ in samples[1:]]
+        rss = [r for _, _, r in samples]
+        processes[name] = {
+            "cpu_pct_mean": float(np.mean(cpu)) if cpu else None,
+            "rss_mib_start": rss[0] / 2**20 if rss else None,
+            "rss_mib_end": rss[-1] / 2**20 if rss else None,
+            "rss_slope_kib_min": _rss_slope_kib_min(samples, warmup),
+        }
+    leaks = []
+    if duration - warmup >= _MIN_LEAK_WINDOW_S:
+        leaks = [name for name, p in processes.items()
+                 if p["rss_slope_kib_min"] is not None and p["rss_slope_kib_min"] > leak_kib_min]
+    delivered = received / duration
+    return {
+        "stage": stage,
+        "pubs": n_pubs,
+        "subs": n_subs,
+        "topics": n_topics,
+        "readers": sum(r["readers"] for r in subs),
+        "unmatched_readers": sum(r["readers"] - r["matched"] for r in subs),
+        "discovery_max_s": max(discovery) if discovery else None,
+        "discovery_mean_s": float(np.mean(discovery)) if discovery else None,
+        "sent": sum(r["sent"] for r in pubs),
+        "received": received,
+        "expected_msgs_s": expected,
+        "delivered_msgs_s": delivered,
+        "delivery": delivered / expected if expected else None,
+        **latency_summary(latencies),
+        "pub_cpu_pct": sum(p["cpu_pct_mean"] or 0 for n, p in processes.items() if n.startswith("pub")),
+        "sub_cpu_pct": sum(p["cpu_pct_mean"] or 0 for n, p in processes.items() if n.startswith("sub")),
+        "rss_mib_end": sum(p["rss_mib_end"] or 0 for p in processes.values()),
+        "write_failures": sum(r["write_failures"] for r in pubs),
+        "chunk_exhaustion": _count_exhaustion(log_paths) + sum(r["out_of_resources"] for r in pubs),
+        "leak_suspects": leaks,
+        "processes": processes,
+    }
+
+def find_knee(stages:list, min_delivery:float, min_efficiency:float, max_latency_growth:float) -> dict | None:
+    """
+    First stage past which adding processes/topics stops paying off, with the reason.
+    """
+    base_p99 = stages[0].get("p99_us") if stages else None
+    for prev, stage in zip([None] + stages[:-1], stages):
+        if stage.get("delivery") is not None and stage["delivery"] < min_delivery:
+            return {"stage": stage["stage"], "reason": f"delivered {stage['delivery']:.0%} of the offered load"}
+        if prev is not None and prev["delivered_msgs_s"] and prev["expected_msgs_s"] < stage["expected_msgs_s"]:
+            gain = stage["delivered_msgs_s"] / prev["delivered_msgs_s"]
+            load = stage["expected_msgs_s"] / prev["expected_msgs_s"]
+            if (gain - 1) < min_efficiency * (load - 1):
+                return {"stage": stage["stage"], "reason": f"delivered rate x{gain:.2f} for x{load:.2f} load"}
+        if base_p99 and stage.get("p99_us") and stage["p99_us"] > max_latency_growth * base_p99:
+            return {"stage": stage["stage"], "reason": f"p99 latency {stage['p99_us']:.0f} us vs {base_p99:.0f} us"}
+    return None
+
+def _parse_types(text:str) -> list:
+    # TYPE[@RATE], the rate defaults to --rate
+    types = []
+    for item in (s for s in text.split(",") if s):
+        name, _, rate = item.partition("@")
+        type_by_name(name)
+        types.append((name, float(rate) if rate else None))
+    return types
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m teleai_dds_wrapper.bench.soak", description=__doc__,
+                                     formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--ramp", default="1:1:4,2:2:8,4:4:16,8:8:32", help="comma separated PUBS:SUBS:TOPICS stages")
+    parser.add_argument("--types", default=DEFAULT_TYPES, help="comma separated TYPE[@RATE], assigned to topics round-robin")
+    parser.add_argument("--rate", type=float, default=100.0, help="publish rate per topic in Hz")
+    parser.add_argument("--fanout", type=int, default=1, help="subscriber processes per topic")
+    parser.add_argument("--transport", default="shm", choices=TRANSPORTS)
+    parser.add_argument("--duration", type=float, default=10.0, help="seconds of load per stage")
+    parser.add_argument("--sample-interval", type=float, default=1.0, help="seconds between CPU/RSS samples")
+    parser.add_argument("--warmup", type=float, default=5.0, help="seconds ignored by the RSS slope")
+    parser.add_argument("--leak-kib-min", type=float, default=256.0, help="RSS growth flagged as a leak")
+    parser.add_argument("--min-delivery", type=float, default=0.95)
+    parser.add_argument("--min-efficiency", type=float, default=0.8)
+    parser.add_argument("--max-latency-growth", type=float, default=3.0)
+    parser.add_argument("--domain", type=int, default=43)
+    parser.add_argument("--logs", default="", help="directory for the children's stderr, default a temporary one")
+    parser.add_argument("--output", default="", help="write JSON here instead of stdout")
+    args = parser.parse_args(argv)
+
+    types = [(name, rate or args.rate) for name, rate in _parse_types(args.types)]
+    log_dir = args.logs or tempfile.mkdtemp(prefix="teleai_soak_")
+    os.makedirs(log_dir, exist_ok=True)
+    stages = []
+    for stage, spec in enumerate(s for s in args.ramp.split(",") if s):
+        n_pubs, n_subs, n_topics = (int(v) for v in spec.split(":"))
+        logger.info(f"[bench.soak] stage {stage}: {n_pubs} pubs, {n_subs} subs, {n_topics} topics")
+        try:
+            stages.append(run_stage(stage, n_pubs, n_subs, n_topics, types, args.fanout, args.transport,
+                                    args.duration, args.domain, args.sample_interval, args.warmup,
+                                    args.leak_kib_min, log_dir))
+        except Exception as e:
+            logger.error(f"[bench.soak] stage {stage} failed: {e}")
+            break
+        s = stages[-1]
+        # None without subscribers in the stage
+        delivery = "n/a" if s["delivery"] is None else f"{s['delivery']:.1%}"
+        discovery = "n/a" if s["discovery_max_s"] is None else f"{s['discovery_max_s']:.2f} s"
+        p99 = "n/a" if s["p99_us"] is None else f"{s['p99_us']:.0f} us"
+        logger.info(f"[bench.soak] stage {stage}: delivery {delivery}, p99 {p99}, "
+                    f"discovery {discovery}, chunk exhaustion {s['chunk_exhaustion']}, "
+                    f"leak suspects {s['leak_suspects']}")
+    report = {
+        "meta": {
+            "host": platform.node(),
+            "cpus": os.cpu_count(),
+            "python": platform.python_version(),
+            "timestamp": time.time(),
+            "transport": args.transport,
+            "types": types,
+            "duration_s": args.duration,
+            "logs": log_dir,
+        },
+        "stages": stages,
+        "knee": find_knee(stages, args.min_delivery, args.min_efficiency, args.max_latency_growth),
+    }
+    text = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, "w") as f:
+            f.write(text)
+        logger.info(f"[bench.soak] results written to {args.output}")
+    else:
+        print(text)
+
+if __name__ == "__main__":
+    main()
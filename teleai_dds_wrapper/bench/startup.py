@@ -0,0 +1,107 @@
+"""
+Startup cost of opening many topics in one process.
+
+    python -m teleai_dds_wrapper.bench.startup --topics 20 --mode shared
+    python -m teleai_dds_wrapper.bench.startup --topics 20 --mode per_endpoint
+
+Both modes open the same wrapper classes (TeleaiCommonPub_1/TeleaiCommonSub_1q); per_endpoint
+only disables the participant cache, rebuilding the previous wrapper behaviour of one
+DomainParticipant (and Topic) per pub/sub. close_s times closing every wrapper and deleting the
+participants; thread_growth_after_close shows whether their threads went away.
+"""
+import argparse
+import contextlib
+import json
+import os
+import time
+
+import psutil
+from cyclonedds.domain import DomainParticipant
+from cyclonedds.topic import Topic
+
+from teleai_dds_wrapper._bootstrap import ensure_roudi
+from teleai_dds_wrapper.commonInfo.msg.dds_._commoninfo import float_7d
+from teleai_dds_wrapper.wrapper import TeleaiCommonPub_1, TeleaiCommonSub_1q
+from teleai_dds_wrapper.wrapper import wrapper as _wrapper
+from teleai_dds_wrapper.wrapper.participant import participant_count
+
+@contextlib.contextmanager
+def _no_reuse(created:list):
+    """
+    Swap the cache functions the wrapper classes use for uncached ones: each wrapper gets a
+    fresh participant, and its topic on that participant. created collects the participants.
+    """
+    def acquire_participant(domain_id):
+        # the same once-per-process RouDi check as the cache, so both modes pay for it
+        ensure_roudi()
+        created.append(DomainParticipant(domain_id))
+        return created[-1]
+
+    def acquire_topic(domain_id, topic, struct_type):
+        # the wrappers acquire their participant right before their topic
+        return Topic(created[-1], topic, struct_type)
+
+    names = ("acquire_participant", "release_participant", "acquire_topic", "release_topic")
+    saved = {name: getattr(_wrapper, name) for name in names}
+    _wrapper.acquire_participant = acquire_participant
+    _wrapper.acquire_topic = acquire_topic
+    _wrapper.release_participant = _wrapper.release_topic = lambda *args: None
+    try:
+        yield
+    finally:
+        for name, fn in saved.items():
+            setattr(_wrapper, name, fn)
+
+def _open(domain_id:int, n_topics:int) -> list:
+    entities = []
+    for i in range(n_topics):
+        entities.append(TeleaiCommonPub_1(domain_id, f"bench/startup_{i}", float_7d))
+        entities.append(TeleaiCommonSub_1q(domain_id, f"bench/startup_{i}", float_7d))
+    return entities
+
+def run(domain_id:int, n_topics:int, mode:str) -> dict:
+    proc = psutil.Process(os.getpid())
+    rss_before = proc.memory_info().rss
+    threads_before = proc.num_threads()
+    start = time.perf_counter()
+    if mode == "per_endpoint":
+        created = []
+        with _no_reuse(created):
+            entities = _open(domain_id, n_topics)
+        participants = len(created)
+    else:
+        entities = _open(domain_id, n_topics)
+        participants = participant_count()
+    elapsed = time.perf_counter() - start
+    rss_open = proc.memory_info().rss
+    threads_open = proc.num_threads()
+
+    start = time.perf_counter()
+    for entity in entities:
+        entity.close()
+    if mode == "per_endpoint":
+        for dp in created:
+            dp.__del__()
+    close_elapsed = time.perf_counter() - start
+    return {
+        "mode": mode,
+        "topics": n_topics,
+        "endpoints": len(entities),
+        "participants": participants,
+        "startup_s": elapsed,
+        "rss_growth_mib": (rss_open - rss_before) / 2**20,
+        "thread_growth": threads_open - threads_before,
+        "close_s": close_elapsed,
+        "thread_growth_after_close": proc.num_threads() - threads_before,
+    }
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--domain", type=int, default=0)
+    parser.add_argument("--topics", type=int, default=20)
+    parser.add_argument("--mode", choices=["shared", "per_endpoint"], default="shared")
+    args = parser.parse_args()
+    print(json.dumps(run(args.domain, args.topics, args.mode), indent=2))
+
+if __name__ == "__main__":
+    main()
@@ -1,2 +1,2 @@
 from .logging_utils import logger
-from .utils import get_nano, nano_sleep
\ No newline at end of file
+from .utils import get_nano, nano_sleep, get_mono_nano, sleep_until
\ No newline at end of file
@@ -0,0 +1,44 @@
+import typing
+
+import numpy as np
+import cyclonedds.idl as idl
+import cyclonedds.idl.types as types
+
+_BYTE_TYPES = (types.byte, types.uint8)
+
+def get_buffer_field(struct_type:idl.IdlStruct) -> tuple[str, int] | None:
+    """
+    Find the single octet-array field of a struct (e.g. commonCamera_640480.image).
+    return: (field_name, length) | None
+    """
+    hints = typing.get_type_hints(struct_type, include_extras=True)
+    if len(hints) != 1:
+        return None
+    name, hint = next(iter(hints.items()))
+    for meta in getattr(hint, "__metadata__", ()):
+        if isinstance(meta, types.array) and meta.subtype in _BYTE_TYPES:
+            return name, meta.length
+    return None
+
+def as_byte_view(buf) -> memoryview:
+    """
+    Flat uint8 memoryview over any buffer-protocol object, without copying
+    unless the source is not C-contiguous.
+    """
+    view = memoryview(buf)
+    if not view.c_contiguous:
+        view = memoryview(np.ascontiguousarray(buf))
+    if view.format != "B" or view.ndim != 1:
+        view = view.cast("B")
+    return view
+
+def array_view(data, shape:tuple | None = None, dtype=np.uint8, offset:int = 0, nbytes:int = -1) -> np.ndarray:
+    """
+    ndarray view over a received payload. Read-only when the payload is bytes.
+    """
+    dtype = np.dtype(dtype)
+    count = -1 if nbytes < 0 else nbytes // dtype.itemsize
+    arr = np.frombuffer(data, dtype=dtype, count=count, offset=offset)
+    if shape is not None:
+        arr = arr.reshape(shape)
+    return arr
@@ -0,0 +1,39 @@
+import threading
+
+class BufferPool(object):
+    """
+    Reusable bytearrays in power-of-two size buckets, so payloads of varying size do not
+    allocate a fresh buffer on every write. Thread-safe.
+
+        buf = pool.acquire(n)     # len(buf) >= n
+        ...
+        pool.release(buf)
+    """
+    def __init__(self, min_size:int = 4096, per_bucket:int = 4):
+        """
+        per_bucket: free buffers kept per size class; extra releases are dropped.
+        """
+        self._min_size = min_size
+        self._per_bucket = per_bucket
+        self._free:dict = {}   # bucket size -> [bytearray, ...]
+        self._lock = threading.Lock()
+        self.allocations = 0
+
+    def _bucket(self, nbytes:int) -> int:
+        return max(self._min_size, 1 << (nbytes - 1).bit_length())
+
+    def acquire(self, nbytes:int) -> bytearray:
+        size = self._bucket(nbytes)
+        with self._lock:
+            free = self._free.get(size)
+            if free:
+                return free.pop()
+            self.allocations += 1
+        return bytearray(size)
+
+    def release(self, buf:bytearray):
+        size = len(buf)
+        with self._lock:
+            free = self._free.setdefault(size, [])
+            if len(free) < self._per_bucket:
+                free.append(buf)
@@ -0,0 +1,154 @@
+"""
+Image/array codecs for the compressed topic variant (see TeleaiCommonPub_1(codec=...)).
+
+An encoded frame is a 24-byte header followed by the codec payload:
+    magic "TC" | version u8 | codec id u8 | dtype.str 3 chars | ndim u8 | shape u32 x 3 | raw size u32
+dtype.str keeps the byte order ("<f4", ">f4", "|u1"), the payload bytes are those of the array as given.
+
+zlib is always available; lz4 needs the `lz4` package and jpeg needs OpenCV (`cv2`),
+both are imported on first use.
+"""
+import struct
+import zlib
+
+import numpy as np
+
+_HEADER = struct.Struct("<2sBB3sBIIII")
+_MAGIC = b"TC"
+_VERSION = 2
+HEADER_SIZE = _HEADER.size
+
+class Codec(object):
+    """
+    encode(array) -> bytes payload; decode_into(payload, out) fills the preallocated out array.
+    """
+    name = ""
+    id = 0
+
+    def encode(self, array:np.ndarray) -> bytes:
+        raise NotImplementedError
+
+    def decode_into(self, payload:memoryview, out:np.ndarray):
+        raise NotImplementedError
+
+class RawCodec(Codec):
+    name, id = "raw", 0
+
+    def encode(self, array:np.ndarray) -> bytes:
+        return array.tobytes()
+
+    def decode_into(self, payload:memoryview, out:np.ndarray):
+        out.reshape(-1).view(np.uint8)[:] = np.frombuffer(payload, np.uint8)
+
+class ZlibCodec(Codec):
+    name, id = "zlib", 1
+
+    def __init__(self, level:int = 1):
+        self.level = level
+
+    def encode(self, array:np.ndarray) -> bytes:
+        return zlib.compress(array, self.level)
+
+    def decode_into(self, payload:memoryview, out:np.ndarray):
+        out.reshape(-1).view(np.uint8)[:] = np.frombuffer(zlib.decompress(payload, bufsize=out.nbytes), np.uint8)
+
+class Lz4Codec(Codec):
+    name, id = "lz4", 2
+
+    def __init__(self):
+        try:
+            import lz4.block
+        except ImportError:
+            raise ImportError("codec 'lz4' needs the lz4 package: pip install lz4") from None
+        self._lz4 = lz4.block
+
+    def encode(self, array:np.ndarray) -> bytes:
+        return self._lz4.compress(array, store_size=False)
+
+    def decode_into(self, payload:memoryview, out:np.ndarray):
+        raw = self._lz4.decompress(payload, uncompressed_size=out.nbytes)
+        out.reshape(-1).view(np.uint8)[:] = np.frombuffer(raw, np.uint8)
+
+class JpegCodec(Codec):
+    """
+    Lossy, uint8 (H, W) or (H, W, 3) images only. Channel order is passed through unchanged.
+    """
+    name, id = "jpeg", 3
+
+    def __init__(self, quality:int = 90):
+        try:
+            import cv2
+        except ImportError:
+            raise ImportError("codec 'jpeg' needs OpenCV: pip install opencv-python-headless") from None
+        self._cv2 = cv2
+        self.quality = quality
+
+    def encode(self, array:np.ndarray) -> bytes:
+        ok, buf = self._cv2.imencode(".jpg", array, [self._cv2.IMWRITE_JPEG_QUALITY, self.quality])
+        if not ok:
+            raise ValueError(f"jpeg: cannot encode array of shape {array.shape} and dtype {array.dtype}")
+        return buf.tobytes()
+
+    def decode_into(self, payload:memoryview, out:np.ndarray):
+        flags = self._cv2.IMREAD_COLOR if out.ndim == 3 else self._cv2.IMREAD_GRAYSCALE
+        out[...] = self._cv2.imdecode(np.frombuffer(payload, np.uint8), flags)
+
+_CODECS = {c.name: c for c in (RawCodec, ZlibCodec, Lz4Codec, JpegCodec)}
+_instances:dict = {}
+
+def get_codec(codec:str | Codec) -> Codec:
+    """
+    codec: a registered name ("raw", "zlib", "lz4", "jpeg") or a Codec instance.
+    """
+    if isinstance(codec, Codec):
+        return codec
+    if codec not in _CODECS:
+        raise ValueError(f"Unknown codec {codec}, expected one of {list(_CODECS)}")
+    if codec not in _instances:
+        _instances[codec] = _CODECS[codec]()
+    return _instances[codec]
+
+def _codec_by_id(codec_id:int) -> Codec:
+    for cls in _CODECS.values():
+        if cls.id == codec_id:
+            return get_codec(cls.name)
+    raise ValueError(f"Unknown codec id {codec_id}")
+
+def register_codec(cls:type):
+    """
+    Add a Codec subclass (unique name and id, constructible without arguments).
+    """
+    _CODECS[cls.name] = cls
+
+def encode(codec:str | Codec, array:np.ndarray) -> bytes:
+    codec = get_codec(codec)
+    array = np.ascontiguousarray(array)
+    if array.ndim > 3:
+        raise ValueError(f"codec {codec.name}: at most 3 dimensions, got shape {array.shape}")
+    if len(array.dtype.str) != 3:
+        raise ValueError(f"codec {codec.name}: plain numeric dtypes only, got {array.dtype.str}")
+    shape = array.shape + (0,) * (3 - array.ndim)
+    header = _HEADER.pack(_MAGIC, _VERSION, codec.id, array.dtype.str.encode(), array.ndim, *shape, array.nbytes)
+    return header + codec.encode(array)
+
+def decode_header(data) -> tuple:
+    """
+    return: (codec, shape, dtype)
+    """
+    magic, version, codec_id, dtype, ndim, d0, d1, d2, _ = _HEADER.unpack_from(data)
+    if magic != _MAGIC or version != _VERSION:
+        raise ValueError(f"not an encoded frame (magic {magic!r}, version {version})")
+    return _codec_by_id(codec_id), (d0, d1, d2)[:ndim], np.dtype(dtype.decode())
+
+def decode_into(data, out:np.ndarray | None = None) -> np.ndarray:
+    """
+    Decode a frame produced by encode() into out (allocated if None; a contiguous array of the
+    same dtype and element count, its shape is kept).
+    """
+    codec, shape, dtype = decode_header(data)
+    if out is None:
+        out = np.empty(shape, dtype)
+    elif out.size != int(np.prod(shape)) or out.dtype != dtype:
+        raise ValueError(f"frame is {shape} {dtype}, out is {out.shape} {out.dtype}")
+    codec.decode_into(memoryview(data)[HEADER_SIZE:], out.reshape(shape))
+    return out
@@ -0,0 +1,138 @@
+"""
+Flat (de)serializers for fixed-size @final structs.
+
+cyclonedds.idl walks a struct field by field in Python on every serialize()/deserialize().
+For types made only of primitives and fixed arrays of primitives (float_7d, roboticArm_*...)
+the CDR layout is static, so fast_codec() generates, once per type, a single struct.Struct
+call in each direction. Other types (strings, sequences, keys, nested structs, e.g.
+process_state) get None and keep the generic path.
+"""
+import functools
+import struct
+
+import cyclonedds.idl as idl
+
+from teleai_dds_wrapper.utils import logger
+from teleai_dds_wrapper.utils.idl_utils import _fixed_fields
+
+# numpy kind -> struct format char
+_FORMATS = {
+    "u1": "B", "i1": "b", "u2": "H", "i2": "h", "u4": "I", "i4": "i",
+    "u8": "Q", "i8": "q", "f4": "f", "f8": "d", "?": "?",
+}
+
+_LE_XCDR1 = b"\x00\x01\x00\x00"
+
+def _layout(fields:list, xcdr2:bool, little_endian:bool) -> str:
+    """
+    struct format of header + body; XCDR1 aligns 8-byte primitives to 8, XCDR2 caps alignment at 4.
+    """
+    align_max = 4 if xcdr2 else 8
+    fmt = ["<" if little_endian else ">", "4s"]
+    pos = 0
+    for name, kind, size, shape in fields:
+        align = min(size, align_max)
+        pad = -pos % align
+        if pad:
+            fmt.append(f"{pad}x")
+            pos += pad
+        count = shape[0] if shape else 1
+        # octet arrays are bytes in the generated types, everything else a list
+        fmt.append(f"{count}s" if shape and kind == "u1" else f"{count}{_FORMATS[kind]}")
+        pos += size * count
+    return "".join(fmt)
+
+def _unpack_source(fields:list) -> str:
+    args, i = [], 1
+    for name, kind, size, shape in fields:
+        if shape and kind != "u1":
+            args.append(f"{name}=list(v[{i}:{i + shape[0]}])")
+            i += shape[0]
+        else:
+            args.append(f"{name}=v[{i}]")
+            i += 1
+    return f"def unpack(data):\n    v = _unpack_from(data)\n    return T({', '.join(args)})\n"
+
+def _pack_source(fields:list) -> str:
+    args = ["_header"]
+    for name, kind, size, shape in fields:
+        args.append(f"*msg.{name}" if shape and kind != "u1" else f"msg.{name}")
+    return f"def pack(msg):\n    return _pack({', '.join(args)})\n"
+
+def _compile(source:str, name:str, namespace:dict):
+    exec(compile(source, f"<fast_codec {name}>", "exec"), namespace)
+    return namespace[name]
+
+class FastCodec(object):
+    """
+    serialize(msg) -> CDR bytes (little-endian XCDR1, header included), identical to msg.serialize().
+    deserialize(data) -> struct_type instance, for any encapsulation of the type (LE/BE, XCDR1/2).
+    """
+    def __init__(self, struct_type:idl.IdlStruct, fields:list):
+        self.struct_type = struct_type
+        self._fields = fields
+        self._unpackers = {}
+        writer = struct.Struct(_layout(fields, xcdr2=False, little_endian=True))
+        self.size = writer.size
+        self.serialize = _compile(_pack_source(fields), "pack", {"_pack": writer.pack, "_header": _LE_XCDR1})
+        self._le_xcdr1 = self._unpacker(_LE_XCDR1)
+
+    def _unpacker(self, header:bytes):
+        kind = header[1]
+        reader = struct.Struct(_layout(self._fields, xcdr2=kind > 3, little_endian=bool(kind & 1)))
+        unpack = _compile(_unpack_source(self._fields), "unpack",
+                          {"_unpack_from": reader.unpack_from, "T": self.struct_type})
+        self._unpackers[header] = unpack
+        return unpack
+
+    def deserialize(self, data):
+        header = bytes(data[:4])
+        if header == _LE_XCDR1:
+            return self._le_xcdr1(data)
+        unpack = self._unpackers.get(header)
+        if unpack is None:
+            unpack = self._unpacker(header)
+        return unpack(data)
+
+def _probe(struct_type:idl.IdlStruct, fields:list) -> idl.IdlStruct:
+    """
+    Instance with a distinct non-zero value in every field, to compare against the generic codec.
+    """
+    values = {}
+    for i, (name, kind, size, shape) in enumerate(fields):
+        if kind == "?":
+            value = [True, False] * (shape[0] // 2) + [True] * (shape[0] % 2) if shape else True
+        elif shape and kind == "u1":
+            value = bytes((i + j + 1) % 256 for j in range(shape[0]))
+        else:
+            scalar = (lambda j: j + i + 0.5) if kind[0] == "f" else (lambda j: (j + i + 1) % 100)
+            value = [scalar(j) for j in range(shape[0])] if shape else scalar(0)
+        values[name] = value
+    return struct_type(**values)
+
+@functools.lru_cache(maxsize=None)
+def fast_codec(struct_type:idl.IdlStruct) -> FastCodec | None:
+    """
+    FastCodec for a fixed-size @final, keyless struct, or None (use the generic serializer).
+    The generated codec is checked once against serialize()/deserialize() before it is used.
+    """
+    annotations = getattr(struct_type, "__idl_annotations__", {})
+    if annotations.get("extensibility", "final") != "final" or annotations.get("keylist"):
+        return None
+    if any("key" in a for a in getattr(struct_type, "__idl_field_annotations__", {}).values()):
+        return None
+    fields = _fixed_fields(struct_type)
+    if not fields:
+        return None
+    codec = FastCodec(struct_type, fields)
+    try:
+        sample = _probe(struct_type, fields)
+        expected = sample.serialize()
+        ok = codec.serialize(sample) == expected and codec.deserialize(expected) == struct_type.deserialize(expected)
+    except Exception as e:
+        logger.warning(f"fast codec for {struct_type.__name__} failed its self-check ({e!r}), using the generic one.")
+        return None
+    if not ok:
+        logger.warning(f"fast codec for {struct_type.__name__} does not match serialize(), using the generic one.")
+        return None
+    return codec
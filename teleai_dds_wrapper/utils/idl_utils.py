@@ -0,0 +1,114 @@
+import typing
+
+import numpy as np
+import cyclonedds.idl as idl
+import cyclonedds.idl.types as types
+
+_BYTE_TYPES = (types.byte, types.uint8)
+
+# IDL primitive -> (numpy kind without byte order, size)
+_PRIMITIVES = {
+    types.byte: ("u1", 1), types.uint8: ("u1", 1), types.int8: ("i1", 1),
+    types.int16: ("i2", 2), types.uint16: ("u2", 2),
+    types.int32: ("i4", 4), types.uint32: ("u4", 4),
+    types.int64: ("i8", 8), types.uint64: ("u8", 8),
+    types.float32: ("f4", 4), types.float64: ("f8", 8),
+    bool: ("?", 1), int: ("i8", 8), float: ("f8", 8),
+}
+
+def _default_value(hint):
+    for meta in getattr(hint, "__metadata__", ()):
+        if isinstance(meta, types.array):
+            if meta.subtype in _BYTE_TYPES:
+                return bytes(meta.length)
+            return [_default_value(meta.subtype)] * meta.length
+        if isinstance(meta, types.sequence):
+            return []
+    base = typing.get_origin(hint) or hint
+    if base is typing.Annotated:
+        base = hint.__origin__
+    if isinstance(base, type) and issubclass(base, idl.IdlStruct):
+        return make_sample(base)
+    return base()
+
+def make_sample(struct_type:idl.IdlStruct) -> idl.IdlStruct:
+    """
+    Zero/empty-initialized instance of a generated struct (octet arrays as bytes).
+    """
+    hints = typing.get_type_hints(struct_type, include_extras=True)
+    return struct_type(**{name: _default_value(hint) for name, hint in hints.items()})
+
+def generated_types() -> list:
+    """
+    Every struct generated from idl/commoninfo.idl, in declaration order.
+    """
+    from teleai_dds_wrapper.commonInfo.msg.dds_ import _commoninfo
+    return [obj for obj in vars(_commoninfo).values()
+            if isinstance(obj, type) and issubclass(obj, idl.IdlStruct) and obj.__module__ == _commoninfo.__name__]
+
+def serialized_size(struct_type:idl.IdlStruct) -> int:
+    """
+    CDR size (header included) of a default sample; exact for fixed-size types.
+    """
+    return len(make_sample(struct_type).serialize())
+
+def _fixed_fields(struct_type:idl.IdlStruct) -> list | None:
+    """
+    [(name, numpy kind, size, shape)] when every field is a primitive or a fixed array of
+    primitives, else None (strings, sequences, nested structs...).
+    """
+    fields = []
+    for name, hint in typing.get_type_hints(struct_type, include_extras=True).items():
+        shape = ()
+        for meta in getattr(hint, "__metadata__", ()):
+            if isinstance(meta, types.array):
+                shape = (meta.length,)
+                hint = meta.subtype
+                break
+        spec = _PRIMITIVES.get(hint)
+        if spec is None:
+            return None
+        fields.append((name, spec[0], spec[1], shape))
+    return fields
+
+def numpy_dtype(struct_type:idl.IdlStruct) -> np.dtype | None:
+    """
+    Packed structured dtype mirroring a fixed-size struct, e.g. for roboticArm_double_state_info:
+    [('left_arm_q', '<f4', (7,)), ('right_arm_q', '<f4', (7,)), ('left_gripper', '<f4'), ...].
+    None for types with variable-size fields.
+    """
+    fields = _fixed_fields(struct_type)
+    if fields is None:
+        return None
+    return np.dtype([(name, np.dtype(kind).newbyteorder("="), shape) for name, kind, _, shape in fields])
+
+def cdr_dtype(struct_type:idl.IdlStruct, xcdr2:bool = False, little_endian:bool = True) -> np.dtype | None:
+    """
+    Structured dtype with the field offsets of the CDR body (after the 4-byte encapsulation header)
+    of a fixed-size @final struct, so a received sample can be viewed with np.frombuffer.
+    XCDR1 aligns 8-byte primitives to 8, XCDR2 caps alignment at 4.
+    """
+    if getattr(struct_type, "__idl_annotations__", {}).get("extensibility", "final") != "final":
+        return None
+    fields = _fixed_fields(struct_type)
+    if fields is None:
+        return None
+    align_max = 4 if xcdr2 else 8
+    order = "<" if little_endian else ">"
+    names, formats, offsets = [], [], []
+    pos = 0
+    for name, kind, size, shape in fields:
+        align = min(size, align_max)
+        pos = (pos + align - 1) & ~(align - 1)
+        names.append(name)
+        formats.append((np.dtype(kind).newbyteorder(order), shape) if shape else np.dtype(kind).newbyteorder(order))
+        offsets.append(pos)
+        pos += size * (shape[0] if shape else 1)
+    return np.dtype({"names": names, "formats": formats, "offsets": offsets, "itemsize": pos})
+
+def cdr_dtype_for_header(struct_type:idl.IdlStruct, header:bytes) -> np.dtype | None:
+    """
+    cdr_dtype matching a sample's encapsulation header (byte 1: bit 0 little endian, > 3 XCDR2).
+    """
+    kind = header[1]
+    return cdr_dtype(struct_type, xcdr2=kind > 3, little_endian=bool(kind & 1))
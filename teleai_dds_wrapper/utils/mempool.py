@@ -0,0 +1,234 @@
+"""
+RouDi (iceoryx) mempool layout from the message types in use.
+
+    python -m teleai_dds_wrapper.utils.mempool --report
+    python -m teleai_dds_wrapper.utils.mempool --spec commonCamera_640480:3:2:2 --output configs/shm_confil.toml
+    python -m teleai_dds_wrapper.utils.mempool --spec TeleaiTensor:2:2:4 --max-payload 8000000 --report
+
+Every SHM sample occupies one chunk of the smallest pool it fits in, so each type gets a tier
+(payload + chunk header rounded up to a power of two): control messages land in 128-256 B chunks,
+a 640x480 RGB frame in 1 MiB chunks. The wrapper's own types are planned too; TeleaiTensor,
+CompressedFrame and RpcEnvelope carry arbitrary payloads and are only planned when --max-payload
+gives the largest sample to size them for (4194176 fills 4 MiB chunks). A topic pins at most
+    publishers * (history + 1) + subscribers * (queue depth + 1)
+chunks at once (history/queue plus the one being written/held); counts are that sum per tier times
+a headroom factor.
+"""
+import argparse
+import math
+import os
+import re
+import threading
+
+import cyclonedds.idl as idl
+from cyclonedds.qos import Qos, Policy
+
+from teleai_dds_wrapper.utils import logger
+from teleai_dds_wrapper.utils.idl_utils import generated_types, serialized_size, _fixed_fields
+
+# iceoryx chunk header plus the Cyclone PSMX metadata and alignment slack
+CHUNK_OVERHEAD = 128
+MIN_CHUNK_SIZE = 128
+MIN_POOL_COUNT = 32
+# assumed upper bound for types with strings/sequences
+VARIABLE_SIZE = 4096
+
+_lock = threading.Lock()
+_pools:list = None     # pools of the config RouDi is started with, loaded on first use
+_demand:dict = {}      # pool size -> chunks this process may pin
+
+def payload_chunk_size(nbytes:int) -> int:
+    """
+    Size of the chunk a serialized sample of nbytes lands in.
+    """
+    return max(MIN_CHUNK_SIZE, 1 << (nbytes + CHUNK_OVERHEAD - 1).bit_length())
+
+def chunk_size(struct_type:idl.IdlStruct, variable_size:int = VARIABLE_SIZE) -> int:
+    size = serialized_size(struct_type)
+    if _fixed_fields(struct_type) is None:
+        size = max(size, variable_size)
+    return payload_chunk_size(size)
+
+def wrapper_types() -> list:
+    """
+    Message types defined by the wrapper itself, (struct_type, bulk): bulk types carry arbitrary
+    payloads and are planned for the max payload instead of VARIABLE_SIZE.
+    """
+    from teleai_dds_wrapper.wrapper.tensor import TeleaiTensor
+    from teleai_dds_wrapper.wrapper.compressed import CompressedFrame
+    from teleai_dds_wrapper.wrapper.rpc import RpcEnvelope
+    from teleai_dds_wrapper.wrapper.clock import ClockSample
+    return [(TeleaiTensor, True), (CompressedFrame, True), (RpcEnvelope, True), (ClockSample, False)]
+
+def bulk_type(struct_type:idl.IdlStruct) -> bool:
+    """
+    Whether endpoints of struct_type are accounted from the size of the samples actually sent.
+    """
+    return any(t is struct_type and bulk for t, bulk in wrapper_types())
+
+def topic_chunks(publishers:int = 1, subscribers:int = 1, pub_depth:int = 1, sub_depth:int = 1) -> int:
+    return publishers * (pub_depth + 1) + subscribers * (sub_depth + 1)
+
+def plan_mempools(specs:list, headroom:float = 2.0, min_count:int = MIN_POOL_COUNT,
+                  variable_size:int = VARIABLE_SIZE) -> list:
+    """
+    specs: [{"type": struct_type, "publishers": 1, "subscribers": 1, "pub_depth": 1, "sub_depth": 1}, ...]
+           (missing keys default to 1; "max_bytes" overrides variable_size for the type)
+    return: [{"size": chunk bytes, "count": chunks, "types": [type names]}, ...] sorted by size.
+    """
+    tiers = {}
+    for spec in specs:
+        size = chunk_size(spec["type"], spec.get("max_bytes", variable_size))
+        tier = tiers.setdefault(size, {"size": size, "chunks": 0, "types": []})
+        tier["chunks"] += topic_chunks(spec.get("publishers", 1), spec.get("subscribers", 1),
+                                       spec.get("pub_depth", 1), spec.get("sub_depth", 1))
+        tier["types"].append(spec["type"].__name__)
+    pools = []
+    for size in sorted(tiers):
+        tier = tiers[size]
+        pools.append({"size": size, "count": max(min_count, math.ceil(tier["chunks"] * headroom)),
+                      "types": tier["types"]})
+    return pools
+
+def footprint(pools:list) -> int:
+    """
+    Bytes of shared memory the pools occupy (chunk payloads only).
+    """
+    return sum(p["size"] * p["count"] for p in pools)
+
+def to_toml(pools:list) -> str:
+    lines = ["[general]", "version = 1", "", "[[segment]]"]
+    for p in pools:
+        lines += ["", "[[segment.mempool]]"]
+        if p.get("types"):
+            lines.append(f"# {', '.join(p['types'])}")
+        lines += [f"size = {p['size']}", f"count = {p['count']}"]
+    return "\n".join(lines) + "\n"
+
+def read_mempools(path:str) -> list:
+    """
+    [{"size", "count"}] of every [[segment.mempool]] in a RouDi config.
+    """
+    with open(path) as f:
+        text = f.read()
+    pools = []
+    for block in text.split("[[segment.mempool]]")[1:]:
+        size = re.search(r"^\s*size\s*=\s*(\d+)", block, re.M)
+        count = re.search(r"^\s*count\s*=\s*(\d+)", block, re.M)
+        if size and count:
+            pools.append({"size": int(size.group(1)), "count": int(count.group(1))})
+    return sorted(pools, key=lambda p: p["size"])
+
+def _history_depth(qos:Qos) -> int | None:
+    history = qos[Policy.History] if qos is not None else None
+    if history is None:
+        return 1
+    return getattr(history, "depth", None)   # None: KeepAll
+
+def reserve_chunks(topic:str, struct_type:idl.IdlStruct, qos:Qos, role:str, payload_bytes:int = None) -> tuple | None:
+    """
+    Account for the chunks a new SHM publisher/subscriber may pin in the configured pools and
+    warn when this process alone would exhaust the pool its samples go to, or when no pool
+    fits its samples. Only this process's endpoints are counted, other processes share the same pools.
+    payload_bytes: serialized sample size, for bulk types (see bulk_type()) whose size is only
+                   known from the samples; default chunk_size(struct_type).
+    return: reservation to hand to release_chunks() when the endpoint is closed.
+    """
+    from teleai_dds_wrapper._bootstrap import _shm_enabled, EXPECTED_CONFIG_PATH
+    global _pools
+    if not _shm_enabled():
+        return None
+    with _lock:
+        if _pools is None:
+            _pools = read_mempools(EXPECTED_CONFIG_PATH) if os.path.exists(EXPECTED_CONFIG_PATH) else []
+        size = chunk_size(struct_type) if payload_bytes is None else payload_chunk_size(payload_bytes)
+        pool = next((p for p in _pools if p["size"] >= size), None)
+        if pool is None:
+            logger.warning(f"[Mempool] {role} {topic}: no mempool in {EXPECTED_CONFIG_PATH} fits "
+                           f"{struct_type.__name__} ({size} B chunks), see python -m teleai_dds_wrapper.utils.mempool.")
+            return None
+        depth = _history_depth(qos)
+        if depth is None:
+            logger.warning(f"[Mempool] {role} {topic}: KeepAll history can pin every chunk of the {pool['size']} B pool.")
+            return None
+        _demand[pool["size"]] = _demand.get(pool["size"], 0) + depth + 1
+        if _demand[pool["size"]] > pool["count"]:
+            logger.warning(f"[Mempool] {role} {topic}: endpoints in this process may pin {_demand[pool['size']]} "
+                           f"chunks of the {pool['size']} B pool, which has {pool['count']}. "
+                           f"Regenerate {EXPECTED_CONFIG_PATH} with python -m teleai_dds_wrapper.utils.mempool.")
+        return pool["size"], depth + 1
+
+def release_chunks(reservation:tuple | None):
+    if reservation is None:
+        return
+    size, chunks = reservation
+    with _lock:
+        _demand[size] -= chunks
+
+def _type_defaults(defaults:dict, max_payload:int) -> dict:
+    # type name -> default spec, generated types first; bulk types only with a max payload to size them for
+    specs = {t.__name__: dict(defaults, type=t) for t in generated_types()}
+    for t, bulk in wrapper_types():
+        if not bulk:
+            specs[t.__name__] = dict(defaults, type=t)
+        elif max_payload:
+            specs[t.__name__] = dict(defaults, type=t, max_bytes=max_payload)
+    return specs
+
+def _parse_spec(text:str, by_name:dict) -> dict:
+    # TYPE[:PUBLISHERS[:SUBSCRIBERS[:DEPTH]]]
+    parts = text.split(":")
+    if parts[0] not in by_name:
+        if any(t.__name__ == parts[0] for t, bulk in wrapper_types() if bulk):
+            raise ValueError(f"{parts[0]} carries arbitrary payloads, give --max-payload to plan it")
+        raise ValueError(f"Unknown message type {parts[0]}")
+    spec = dict(by_name[parts[0]])
+    for key, value in zip(("publishers", "subscribers", "pub_depth"), parts[1:]):
+        spec[key] = int(value)
+    spec["sub_depth"] = spec["pub_depth"]
+    return spec
+
+def main(argv=None):
+    from teleai_dds_wrapper._bootstrap import EXPECTED_CONFIG_PATH
+    parser = argparse.ArgumentParser(prog="python -m teleai_dds_wrapper.utils.mempool", description=__doc__,
+                                     formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--publishers", type=int, default=4, help="publishers per type")
+    parser.add_argument("--subscribers", type=int, default=4, help="subscribers per type")
+    parser.add_argument("--depth", type=int, default=1, help="history / queue depth")
+    parser.add_argument("--spec", action="append", default=[], metavar="TYPE[:PUBS[:SUBS[:DEPTH]]]",
+                        help="override the defaults for one type; repeat per type (other types keep the defaults)")
+    parser.add_argument("--only-specs", action="store_true", help="plan only the --spec types")
+    parser.add_argument("--headroom", type=float, default=2.0)
+    parser.add_argument("--variable-size", type=int, default=VARIABLE_SIZE,
+                        help="assumed max serialized size of types with strings/sequences")
+    parser.add_argument("--max-payload", type=int, default=0,
+                        help="largest TeleaiTensor/CompressedFrame/RpcEnvelope sample in bytes; "
+                             "these types are planned only when it is given")
+    parser.add_argument("--output", default="", help="write the TOML here instead of stdout")
+    parser.add_argument("--report", action="store_true", help="print the footprint against the current config")
+    args = parser.parse_args(argv)
+
+    defaults = {"publishers": args.publishers, "subscribers": args.subscribers,
+                "pub_depth": args.depth, "sub_depth": args.depth}
+    by_name = _type_defaults(defaults, args.max_payload)
+    overrides = {s.split(":")[0]: _parse_spec(s, by_name) for s in args.spec}
+    names = [] if args.only_specs else list(by_name)
+    specs = [overrides.pop(name, by_name[name]) for name in names] + list(overrides.values())
+    pools = plan_mempools(specs, args.headroom, variable_size=args.variable_size)
+
+    if args.report:
+        for p in pools:
+            print(f"{p['size']:>10} B x {p['count']:>5} = {p['size'] * p['count'] / 2**20:9.2f} MiB  {', '.join(p['types'])}")
+        print(f"planned: {footprint(pools) / 2**20:.2f} MiB")
+        if os.path.exists(EXPECTED_CONFIG_PATH):
+            print(f"current ({EXPECTED_CONFIG_PATH}): {footprint(read_mempools(EXPECTED_CONFIG_PATH)) / 2**20:.2f} MiB")
+    text = to_toml(pools)
+    if args.output:
+        with open(args.output, "w") as f:
+            f.write(text)
+        logger.info(f"[Mempool] layout written to {args.output}")
+    elif not args.report:
+        print(text, end="")
+
+if __name__ == "__main__":
+    main()
@@ -19,4 +19,22 @@ def nano_sleep(ns):
     nanosleep_func(ctypes.byref(req), ctypes.byref(rem))
 
 def get_nano():
-    return time.clock_gettime_ns(time.CLOCK_REALTIME)
\ No newline at end of file
+    return time.clock_gettime_ns(time.CLOCK_REALTIME)
+
+CLOCK_MONOTONIC = time.CLOCK_MONOTONIC
+TIMER_ABSTIME = 1
+_EINTR = 4
+clock_nanosleep_func = libc.clock_nanosleep
+clock_nanosleep_func.argtypes = [ctypes.c_int, ctypes.c_int, ctypes.POINTER(Timespec), ctypes.POINTER(Timespec)]
+
+def get_mono_nano():
+    return time.clock_gettime_ns(CLOCK_MONOTONIC)
+
+def sleep_until(deadline_ns, clock=CLOCK_MONOTONIC):
+    """
+    Absolute sleep with clock_nanosleep(TIMER_ABSTIME): wake-up times do not accumulate drift
+    the way relative sleeps do. deadline_ns is on `clock` (get_mono_nano() for the default).
+    """
+    req = Timespec(deadline_ns // 1_000_000_000, deadline_ns % 1_000_000_000)
+    while clock_nanosleep_func(clock, TIMER_ABSTIME, ctypes.byref(req), None) == _EINTR:
+        pass
@@ -1 +1,12 @@
 from .wrapper import TeleaiCommonPub_1, TeleaiCommonSub_1, TeleaiCommonSub_1q
+from .async_wrapper import AsyncTeleaiPub, AsyncTeleaiSub
+from .ring import TeleaiRingSub
+from .sync import TeleaiSync
+from .record import TeleaiRecorder, TeleaiLog, TeleaiReplayer
+from .scheduler import TeleaiScheduler
+from .tensor import TeleaiTensor
+from .fanout import TeleaiFanoutSub
+from .rpc import TeleaiRpcClient, TeleaiRpcServer, RpcError
+from .keyed import TeleaiKeyedSub
+from .qos_profiles import qos_profile, qos_profiles, register_qos_profile, load_qos_profiles
+from .clock import TeleaiClockSync
@@ -0,0 +1,176 @@
+from cyclonedds.qos import Qos
+import cyclonedds.idl as idl
+
+import asyncio
+import concurrent.futures
+from collections import deque
+
+from teleai_dds_wrapper.utils import logger
+from teleai_dds_wrapper.wrapper.wrapper import TeleaiCommonPub_1, _ReaderBase, _TAKE_BATCH
+
+class AsyncTeleaiSub(_ReaderBase):
+    """
+    asyncio subscriber. DDS data-available events are forwarded into the event loop
+    (call_soon_threadsafe), so no thread per subscriber and no busy-waiting:
+
+        async for msg in sub: ...
+        msg = await sub.read(timeout=0.1)
+    """
+    def __init__(self, domain_id:int, topic:str, struct_type:idl.IdlStruct, qos:Qos=None,
+                 metrics:bool=False, clock_sync:bool=False, max_rate:float=None, every_nth:int=None,
+                 min_separation:float=None):
+        """
+        clock_sync, max_rate, every_nth, min_separation: as for TeleaiCommonSub_1.
+        """
+        # Bound to the running loop on the first read().
+        self._loop:asyncio.AbstractEventLoop = None
+        self._data_available:asyncio.Event = None
+        self._matched:asyncio.Event = None
+        self._pending = deque()
+
+        callbacks = {"on_data_available": self._on_data_available,
+                     "on_subscription_matched": self._on_matched}
+        self._open_reader(domain_id, topic, struct_type, qos, callbacks, "AsyncSub", metrics=metrics,
+                          clock_sync=clock_sync, max_rate=max_rate, every_nth=every_nth,
+                          min_separation=min_separation)
+        self._condition = self._read_condition()
+        logger.info(f"Domain: {domain_id} AsyncSub for {topic} start.")
+
+    def _bind_loop(self):
+        if self._loop is None:
+            self._loop = asyncio.get_running_loop()
+            self._data_available = asyncio.Event()
+            self._matched = asyncio.Event()
+
+    def _wake(self, event:asyncio.Event):
+        # Runs on a DDS thread: only wake the loop, the take happens on the loop itself.
+        loop = self._loop
+        if loop is None:
+            return
+        try:
+            loop.call_soon_threadsafe(event.set)
+        except RuntimeError:
+            # loop already closed
+            pass
+
+    def _on_data_available(self, reader):
+        self._wake(self._data_available)
+
+    def _on_matched(self, reader, status):
+        self._wake(self._matched)
+
+    async def wait_for_writers(self, n:int=1, timeout:float=None) -> bool:
+        """
+        Wait until at least n writers are matched; woken by discovery, no polling.
+        return: False if timeout (seconds) expired first, or once closed.
+        """
+        self._bind_loop()
+        deadline = None if timeout is None else self._loop.time() + timeout
+        while True:
+            # Clear before checking so a match in between still sets the event.
+            self._matched.clear()
+            if self._dr is None:
+                return False
+            if self.matched_writers >= n:
+                return True
+            remaining = None if deadline is None else deadline - self._loop.time()
+            if remaining is not None and remaining <= 0:
+                return False
+            try:
+                await asyncio.wait_for(self._matched.wait(), remaining)
+            except asyncio.TimeoutError:
+                return False
+
+    def _take(self) -> list:
+        """
+        return: [(msg, sample_info), ...] for every valid sample currently available.
+        """
+        if self._fast is not None or self._decimator is not None or self._chunks_per_payload:
+            deserialize = self._fast.deserialize if self._fast is not None else self._struct_type.deserialize
+            return [(deserialize(data), info) for data, info in self._take_raw(self._condition)]
+        return [(getattr(sample, "data", sample), sample.sample_info)
+                for sample in self._dr.take(_TAKE_BATCH, self._condition)
+                if sample.sample_info.valid_data]
+
+    def _fill(self):
+        for msg, info in self._take():
+            self._received(info)
+            self._pending.append(msg)
+
+    async def read(self, timeout:float=None)->idl.IdlStruct | None:
+        """
+        Wait for the next msg. timeout: seconds; None is returned when it expires, or once closed.
+        """
+        self._bind_loop()
+        # wakes that yield no kept sample (invalid, decimated) only wait out the rest of timeout
+        deadline = None if timeout is None else self._loop.time() + timeout
+        while not self._pending:
+            if self._dr is None:
+                return None
+            # Clear before taking so a sample arriving in between still sets the event.
+            self._data_available.clear()
+            self._fill()
+            if self._pending:
+                break
+            remaining = None if deadline is None else deadline - self._loop.time()
+            if remaining is not None and remaining <= 0:
+                return None
+            try:
+                await asyncio.wait_for(self._data_available.wait(), remaining)
+            except asyncio.TimeoutError:
+                return None
+        return self._pending.popleft()
+
+    def __aiter__(self):
+        return self
+
+    async def __anext__(self)->idl.IdlStruct:
+        if self._dr is None:
+            raise StopAsyncIteration
+        return await self.read()
+
+    def close(self):
+        if self._dr is None:
+            return
+        self._dr.set_listener(None)
+        self._condition = None
+        self._close_reader()
+        if self._loop is not None:
+            # pending read()/wait_for_writers() return instead of waiting out their timeout
+            self._wake(self._data_available)
+            self._wake(self._matched)
+
+class AsyncTeleaiPub(object):
+    """
+    asyncio publisher: `await pub.write(msg)`.
+    Writes are non-blocking under the default QoS (max_blocking_time=0) and run inline;
+    pass an executor to move serialization of large payloads off the event loop.
+    """
+    def __init__(self, domain_id:int, topic:str, struct_type:idl.IdlStruct, qos:Qos=None,
+                 executor:concurrent.futures.Executor=None, metrics:bool=False, clock_sync:bool=False):
+        self._pub = TeleaiCommonPub_1(domain_id, topic, struct_type, qos, metrics=metrics, clock_sync=clock_sync)
+        self._executor = executor
+
+    async def write(self, info):
+        if self._executor is None:
+            return self._pub.write(info)
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._executor, self._pub.write, info)
+
+    @property
+    def matched_readers(self) -> int:
+        return self._pub.matched_readers
+
+    async def wait_for_readers(self, n:int=1, timeout:float=None) -> bool:
+        """
+        Wait until at least n readers are matched, see TeleaiCommonPub_1.wait_for_readers.
+        The blocking wait runs in the executor (the loop's default one if none was given).
+        """
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._executor, self._pub.wait_for_readers, n, timeout)
+
+    def stats(self) -> dict | None:
+        return self._pub.stats()
+
+    def close(self):
+        self._pub.close()
@@ -0,0 +1,243 @@
+"""
+Clock offset and round-trip estimation between the processes of a domain (NTP-style ping/echo).
+
+Every TeleaiClockSync pings the domain once per period on the clock topic and echoes the pings of
+the others on the echo topic of the pinging node (echo_topic), which only that node reads:
+
+    t1  ping sent        (pinger clock)
+    t2  ping received    (responder clock)
+    t3  echo sent        (responder clock)
+    t4  echo received    (pinger clock)
+
+    delay  = (t4 - t1) - (t3 - t2)
+    offset = ((t2 - t1) + (t3 - t4)) / 2      responder clock - pinger clock
+
+Per peer the last `window` exchanges are kept and the one with the smallest delay is used: queueing
+only ever adds delay, and the offset error of an exchange is bounded by half its delay.
+
+Subscribers constructed with clock_sync=True share one instance per domain (acquire_clock) and
+correct their latencies with the offset of the process that wrote each sample. The remote process
+must run one too, e.g. through a publisher constructed with clock_sync=True.
+"""
+from dataclasses import dataclass
+
+from cyclonedds.core import DDSException
+import cyclonedds.idl as idl
+import cyclonedds.idl.annotations as annotate
+import cyclonedds.idl.types as types
+
+import threading
+import uuid
+from collections import deque
+
+from teleai_dds_wrapper.utils import get_nano, get_mono_nano, logger
+from teleai_dds_wrapper.wrapper.qos_profiles import qos_profile
+from teleai_dds_wrapper.wrapper.raw import take_raw
+from teleai_dds_wrapper.wrapper.wrapper import TeleaiCommonPub_1, _TeleaiSubBase, _TAKE_BATCH
+
+CLOCK_TOPIC = "teleai/clock"
+# echo writers of nodes that stopped pinging for this many periods are closed
+_ECHO_IDLE_PERIODS = 10
+
+# a lost ping only costs one estimate, a retransmitted one would be discarded by the delay filter anyway;
+# the depth absorbs the echoes of every peer arriving together
+_CLOCK_QOS = qos_profile("sensor", depth=64)
+
+@dataclass
+@annotate.final
+class ClockSample(idl.IdlStruct, typename="teleai_dds_wrapper.wrapper.ClockSample"):
+    origin: types.uint64        # node that sent the ping
+    responder: types.uint64     # node that echoed it, 0 in a ping
+    seq: types.uint32
+    t1: types.int64
+    t2: types.int64
+    t3: types.int64
+
+def echo_topic(topic:str, node:int) -> str:
+    """
+    Topic the echoes of node's pings travel on, so N nodes cost N echoes per period, not N * N.
+    """
+    return f"{topic}/echo/{node:016x}"
+
+def node_id(guid:uuid.UUID) -> int:
+    """
+    64-bit id of a participant, from its GUID (DomainParticipant.guid or DcpsEndpoint.participant_key).
+    """
+    return (guid.int >> 64) ^ (guid.int & 0xFFFFFFFFFFFFFFFF)
+
+class _ClockSub(_TeleaiSubBase):
+    """
+    Hands every ClockSample to on_sample(msg, recv_ns) on the listen thread.
+    """
+    def __init__(self, domain_id:int, topic:str, on_sample):
+        self._on_sample = on_sample
+        super().__init__(domain_id, topic, ClockSample, _CLOCK_QOS)
+
+    def _take(self, condition) -> list:
+        return [(data, info) for data, info in take_raw(self._dr, _TAKE_BATCH, condition) if info.valid_data]
+
+    def _on_samples(self, samples:list):
+        recv_ns = get_nano()
+        for data, _ in samples:
+            self._on_sample(self._fast.deserialize(data), recv_ns)
+
+class TeleaiClockSync(object):
+    """
+    Offset and round-trip time to every other process on the domain running a TeleaiClockSync:
+
+        clock = TeleaiClockSync(0)
+        clock.offset(node)          # ns to add to a local time to get the remote one, None until measured
+        clock.estimates()           # {node: {"offset_ns", "rtt_ns", "samples", "age_s"}}
+    """
+    def __init__(self, domain_id:int, period:float=1.0, window:int=8, topic:str=CLOCK_TOPIC):
+        """
+        period: seconds between pings.
+        window: exchanges kept per peer for the minimum-delay filter; clock drift limits how long
+                an old exchange stays valid, so window * period should stay within a few seconds.
+        """
+        self._domain_id = domain_id
+        self._topic = topic
+        self._period = period
+        self._window = window
+        self._lock = threading.Lock()
+        self._peers = {}        # node -> deque of (delay, offset, mono receive time)
+        self._writers = {}      # publication handle -> node of its participant
+        self._echo_pubs = {}    # origin node -> [echo writer, mono time of its last ping]
+        self._seq = 0
+        self._pub = TeleaiCommonPub_1(domain_id, topic, ClockSample, _CLOCK_QOS)
+        self.node = node_id(self._pub._dp.guid)
+        self._sub = _ClockSub(domain_id, topic, self._on_ping)
+        self._echo_sub = _ClockSub(domain_id, echo_topic(topic, self.node), self._on_echo)
+        self._stop = threading.Event()
+        self._ping_thread = threading.Thread(target=self._ping_loop, daemon=True)
+        self._ping_thread.start()
+        logger.info(f"Domain: {domain_id} ClockSync {self.node:016x} start.")
+
+    def _ping_loop(self):
+        while not self._stop.is_set():
+            self._seq = (self._seq + 1) & 0xFFFFFFFF
+            self._pub.write(ClockSample(self.node, 0, self._seq, get_nano(), 0, 0))
+            self._close_idle_echo_pubs()
+            self._stop.wait(self._period)
+
+    def _close_idle_echo_pubs(self):
+        idle_ns = _ECHO_IDLE_PERIODS * self._period * 1e9
+        now = get_mono_nano()
+        with self._lock:
+            idle = [node for node, (_, last) in self._echo_pubs.items() if now - last > idle_ns]
+            pubs = [self._echo_pubs.pop(node)[0] for node in idle]
+        for pub in pubs:
+            pub.close()
+
+    def _on_ping(self, msg:ClockSample, recv_ns:int):
+        if msg.origin == self.node or msg.responder != 0:
+            return
+        with self._lock:
+            entry = self._echo_pubs.get(msg.origin)
+            if entry is None:
+                # the first echo to a new node may go out before its reader is matched; only that exchange is lost
+                pub = TeleaiCommonPub_1(self._domain_id, echo_topic(self._topic, msg.origin), ClockSample, _CLOCK_QOS)
+                entry = self._echo_pubs[msg.origin] = [pub, 0]
+            entry[1] = get_mono_nano()
+        entry[0].write(ClockSample(msg.origin, self.node, msg.seq, msg.t1, recv_ns, get_nano()))
+
+    def _on_echo(self, msg:ClockSample, recv_ns:int):
+        if msg.origin != self.node or msg.responder == 0:
+            return
+        delay = (recv_ns - msg.t1) - (msg.t3 - msg.t2)
+        offset = ((msg.t2 - msg.t1) + (msg.t3 - recv_ns)) // 2
+        with self._lock:
+            exchanges = self._peers.get(msg.responder)
+            if exchanges is None:
+                exchanges = self._peers[msg.responder] = deque(maxlen=self._window)
+                logger.debug(f"ClockSync {self.node:016x}: peer {msg.responder:016x} found.")
+            exchanges.append((max(delay, 0), offset, get_mono_nano()))
+
+    def _best(self, node:int) -> tuple | None:
+        exchanges = self._peers.get(node)
+        return min(exchanges) if exchanges else None
+
+    def offset(self, node:int) -> int | None:
+        """
+        Clock of node - local clock (ns), from the exchange with the smallest delay; None until measured.
+        """
+        if node == self.node:
+            return 0
+        with self._lock:
+            best = self._best(node)
+        return None if best is None else best[1]
+
+    def rtt(self, node:int) -> int | None:
+        """
+        Smallest network round-trip time to node (ns) in the window, handling time excluded.
+        """
+        with self._lock:
+            best = self._best(node)
+        return None if best is None else best[0]
+
+    def writer_offset(self, reader, publication_handle:int) -> int:
+        """
+        Offset of the process owning a matched writer of reader (e.g. SampleInfo.publication_handle),
+        0 for local writers and until its process has been measured.
+        """
+        node = self._writers.get(publication_handle)
+        if node is None:
+            try:
+                endpoint = reader.get_matched_publication_data(publication_handle)
+            except DDSException:
+                endpoint = None
+            if endpoint is None:
+                return 0
+            node = self._writers[publication_handle] = node_id(endpoint.participant_key)
+        return self.offset(node) or 0
+
+    def estimates(self) -> dict:
+        """
+        {node: {"offset_ns", "rtt_ns", "samples", "age_s"}}, age_s: since the last echo of node.
+        """
+        now = get_mono_nano()
+        estimates = {}
+        with self._lock:
+            for node, exchanges in self._peers.items():
+                delay, offset, _ = min(exchanges)
+                estimates[node] = {"offset_ns": offset, "rtt_ns": delay, "samples": len(exchanges),
+                                   "age_s": (now - exchanges[-1][2]) / 1e9}
+        return estimates
+
+    def close(self):
+        if self._stop.is_set():
+            return
+        self._stop.set()
+        self._ping_thread.join()
+        self._sub.close()
+        self._echo_sub.close()
+        with self._lock:
+            pubs, self._echo_pubs = [entry[0] for entry in self._echo_pubs.values()], {}
+        for pub in pubs:
+            pub.close()
+        self._pub.close()
+
+_lock = threading.Lock()
+_clocks:dict = {}   # domain_id -> [TeleaiClockSync, refcount]
+
+def acquire_clock(domain_id:int) -> TeleaiClockSync:
+    """
+    The process-wide TeleaiClockSync of a domain, started on first use.
+    """
+    with _lock:
+        entry = _clocks.get(domain_id)
+        if entry is None:
+            entry = _clocks[domain_id] = [TeleaiClockSync(domain_id), 0]
+        entry[1] += 1
+        return entry[0]
+
+def release_clock(domain_id:int):
+    with _lock:
+        entry = _clocks.get(domain_id)
+        if entry is None:
+            return
+        entry[1] -= 1
+        if entry[1] > 0:
+            return
+        del _clocks[domain_id]
+    entry[0].close()
@@ -0,0 +1,55 @@
+from dataclasses import dataclass
+
+import cyclonedds.idl as idl
+import cyclonedds.idl.annotations as annotate
+import cyclonedds.idl.types as types
+
+import struct
+import numpy as np
+
+from teleai_dds_wrapper.utils.codec import encode, decode_into, decode_header
+from teleai_dds_wrapper.wrapper.raw import CDR_HEADER_SIZE, CDR_LE_HEADER
+
+# A publisher with codec=... writes the encoded frames to "<topic>/compressed". Readers on the raw
+# topic (local SHM consumers) are unaffected; remote consumers subscribe with compressed=True.
+COMPRESSED_SUFFIX = "/compressed"
+
+_LENGTH = struct.Struct("<I")
+
+@dataclass
+@annotate.final
+class CompressedFrame(idl.IdlStruct, typename="teleai_dds_wrapper.wrapper.CompressedFrame"):
+    # sequence<octet>; the wrapper reads it with take_raw/frame_payload, never through deserialize()
+    data: types.sequence[types.byte]
+
+def compressed_topic(topic:str) -> str:
+    return topic + COMPRESSED_SUFFIX
+
+def encode_frame(codec, array:np.ndarray) -> bytes:
+    """
+    Serialized CompressedFrame (CDR header included) carrying encode(codec, array), ready for write_raw.
+    """
+    payload = encode(codec, array)
+    pad = -len(payload) % 4
+    return b"".join((CDR_LE_HEADER, _LENGTH.pack(len(payload)), payload, bytes(pad)))
+
+def frame_payload(data) -> memoryview:
+    """
+    The encoded frame inside a serialized CompressedFrame (as taken with take_raw).
+    """
+    view = memoryview(data)
+    offset = CDR_HEADER_SIZE + _LENGTH.size
+    # the length is in the sample's byte order, bit 0 of the encapsulation kind
+    order = "<" if view[1] & 1 else ">"
+    (length,) = struct.unpack_from(order + "I", view, CDR_HEADER_SIZE)
+    return view[offset:offset + length]
+
+def decode_frame(data, out:np.ndarray | None = None) -> np.ndarray:
+    return decode_into(frame_payload(data), out)
+
+def frame_shape(data) -> tuple:
+    """
+    return: (shape, dtype) of the array carried by a serialized CompressedFrame.
+    """
+    _, shape, dtype = decode_header(frame_payload(data))
+    return shape, dtype
@@ -0,0 +1,277 @@
+from cyclonedds.qos import Qos
+import cyclonedds.idl as idl
+
+import multiprocessing
+from multiprocessing import shared_memory
+import threading
+from collections import deque
+
+import numpy as np
+
+from teleai_dds_wrapper.utils import logger
+from teleai_dds_wrapper.utils.array_utils import array_view, get_buffer_field
+from teleai_dds_wrapper.utils.fast_codec import fast_codec
+from teleai_dds_wrapper.utils.idl_utils import numpy_dtype, serialized_size
+from teleai_dds_wrapper.wrapper.raw import CDR_HEADER_SIZE
+from teleai_dds_wrapper.wrapper.tensor import TeleaiTensor, decode_tensor
+from teleai_dds_wrapper.wrapper.wrapper import _TeleaiSubBase
+
+_AFFINITIES = ("round_robin", "writer", "instance")
+_JOIN_TIMEOUT_S = 5.0
+
+def _worker_main(index:int, fn, struct_type, array_shape, array_dtype, shm_name:str, slot_size:int,
+                 tasks, results):
+    """
+    Worker process: build the msg over its shared-memory slot, run fn, send the result back.
+    The slot is handed back to the subscriber with the result, so fn must not keep the msg.
+    """
+    shm = shared_memory.SharedMemory(name=shm_name)
+    fast = fast_codec(struct_type)
+    is_tensor = struct_type is TeleaiTensor
+    buffer_field = get_buffer_field(struct_type) if array_shape is not None else None
+    while True:
+        task = tasks.get()
+        if task is None:
+            break
+        seq, slot, nbytes, ts = task
+        view = shm.buf[slot * slot_size:slot * slot_size + nbytes]
+        msg = None
+        try:
+            if array_shape is not None:
+                msg = array_view(view, array_shape, array_dtype, offset=CDR_HEADER_SIZE,
+                                 nbytes=buffer_field[1])
+            elif is_tensor:
+                msg = decode_tensor(view)[0]
+            elif fast is not None:
+                msg = fast.deserialize(view)
+            else:
+                msg = struct_type.deserialize(bytes(view))
+            results.put((seq, index, slot, ts, fn(msg), None))
+        except Exception as e:
+            results.put((seq, index, slot, ts, None, repr(e)))
+        # views over the segment must be gone before it can be closed
+        del msg
+        view.release()
+    shm.close()
+
+class TeleaiFanoutSub(_TeleaiSubBase):
+    """
+    Runs fn(msg) for every received sample in a pool of worker processes, e.g. to resize or
+    normalize camera frames on several cores. The received CDR bytes are copied once into a
+    shared-memory slot owned by the chosen worker (only small task tuples are pickled), and the
+    fn results come back through read() / add_callback(), in receive order if ordered=True.
+
+        def preprocess(frame):      # module level, picklable
+            return cv2.resize(frame, (224, 224)).astype(np.float32) / 255
+
+        sub = TeleaiFanoutSub(0, "camera", commonCamera_640480, preprocess, workers=4,
+                              array_shape=(480, 640, 3))
+        result, stamp = sub.read(timeout=0.1)
+
+    A sample is dropped (counted in `dropped`) when its worker has no free slot. A worker that
+    exits gets no more samples, and the ones it still held count as errors. Workers are
+    started with the spawn method, so scripts must create the subscriber under `if __name__ == "__main__":`.
+    """
+    def __init__(self, domain_id:int, topic:str, struct_type:idl.IdlStruct, fn, workers:int=4,
+                 affinity="round_robin", ordered:bool=True, slots_per_worker:int=4, slot_size:int=None,
+                 queue_size:int=64, qos:Qos=None, **kwargs):
+        """
+        fn: picklable callable (module-level function or instance) run as fn(msg) in the workers;
+            msg is a struct_type instance, or an ndarray view for array_shape= / TeleaiTensor.
+        affinity: "round_robin" (next worker with a free slot), "writer" or "instance" (samples of
+                  one publication / instance always go to the same worker), or key(data, info) -> hashable.
+        ordered: hand out results in receive order (a slow sample holds back later ones).
+        slot_size: bytes per slot, serialized CDR size included; default the size of fixed-size types.
+        queue_size: results kept for read(), oldest dropped first.
+        """
+        if kwargs.get("compressed"):
+            raise TypeError(f"FanoutSub for {topic}: compressed topics are not supported.")
+        if not callable(affinity) and affinity not in _AFFINITIES:
+            raise ValueError(f"Unknown affinity {affinity}, expected one of {list(_AFFINITIES)} or a callable")
+        if slot_size is None:
+            if numpy_dtype(struct_type) is None:
+                raise ValueError(f"FanoutSub for {topic}: {struct_type.__name__} is variable-size, give slot_size.")
+            slot_size = serialized_size(struct_type)
+        self._fn = fn
+        self._affinity = affinity
+        self._ordered = ordered
+        self._slot_size = slot_size
+        self.q = deque(maxlen=queue_size)
+        self.dispatched = 0
+        self.dropped = 0     # no free slot in the target worker, or larger than slot_size
+        self.errors = 0
+        self._seq = 0
+        self._next_seq = 0
+        self._pending = {}   # ordered mode: seq -> (result, ts) | None for failed samples
+        self._rr = 0
+
+        ctx = multiprocessing.get_context("spawn")
+        self._results = ctx.SimpleQueue()
+        self._tasks = []
+        self._shms = []
+        self._free = []
+        self._inflight = []  # per worker: seqs handed to it and not yet answered
+        self._workers = []
+        self._dead = set()
+        self._slot_lock = threading.Lock()
+        self._collector = None
+        try:
+            for index in range(workers):
+                shm = shared_memory.SharedMemory(create=True, size=slot_size * slots_per_worker)
+                self._shms.append(shm)
+                tasks = ctx.SimpleQueue()
+                process = ctx.Process(target=_worker_main, daemon=True, name=f"fanout-{topic}-{index}",
+                                      args=(index, fn, struct_type, kwargs.get("array_shape"),
+                                            kwargs.get("array_dtype", np.uint8), shm.name, slot_size,
+                                            tasks, self._results))
+                process.start()
+                self._tasks.append(tasks)
+                self._free.append(list(range(slots_per_worker)))
+                self._inflight.append(set())
+                self._workers.append(process)
+            self._collector = threading.Thread(target=self._collect, daemon=True)
+            self._collector.start()
+            super().__init__(domain_id, topic, struct_type, qos, **kwargs)
+        except BaseException:
+            self._stop_workers()
+            raise
+
+    def _take(self, condition) -> list:
+        return self._take_raw(condition)
+
+    def _pick_worker(self, data, info) -> int | None:
+        """
+        Worker index with a free slot for this sample, None if the sample has to be dropped.
+        Called with _slot_lock held.
+        """
+        n = len(self._workers)
+        if self._affinity == "round_robin":
+            for i in range(n):
+                index = (self._rr + i) % n
+                if self._free[index]:
+                    self._rr = index + 1
+                    return index
+            return None
+        if self._affinity == "writer":
+            key = info.publication_handle
+        elif self._affinity == "instance":
+            key = info.instance_handle
+        else:
+            key = self._affinity(data, info)
+        index = hash(key) % n
+        return index if self._free[index] else None
+
+    def _check_workers(self):
+        """
+        Retire workers that exited: no new samples go to them, and the collector fails the
+        samples they still held, so ordered mode does not wait for them forever.
+        """
+        for index, process in enumerate(self._workers):
+            if index in self._dead or process.is_alive():
+                continue
+            self._dead.add(index)
+            with self._slot_lock:
+                self._free[index].clear()
+            logger.error(f"FanoutSub for {self._topic}: worker {index} exited with code {process.exitcode}.")
+            # queued behind everything the worker sent before it died
+            self._results.put((None, index, None, None, None, f"worker exited with code {process.exitcode}"))
+
+    def _on_samples(self, samples:list):
+        self._check_workers()
+        for data, info in samples:
+            self._received(info)
+            nbytes = len(data)
+            with self._slot_lock:
+                index = self._pick_worker(data, info) if nbytes <= self._slot_size else None
+                if index is None:
+                    self.dropped += 1
+                    continue
+                slot = self._free[index].pop()
+                seq = self._seq
+                self._seq += 1
+                self._inflight[index].add(seq)
+            offset = slot * self._slot_size
+            self._shms[index].buf[offset:offset + nbytes] = data
+            self._tasks[index].put((seq, slot, nbytes, info.source_timestamp))
+            self.dispatched += 1
+
+    def _collect(self):
+        while True:
+            item = self._results.get()
+            if item is None:
+                break
+            seq, index, slot, ts, result, error = item
+            if seq is None:
+                # worker exited: fail whatever it had not answered
+                with self._slot_lock:
+                    lost = sorted(self._inflight[index])
+                    self._inflight[index].clear()
+                self.errors += len(lost)
+                if self._ordered:
+                    self._pending.update(dict.fromkeys(lost))
+                    self._flush()
+                continue
+            with self._slot_lock:
+                self._inflight[index].discard(seq)
+                if index not in self._dead:
+                    self._free[index].append(slot)
+            if error is not None:
+                self.errors += 1
+                logger.error(f"FanoutSub for {self._topic}: worker {index} failed on a sample: {error}")
+            done = None if error is not None else (result, ts)
+            if not self._ordered:
+                if done is not None:
+                    self._deliver(*done)
+                continue
+            self._pending[seq] = done
+            self._flush()
+
+    def _flush(self):
+        # ordered mode: hand out the results that are next in receive order
+        while self._next_seq in self._pending:
+            done = self._pending.pop(self._next_seq)
+            self._next_seq += 1
+            if done is not None:
+                self._deliver(*done)
+
+    def _deliver(self, result, ts:int):
+        with self._new_data:
+            if self._stats is not None and len(self.q) == self.q.maxlen:
+                self._stats.on_overwrite()
+            self.q.append((result, ts))
+            self._recv_count += 1
+            self._new_data.notify_all()
+        self._run_callbacks(result, ts)
+
+    def read(self, timeout:float=None) -> tuple | None:
+        """
+        Pop the oldest result as (fn result, source timestamp of its sample), or None.
+        timeout: seconds; if given, block up to timeout for a result instead of returning None at once.
+        """
+        with self._new_data:
+            if not self.q and timeout is not None:
+                self._new_data.wait_for(lambda: self._closed or self.q, timeout)
+            return self.q.popleft() if self.q else None
+
+    def close(self):
+        """
+        Stop the reader, let the workers finish their queued samples, then free the shared memory.
+        """
+        if self._closed:
+            return
+        super().close()
+        self._stop_workers()
+
+    def _stop_workers(self):
+        for tasks in self._tasks:
+            tasks.put(None)
+        for process in self._workers:
+            process.join(_JOIN_TIMEOUT_S)
+            if process.is_alive():
+                process.terminate()
+        if self._collector is not None:
+            self._results.put(None)
+            self._collector.join()
+        for shm in self._shms:
+            shm.close()
+            shm.unlink()
@@ -0,0 +1,180 @@
+from cyclonedds.core import InstanceState
+from cyclonedds.qos import Qos
+import cyclonedds.idl as idl
+
+from collections import OrderedDict
+
+from teleai_dds_wrapper.utils import get_mono_nano, logger
+from teleai_dds_wrapper.wrapper.wrapper import _TeleaiSubBase
+
+EVICT_DISPOSED = "disposed"
+EVICT_NO_WRITERS = "no_writers"     # every writer of the instance is gone (process exited or lost liveliness)
+EVICT_STALE = "stale"
+
+def key_fields(struct_type:idl.IdlStruct) -> list:
+    """
+    Names of the @key members of a generated struct, in declaration order.
+    """
+    annotations = getattr(struct_type, "__idl_field_annotations__", {})
+    return [name for name in struct_type.__annotations__ if annotations.get(name, {}).get("key")]
+
+class _Instance(object):
+    __slots__ = ("msg", "source_ts", "seen_ns", "handle")
+
+    def __init__(self, msg, source_ts:int, seen_ns:int, handle:int):
+        self.msg = msg
+        self.source_ts = source_ts
+        self.seen_ns = seen_ns
+        self.handle = handle
+
+class TeleaiKeyedSub(_TeleaiSubBase):
+    """
+    Latest sample per instance key of a keyed type (e.g. process_state, @key name), so heartbeats
+    of different processes no longer overwrite each other:
+
+        sub = TeleaiKeyedSub(0, "process_state", process_state)
+        sub.get("planner")          # (msg, source_timestamp) | None
+        sub.stale(2.0)              # keys not heard from for 2 s, oldest first
+
+    The table is kept in last-seen order, so an update is O(1) and stale()/expire() only walk the
+    stale entries. Instances are evicted when they are disposed or lose all writers.
+    """
+    _INSTANCE_STATES = InstanceState.Any
+
+    def __init__(self, domain_id:int, topic:str, struct_type:idl.IdlStruct, qos:Qos=None,
+                 on_evict=None, **kwargs):
+        """
+        on_evict: callback(key, msg, reason) run when an instance leaves the table, reason is
+                  EVICT_DISPOSED, EVICT_NO_WRITERS or EVICT_STALE.
+        """
+        if kwargs.get("compressed") or kwargs.get("array_shape") is not None:
+            raise TypeError(f"KeyedSub for {topic}: compressed and array topics are not keyed.")
+        self._key_fields = key_fields(struct_type)
+        if not self._key_fields:
+            raise TypeError(f"KeyedSub for {topic}: {struct_type.__name__} has no @key member.")
+        self._instances = OrderedDict()     # key -> _Instance, least recently seen first
+        self._handles = {}                  # instance_handle -> key, for dispose/no-writers notices
+        self._on_evict = on_evict
+        self.evicted = 0
+        self._read_count = 0
+        super().__init__(domain_id, topic, struct_type, qos, **kwargs)
+
+    def _take(self, condition) -> list:
+        # invalid samples are kept: they carry the instance state changes
+        return self._take_raw(condition, valid_only=False)
+
+    def key_of(self, msg) -> object:
+        if len(self._key_fields) == 1:
+            return getattr(msg, self._key_fields[0])
+        return tuple(getattr(msg, name) for name in self._key_fields)
+
+    def _on_samples(self, samples:list):
+        now = get_mono_nano()
+        updated, evicted = [], []
+        with self._new_data:
+            for data, info in samples:
+                if info.valid_data:
+                    msg = self._fast.deserialize(data) if self._fast is not None else self._struct_type.deserialize(data)
+                    key = self.key_of(msg)
+                    instance = self._instances.get(key)
+                    if instance is None:
+                        self._instances[key] = _Instance(msg, info.source_timestamp, now, info.instance_handle)
+                    else:
+                        instance.msg, instance.source_ts, instance.seen_ns = msg, info.source_timestamp, now
+                        self._instances.move_to_end(key)
+                    self._handles[info.instance_handle] = key
+                    self._received(info)
+                    self._recv_count += 1
+                    updated.append((msg, info.source_timestamp))
+                if info.instance_state != InstanceState.Alive:
+                    key = self._handles.pop(info.instance_handle, None)
+                    instance = self._instances.pop(key, None) if key is not None else None
+                    if instance is not None:
+                        reason = EVICT_DISPOSED if info.instance_state == InstanceState.NotAliveDisposed else EVICT_NO_WRITERS
+                        evicted.append((key, instance.msg, reason))
+            self.evicted += len(evicted)
+            self._new_data.notify_all()
+        for msg, ts in updated:
+            self._run_callbacks(msg, ts)
+        self._notify_evicted(evicted)
+
+    def _notify_evicted(self, evicted:list):
+        for key, msg, reason in evicted:
+            logger.info(f"KeyedSub for {self._topic}: {key!r} evicted ({reason}).")
+            if self._on_evict is not None:
+                try:
+                    self._on_evict(key, msg, reason)
+                except Exception as e:
+                    logger.error(f"KeyedSub for {self._topic}: on_evict raised: {e!r}")
+
+    def get(self, key) -> tuple | None:
+        """
+        return: (latest msg, its source timestamp) for key, or None.
+        """
+        with self.lock:
+            instance = self._instances.get(key)
+            return None if instance is None else (instance.msg, instance.source_ts)
+
+    def last_seen(self, key) -> float | None:
+        """
+        Seconds since a sample of key was received (local monotonic clock, immune to clock skew).
+        """
+        with self.lock:
+            instance = self._instances.get(key)
+            return None if instance is None else (get_mono_nano() - instance.seen_ns) / 1e9
+
+    def __len__(self) -> int:
+        return len(self._instances)
+
+    def __contains__(self, key) -> bool:
+        return key in self._instances
+
+    def keys(self) -> list:
+        """
+        Keys currently in the table, least recently seen first.
+        """
+        with self.lock:
+            return list(self._instances)
+
+    def read(self, timeout:float=None) -> dict:
+        """
+        Snapshot {key: latest msg}.
+        timeout: seconds; if given, first block until a sample newer than the previous read() arrives.
+        """
+        with self._new_data:
+            if timeout is not None:
+                self._new_data.wait_for(lambda: self._closed or self._recv_count != self._read_count, timeout)
+            self._read_count = self._recv_count
+            return {key: instance.msg for key, instance in self._instances.items()}
+
+    def stale(self, max_age:float) -> list:
+        """
+        Keys not received for more than max_age seconds, oldest first. Cost is proportional to
+        the number of stale keys, not the table size.
+        """
+        cutoff = get_mono_nano() - int(max_age * 1e9)
+        stale = []
+        with self.lock:
+            for key, instance in self._instances.items():
+                if instance.seen_ns > cutoff:
+                    break
+                stale.append(key)
+        return stale
+
+    def expire(self, max_age:float) -> list:
+        """
+        Evict (EVICT_STALE) and return the keys stale() would report.
+        """
+        cutoff = get_mono_nano() - int(max_age * 1e9)
+        evicted = []
+        with self.lock:
+            while self._instances:
+                key, instance = next(iter(self._instances.items()))
+                if instance.seen_ns > cutoff:
+                    break
+                self._instances.popitem(last=False)
+                self._handles.pop(instance.handle, None)
+                evicted.append((key, instance.msg, EVICT_STALE))
+            self.evicted += len(evicted)
+        self._notify_evicted(evicted)
+        return [key for key, _, _ in evicted]
@@ -0,0 +1,140 @@
+import threading
+import time
+import weakref
+
+from teleai_dds_wrapper.utils import logger
+
+# Latency histogram: bucket i holds latencies in [2^(i-1), 2^i) microseconds, bucket 0 is < 1 us.
+_N_BUCKETS = 32
+_RATE_WINDOW_NS = 1_000_000_000
+
+_registry = weakref.WeakSet()
+_dump_thread:threading.Thread = None
+_dump_stop = threading.Event()
+
+class TopicStats(object):
+    """
+    Opt-in per-topic counters. Updates are a few integer ops under a lock so they are
+    cheap enough for the receive path; stats() returns a plain-dict snapshot.
+    """
+    def __init__(self, topic:str, role:str):
+        self.topic = topic
+        self.role = role
+        self._lock = threading.Lock()
+        self._start = time.monotonic_ns()
+        self._count = 0
+        self._window_start = self._start
+        self._window_count = 0
+        self._rate = 0.0
+        self._hist = [0] * _N_BUCKETS
+        self._latency_sum_ns = 0
+        self._latency_max_ns = 0
+        self.overwritten = 0
+        self.sample_lost = 0
+        self.sample_rejected = 0
+        self.deadline_missed = 0
+        _registry.add(self)
+
+    def _tick(self, now:int):
+        self._count += 1
+        self._window_count += 1
+        elapsed = now - self._window_start
+        if elapsed >= _RATE_WINDOW_NS:
+            self._rate = self._window_count * 1e9 / elapsed
+            self._window_start = now
+            self._window_count = 0
+
+    def on_publish(self):
+        with self._lock:
+            self._tick(time.monotonic_ns())
+
+    def on_receive(self, latency_ns:int):
+        """
+        latency_ns: local receive time - sample_info.source_timestamp.
+        """
+        with self._lock:
+            self._tick(time.monotonic_ns())
+            lat = max(latency_ns, 0)
+            self._hist[min((lat // 1000).bit_length(), _N_BUCKETS - 1)] += 1
+            self._latency_sum_ns += lat
+            if lat > self._latency_max_ns:
+                self._latency_max_ns = lat
+
+    def on_overwrite(self):
+        with self._lock:
+            self.overwritten += 1
+
+    def on_sample_lost(self, reader, status):
+        self.sample_lost = status.total_count
+
+    def on_sample_rejected(self, reader, status):
+        self.sample_rejected = status.total_count
+
+    def on_deadline_missed(self, entity, status):
+        self.deadline_missed = status.total_count
+
+    def _percentile_us(self, hist:list, total:int, q:float) -> float | None:
+        if total == 0:
+            return None
+        target = q * total
+        seen = 0
+        for i, n in enumerate(hist):
+            seen += n
+            if seen >= target:
+                # upper edge of the bucket
+                return float(1 << i)
+        return float(1 << (_N_BUCKETS - 1))
+
+    def stats(self) -> dict:
+        with self._lock:
+            now = time.monotonic_ns()
+            hist = list(self._hist)
+            count = self._count
+            rate = self._rate
+            # a stalled topic should not keep reporting its last rate
+            if now - self._window_start >= 2 * _RATE_WINDOW_NS:
+                rate = 0.0
+            received = sum(hist)
+            snapshot = {
+                "topic": self.topic,
+                "role": self.role,
+                "count": count,
+                "rate_hz": rate,
+                "avg_rate_hz": count * 1e9 / max(now - self._start, 1),
+                "overwritten": self.overwritten,
+                "sample_lost": self.sample_lost,
+                "sample_rejected": self.sample_rejected,
+                "deadline_missed": self.deadline_missed,
+            }
+            if self.role == "sub":
+                snapshot.update({
+                    "latency_mean_us": self._latency_sum_ns / received / 1e3 if received else None,
+                    "latency_max_us": self._latency_max_ns / 1e3 if received else None,
+                    "latency_p50_us": self._percentile_us(hist, received, 0.50),
+                    "latency_p99_us": self._percentile_us(hist, received, 0.99),
+                    "latency_hist_log2_us": hist,
+                })
+            return snapshot
+
+def all_stats() -> list:
+    return [s.stats() for s in list(_registry)]
+
+def _dump_loop(interval:float, sink):
+    while not _dump_stop.wait(interval):
+        for snapshot in all_stats():
+            snapshot.pop("latency_hist_log2_us", None)
+            sink(f"[Stats] {snapshot}")
+
+def start_periodic_dump(interval:float = 5.0, sink=logger.info):
+    """
+    Log a snapshot of every instrumented wrapper in this process every `interval` seconds.
+    """
+    global _dump_thread
+    if _dump_thread is not None and _dump_thread.is_alive():
+        return
+    _dump_stop.clear()
+    _dump_thread = threading.Thread(target=_dump_loop, args=(interval, sink), daemon=True)
+    _dump_thread.start()
+
+def stop_periodic_dump():
+    _dump_stop.set()
@@ -0,0 +1,92 @@
+from cyclonedds.domain import DomainParticipant
+from cyclonedds.topic import Topic
+import cyclonedds.idl as idl
+
+import threading
+
+from teleai_dds_wrapper.utils import logger
+from teleai_dds_wrapper._bootstrap import ensure_roudi
+
+# Process-wide, reference-counted DomainParticipant/Topic cache.
+# Every wrapper in a process shares one participant per domain. Cyclone already runs one domain
+# instance (threads, sockets) per process, but each extra participant is announced to and
+# discovered by every peer, and is one more entity to create and delete.
+_lock = threading.RLock()
+_participants:dict = {}   # domain_id -> [DomainParticipant, refcount]
+_topics:dict = {}         # (domain_id, topic, struct_type) -> [Topic, refcount]
+
+def _delete(entity):
+    # dds_delete right away instead of whenever the last Python reference is collected: a reference
+    # kept by a traceback, a cycle or a closed wrapper would otherwise keep the participant's
+    # discovery threads and sockets alive. Entity.__del__ unregisters the handle, so the later
+    # collection of the Python object does not delete it a second time.
+    entity.__del__()
+
+def acquire_participant(domain_id:int) -> DomainParticipant:
+    with _lock:
+        entry = _participants.get(domain_id)
+        if entry is None:
+            # with the iceoryx PSMX configured RouDi must be up first (checked once per process)
+            ensure_roudi()
+            entry = _participants[domain_id] = [DomainParticipant(domain_id), 0]
+            logger.debug(f"Domain: {domain_id} participant created.")
+        entry[1] += 1
+        return entry[0]
+
+def release_participant(domain_id:int):
+    with _lock:
+        entry = _participants.get(domain_id)
+        if entry is None:
+            return
+        entry[1] -= 1
+        if entry[1] <= 0:
+            # every wrapper and topic of the domain has been released, so no reader/writer is left on it
+            del _participants[domain_id]
+            _delete(entry[0])
+            logger.debug(f"Domain: {domain_id} participant released.")
+
+def acquire_topic(domain_id:int, topic:str, struct_type:idl.IdlStruct) -> Topic:
+    """
+    A cached topic holds one reference on its domain participant.
+    """
+    key = (domain_id, topic, struct_type)
+    with _lock:
+        entry = _topics.get(key)
+        if entry is None:
+            dp = acquire_participant(domain_id)
+            entry = _topics[key] = [Topic(dp, topic, struct_type), 0]
+        entry[1] += 1
+        return entry[0]
+
+def release_topic(domain_id:int, topic:str, struct_type:idl.IdlStruct):
+    key = (domain_id, topic, struct_type)
+    with _lock:
+        entry = _topics.get(key)
+        if entry is None:
+            return
+        entry[1] -= 1
+        if entry[1] <= 0:
+            del _topics[key]
+            _delete(entry[0])
+            release_participant(domain_id)
+
+def participant_count() -> int:
+    with _lock:
+        return len(_participants)
+
+def topic_count() -> int:
+    with _lock:
+        return len(_topics)
+
+def close_all():
+    """
+    Before process exit or in tests: make sure every cached participant/topic has been released.
+    Entries go away with their last release, so anything left is still held by a live wrapper;
+    dropping it here would let that wrapper's later release delete entities the cache had
+    meanwhile handed to others. Raises RuntimeError naming them instead, close the wrappers first.
+    """
+    with _lock:
+        if _topics or _participants:
+            held = [f"domain {d}: {e[1]}" for d, e in _participants.items()] + \
+                   [f"topic {k[1]}: {e[1]}" for k, e in _topics.items()]
+            raise RuntimeError(f"close_all: participants/topics still referenced ({', '.join(held)}), close their wrappers first.")
@@ -0,0 +1,234 @@
+"""
+Named QoS profiles for the qos argument of every wrapper.
+
+    TeleaiCommonPub_1(0, "arm_cmd", float_7d)                       # qos=None -> "legacy"
+    TeleaiCommonPub_1(0, "camera", commonCamera_640480, qos="auto") # size rule -> "sensor"
+    TeleaiCommonSub_1(0, "camera", commonCamera_640480, qos="bulk") # by name
+    load_qos_profiles("configs/qos.toml")                           # add/override profiles
+
+qos=None stays "legacy", the QoS of wrapper versions without profiles. "auto" picks "sensor" or
+"control" from the type's size (default_profile); both lack the legacy 24 h deadline and "sensor"
+is best effort, so a legacy reader matches neither (DEADLINE / RELIABILITY incompatible). Switch
+a topic to "auto" or another profile only once all its readers are upgraded, readers first:
+a best-effort reader matches any writer, a reliable reader only reliable writers.
+"""
+import functools
+import xml.etree.ElementTree as ET
+
+from cyclonedds.qos import Qos, Policy
+from cyclonedds.util import duration
+import cyclonedds.idl as idl
+
+from teleai_dds_wrapper.utils.idl_utils import serialized_size
+
+# Above this a sample spans dozens of UDP fragments; waiting for a retransmit only delays the
+# next frame, which supersedes it anyway.
+LARGE_MESSAGE_BYTES = 64 * 1024
+
+_BULK_DEPTH = 64
+
+DEFAULT_PROFILE = "legacy"
+AUTO_PROFILE = "auto"
+
+_PROFILES = {
+    # the wrapper default before profiles existed
+    "legacy": Qos(
+        Policy.Reliability.Reliable(max_blocking_time=duration(milliseconds=0)),
+        Policy.Durability.Volatile,
+        Policy.History.KeepLast(1),
+        Policy.Deadline(duration(seconds=3600*24))
+    ),
+    # camera frames, point clouds: only the newest sample matters, never wait for retransmits
+    "sensor": Qos(
+        Policy.Reliability.BestEffort,
+        Policy.Durability.Volatile,
+        Policy.History.KeepLast(1)
+    ),
+    # joint commands/states: delivered if possible, but a write never blocks the control loop
+    "control": Qos(
+        Policy.Reliability.Reliable(max_blocking_time=duration(milliseconds=0)),
+        Policy.Durability.Volatile,
+        Policy.History.KeepLast(1)
+    ),
+    # recordings, request queues: every sample, writers may block briefly on a full history
+    "bulk": Qos(
+        Policy.Reliability.Reliable(max_blocking_time=duration(milliseconds=100)),
+        Policy.Durability.Volatile,
+        Policy.History.KeepLast(_BULK_DEPTH)
+    ),
+    # status/heartbeats: late joiners get the last value of each instance
+    "state": Qos(
+        Policy.Reliability.Reliable(max_blocking_time=duration(milliseconds=0)),
+        Policy.Durability.TransientLocal,
+        Policy.History.KeepLast(1)
+    ),
+    # pipelined request/reply: in-flight calls must not overwrite each other
+    "rpc": Qos(
+        Policy.Reliability.Reliable(max_blocking_time=duration(milliseconds=0)),
+        Policy.Durability.Volatile,
+        Policy.History.KeepLast(_BULK_DEPTH)
+    ),
+}
+
+def qos_profiles() -> list:
+    return list(_PROFILES)
+
+def qos_profile(name:str, depth:int = None) -> Qos:
+    """
+    depth: replace the profile's history with KeepLast(depth).
+    """
+    if name not in _PROFILES:
+        raise ValueError(f"Unknown QoS profile {name}, expected one of {list(_PROFILES)} or {AUTO_PROFILE}")
+    qos = _PROFILES[name]
+    if depth is not None:
+        qos = qos + Qos(Policy.History.KeepLast(depth))
+    return qos
+
+def register_qos_profile(name:str, qos:Qos | dict, base:str = None):
+    """
+    qos: a Qos, or a dict of the keys understood by load_qos_profiles(). base: profile it overrides.
+    """
+    if isinstance(qos, dict):
+        qos = _from_dict(qos)
+    if base is not None:
+        qos = qos_profile(base) + qos
+    _PROFILES[name] = qos
+
+@functools.lru_cache(maxsize=None)
+def default_profile(struct_type:idl.IdlStruct) -> str:
+    """
+    The profile of qos="auto": "sensor" for types whose serialized size reaches LARGE_MESSAGE_BYTES, else "control".
+    Variable-size types are judged by their empty sample.
+    """
+    return "sensor" if serialized_size(struct_type) >= LARGE_MESSAGE_BYTES else "control"
+
+def resolve_qos(qos:Qos | str | None, struct_type:idl.IdlStruct, depth:int = None) -> Qos:
+    """
+    What the wrappers do with their qos argument: a Qos is used as is, a str names a profile
+    ("auto": default_profile(struct_type)), None is DEFAULT_PROFILE.
+    depth: replaces the history with KeepLast(depth) in every case, a given Qos included.
+    """
+    if isinstance(qos, Qos) and len(qos):
+        return qos if depth is None else qos + Qos(Policy.History.KeepLast(depth))
+    if not qos:
+        qos = DEFAULT_PROFILE
+    elif qos == AUTO_PROFILE:
+        qos = default_profile(struct_type)
+    return qos_profile(qos, depth)
+
+def _ms(value:float) -> int:
+    return duration(milliseconds=value)
+
+def _from_dict(spec:dict) -> Qos:
+    """
+    reliability = "reliable" | "best_effort", max_blocking_ms, durability = "volatile" | "transient_local",
+    history = depth | "all", deadline_ms, lifespan_ms, latency_budget_ms
+    """
+    policies = []
+    reliability = spec.get("reliability")
+    if reliability == "reliable":
+        policies.append(Policy.Reliability.Reliable(max_blocking_time=_ms(spec.get("max_blocking_ms", 0))))
+    elif reliability == "best_effort":
+        policies.append(Policy.Reliability.BestEffort)
+    elif reliability is not None:
+        raise ValueError(f"reliability must be reliable or best_effort, not {reliability}")
+    durability = spec.get("durability")
+    if durability == "volatile":
+        policies.append(Policy.Durability.Volatile)
+    elif durability == "transient_local":
+        policies.append(Policy.Durability.TransientLocal)
+    elif durability is not None:
+        raise ValueError(f"durability must be volatile or transient_local, not {durability}")
+    history = spec.get("history")
+    if history == "all":
+        policies.append(Policy.History.KeepAll)
+    elif history is not None:
+        policies.append(Policy.History.KeepLast(int(history)))
+    if "deadline_ms" in spec:
+        policies.append(Policy.Deadline(_ms(spec["deadline_ms"])))
+    if "lifespan_ms" in spec:
+        policies.append(Policy.Lifespan(_ms(spec["lifespan_ms"])))
+    if "latency_budget_ms" in spec:
+        policies.append(Policy.LatencyBudget(_ms(spec["latency_budget_ms"])))
+    return Qos(*policies)
+
+def _load_toml(path:str) -> dict:
+    """
+        [profiles.camera_remote]
+        base = "sensor"
+        history = 2
+        lifespan_ms = 100
+    """
+    try:
+        import tomllib
+    except ImportError:
+        try:
+            import tomli as tomllib
+        except ImportError:
+            raise ImportError("loading TOML QoS profiles on Python < 3.11 needs tomli: pip install tomli") from None
+    with open(path, "rb") as f:
+        return tomllib.load(f).get("profiles", {})
+
+_XML_RELIABILITY = {"RELIABLE_RELIABILITY_QOS": "reliable", "BEST_EFFORT_RELIABILITY_QOS": "best_effort"}
+_XML_DURABILITY = {"VOLATILE_DURABILITY_QOS": "volatile", "TRANSIENT_LOCAL_DURABILITY_QOS": "transient_local"}
+
+def _path(path:str) -> str:
+    # DDS-XML files usually declare xmlns="http://www.omg.org/dds/"; {*} matches any namespace or none
+    return "/".join("{*}" + step for step in path.split("/"))
+
+def _xml_ms(element) -> float | None:
+    """
+    DDS-XML duration (<sec>, <nanosec>, or DURATION_INFINITY) in ms, None for infinity.
+    """
+    if element is None:
+        return None
+    sec = element.findtext(_path("sec"), "0").strip()
+    nanosec = element.findtext(_path("nanosec"), "0").strip()
+    if "INFINITE" in sec or "INFINITY" in sec:
+        return None
+    return int(sec) * 1e3 + int(nanosec) / 1e6
+
+def _load_xml(path:str) -> dict:
+    """
+    The reliability, durability, history, deadline, lifespan and latency_budget policies of every
+    <qos_profile> (DDS-XML, any library), merged over its datawriter/datareader/topic sections.
+    """
+    specs = {}
+    for profile in ET.parse(path).getroot().iterfind(".//" + _path("qos_profile")):
+        spec = {}
+        if profile.get("base_name"):
+            spec["base"] = profile.get("base_name").split("::")[-1]
+        for section in profile:
+            kind = section.findtext(_path("reliability/kind"))
+            if kind:
+                spec["reliability"] = _XML_RELIABILITY[kind.strip()]
+                blocking = _xml_ms(section.find(_path("reliability/max_blocking_time")))
+                if blocking is not None:
+                    spec["max_blocking_ms"] = blocking
+            kind = section.findtext(_path("durability/kind"))
+            if kind:
+                spec["durability"] = _XML_DURABILITY[kind.strip()]
+            kind = section.findtext(_path("history/kind"))
+            if kind:
+                spec["history"] = "all" if kind.strip() == "KEEP_ALL_HISTORY_QOS" else int(section.findtext(_path("history/depth"), "1"))
+            for tag, key in (("deadline/period", "deadline_ms"), ("lifespan/duration", "lifespan_ms"),
+                             ("latency_budget/duration", "latency_budget_ms")):
+                value = _xml_ms(section.find(_path(tag)))
+                if value is not None:
+                    spec[key] = value
+        specs[profile.get("name")] = spec
+    return specs
+
+def load_qos_profiles(path:str) -> list:
+    """
+    Register the profiles of a .toml or DDS-XML .xml file (existing names are replaced).
+    return: names of the loaded profiles.
+    """
+    specs = _load_xml(path) if path.endswith(".xml") else _load_toml(path)
+    if not specs:
+        raise ValueError(f"{path} defines no QoS profiles")
+    for name, spec in specs.items():
+        spec = dict(spec)
+        base = spec.pop("base", None)
+        register_qos_profile(name, spec, base)
+    return list(specs)
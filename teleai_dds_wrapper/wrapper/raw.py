@@ -0,0 +1,33 @@
+from cyclonedds.core import DDSException, ReadCondition, SampleState, ViewState, InstanceState
+from cyclonedds.pub import DataWriter
+from cyclonedds.sub import DataReader
+from cyclonedds._clayer import ddspy_write, ddspy_write_ts, ddspy_take
+
+# Serialized samples carry a 4-byte encapsulation header: 0x0001 is plain CDR, little endian.
+CDR_HEADER_SIZE = 4
+CDR_LE_HEADER = b"\x00\x01\x00\x00"
+
+def write_raw(dw:DataWriter, data, timestamp:int | None = None):
+    """
+    Write an already serialized sample (header included, length padded to 4).
+    data: bytes | bytearray | memoryview
+    """
+    if timestamp is not None:
+        ret = ddspy_write_ts(dw._ref, data, timestamp)
+    else:
+        ret = ddspy_write(dw._ref, data)
+    if ret < 0:
+        raise DDSException(ret, f"Occurred while writing raw sample in {repr(dw)}")
+
+def take_raw(dr:DataReader, N:int = 1, condition:ReadCondition = None) -> list:
+    """
+    Take up to N samples without deserializing them.
+    return: [(serialized bytes, SampleInfo), ...]
+    """
+    if condition is not None:
+        ret = ddspy_take(condition.reader._ref, condition.mask, N)
+    else:
+        ret = ddspy_take(dr._ref, SampleState.Any | ViewState.Any | InstanceState.Any, N)
+    if type(ret) == int:
+        raise DDSException(ret, f"Occurred while taking raw data in {repr(dr)}")
+    return ret
@@ -0,0 +1,317 @@
+"""
+Topic recording and replay.
+
+A recording is a directory:
+    meta.json   topics (name + "module:qualname" of the IdlStruct), domain, start/end time, count
+    data.bin    raw serialized samples (CDR header included), memory-mapped while recording
+    index.bin   one _INDEX_DTYPE row per sample, in receive order
+
+meta.json is written when recording starts and completed (end_time, count) by close(). index.bin is
+flushed after every batch, after the samples it points to, so a recorder that crashed or was killed
+leaves a readable recording: TeleaiLog takes the samples from the index, count is len(index).
+
+    rec = TeleaiRecorder("/data/run_01", 0, {"camera": commonCamera_640480, "arm": roboticArm_double_state_info})
+    ...
+    rec.close()
+
+    log = TeleaiLog("/data/run_01")
+    frame = log.array(log.at(t, "camera"), shape=(480, 640, 3))   # zero-copy view into data.bin
+
+    TeleaiReplayer(log, domain_id=1, rate=0.5).run()
+"""
+from cyclonedds.sub import DataReader
+from cyclonedds.core import WaitSet, ReadCondition, GuardCondition, SampleState, ViewState, InstanceState
+from cyclonedds.qos import Qos
+from cyclonedds.util import duration
+import cyclonedds.idl as idl
+
+import importlib
+import json
+import mmap
+import os
+import threading
+import numpy as np
+
+from teleai_dds_wrapper.utils import get_nano, nano_sleep, logger
+from teleai_dds_wrapper.utils.array_utils import get_buffer_field, array_view
+from teleai_dds_wrapper.wrapper.qos_profiles import resolve_qos
+from teleai_dds_wrapper.wrapper.raw import take_raw, CDR_HEADER_SIZE
+from teleai_dds_wrapper.wrapper.wrapper import TeleaiCommonPub_1
+from teleai_dds_wrapper.wrapper.participant import acquire_participant, release_participant, acquire_topic, release_topic
+
+_FORMAT_VERSION = 1
+_META_FILE = "meta.json"
+_DATA_FILE = "data.bin"
+_INDEX_FILE = "index.bin"
+_INDEX_DTYPE = np.dtype([("offset", "<u8"), ("source_ts", "<i8"), ("recv_ts", "<i8"), ("size", "<u4"), ("topic", "<u4")])
+# Sample bodies (after the 4-byte CDR header) start on a 64-byte boundary of data.bin,
+# so views over recorded arrays are aligned.
+_ALIGN = 64
+_TAKE_BATCH = 64
+
+def _type_path(struct_type:idl.IdlStruct) -> str:
+    return f"{struct_type.__module__}:{struct_type.__qualname__}"
+
+def _load_type(path:str) -> idl.IdlStruct:
+    module, _, qualname = path.partition(":")
+    obj = importlib.import_module(module)
+    for part in qualname.split("."):
+        obj = getattr(obj, part)
+    return obj
+
+class TeleaiRecorder(object):
+    """
+    Records raw serialized samples of several topics (no deserialization on the record path)
+    into a memory-mapped log. One thread takes from all readers through a single WaitSet.
+    """
+    def __init__(self, path:str, domain_id:int, topics:dict, qos:Qos=None, depth:int=64,
+                 chunk_size:int=256 << 20):
+        """
+        topics: {topic name: struct_type}
+        depth: reader history per topic (KeepLast), absorbs bursts while the recorder thread is busy.
+        chunk_size: data.bin grows by this many bytes at a time.
+        """
+        os.makedirs(path, exist_ok=True)
+        if os.path.exists(os.path.join(path, _META_FILE)):
+            raise FileExistsError(f"Recorder: {path} already holds a recording.")
+        self.path = path
+        self._domain_id = domain_id
+        self._topics = list(topics.items())
+        self._chunk_size = chunk_size
+        self._meta = {
+            "version": _FORMAT_VERSION,
+            "domain_id": domain_id,
+            "topics": [{"name": name, "type": _type_path(t)} for name, t in self._topics],
+            "start_time": get_nano(),
+            "end_time": None,   # both set by close()
+            "count": None,
+        }
+        self._write_meta()
+
+        self._data_file = open(os.path.join(path, _DATA_FILE), "w+b")
+        self._data_file.truncate(chunk_size)
+        self._mm = mmap.mmap(self._data_file.fileno(), chunk_size)
+        self._pos = 0
+        self._index_file = open(os.path.join(path, _INDEX_FILE), "wb")
+        self.count = 0
+
+        self._dp = acquire_participant(domain_id)
+        self._readers = []
+        for name, struct_type in self._topics:
+            tp = acquire_topic(domain_id, name, struct_type)
+            # per topic, so qos="auto" resolves each type's own size-based profile
+            self._readers.append(DataReader(self._dp, tp, resolve_qos(qos, struct_type, depth=depth)))
+
+        self._closed = False
+        self._guard = GuardCondition(self._dp)
+        self._record_thread = threading.Thread(target=self._record_loop)
+        self._record_thread.daemon = True
+        self._record_thread.start()
+        logger.info(f"Domain: {domain_id} Recorder for {[name for name, _ in self._topics]} -> {path} start.")
+
+    def _write_meta(self):
+        with open(os.path.join(self.path, _META_FILE), "w") as f:
+            json.dump(self._meta, f, indent=2)
+
+    def _record_loop(self):
+        waitset = WaitSet(self._dp)
+        conditions = []
+        for dr in self._readers:
+            conditions.append(ReadCondition(dr, ViewState.Any | InstanceState.Alive | SampleState.NotRead))
+            waitset.attach(conditions[-1])
+        waitset.attach(self._guard)
+        while not self._closed:
+            got = False
+            for i, (dr, condition) in enumerate(zip(self._readers, conditions)):
+                samples = take_raw(dr, _TAKE_BATCH, condition)
+                if samples:
+                    got = True
+                    self._append(i, samples)
+            if not got:
+                waitset.wait(duration(infinite=True))
+
+    def _append(self, topic_index:int, samples:list):
+        now = get_nano()
+        samples = [(data, info) for data, info in samples if info.valid_data]
+        rows = np.zeros(len(samples), dtype=_INDEX_DTYPE)
+        for row, (data, info) in zip(rows, samples):
+            offset = ((self._pos + CDR_HEADER_SIZE + _ALIGN - 1) & ~(_ALIGN - 1)) - CDR_HEADER_SIZE
+            end = offset + len(data)
+            if end > len(self._mm):
+                self._mm.resize(len(self._mm) + max(self._chunk_size, end - len(self._mm)))
+            self._mm[offset:end] = data
+            self._pos = end
+            row["offset"], row["size"], row["topic"] = offset, len(data), topic_index
+            row["source_ts"], row["recv_ts"] = info.source_timestamp, now
+        self._index_file.write(rows.tobytes())
+        # the rows reach the file (and survive a crash of this process) with their batch
+        self._index_file.flush()
+        self.count += len(rows)
+
+    def close(self):
+        """
+        Stop recording, trim data.bin to its used size and finalize meta.json.
+        """
+        if self._closed:
+            return
+        self._closed = True
+        self._guard.set(True)
+        self._record_thread.join()
+        self._readers = []
+        self._guard = None
+        self._dp = None
+        for name, struct_type in self._topics:
+            release_topic(self._domain_id, name, struct_type)
+        release_participant(self._domain_id)
+
+        self._mm.flush()
+        self._mm.close()
+        self._data_file.truncate(self._pos)
+        self._data_file.close()
+        self._index_file.close()
+        self._meta["end_time"] = get_nano()
+        self._meta["count"] = self.count
+        self._write_meta()
+        logger.info(f"Recorder {self.path}: {self.count} samples, {self._pos / 2**20:.1f} MiB.")
+
+class TeleaiLog(object):
+    """
+    Read side of a recording. Samples are addressed by their index row (receive order);
+    raw() and array() are views into the memory-mapped data file, nothing is copied.
+    """
+    def __init__(self, path:str):
+        self.path = path
+        with open(os.path.join(path, _META_FILE)) as f:
+            self.meta = json.load(f)
+        self.topics = [t["name"] for t in self.meta["topics"]]
+        self._types = [None] * len(self.topics)
+        # a recorder killed mid-write may leave a partial last row
+        raw = np.fromfile(os.path.join(path, _INDEX_FILE), dtype=np.uint8)
+        self.index = raw[:len(raw) - len(raw) % _INDEX_DTYPE.itemsize].view(_INDEX_DTYPE)
+        self._data_file = open(os.path.join(path, _DATA_FILE), "rb")
+        size = os.fstat(self._data_file.fileno()).st_size
+        self._mm = mmap.mmap(self._data_file.fileno(), size, access=mmap.ACCESS_READ) if size else b""
+        self._view = memoryview(self._mm)
+
+    def __len__(self) -> int:
+        return len(self.index)
+
+    def _topic_index(self, topic:str) -> int:
+        try:
+            return self.topics.index(topic)
+        except ValueError:
+            raise KeyError(f"Log {self.path} has no topic {topic}, recorded: {self.topics}") from None
+
+    def struct_type(self, topic:str) -> idl.IdlStruct:
+        i = self._topic_index(topic)
+        if self._types[i] is None:
+            self._types[i] = _load_type(self.meta["topics"][i]["type"])
+        return self._types[i]
+
+    def topic(self, i:int) -> str:
+        return self.topics[self.index[i]["topic"]]
+
+    def raw(self, i:int) -> memoryview:
+        """
+        Serialized sample i (CDR header included).
+        """
+        row = self.index[i]
+        return self._view[row["offset"]:row["offset"] + row["size"]]
+
+    def sample(self, i:int) -> idl.IdlStruct:
+        return self.struct_type(self.topic(i)).deserialize(bytes(self.raw(i)))
+
+    def array(self, i:int, shape:tuple = None, dtype=np.uint8) -> np.ndarray:
+        """
+        Read-only ndarray view over the octet-array payload of sample i (e.g. a camera frame).
+        """
+        field = get_buffer_field(self.struct_type(self.topic(i)))
+        if field is None:
+            raise TypeError(f"Log {self.path}: {self.topic(i)} has no octet-array field to view as ndarray.")
+        return array_view(self.raw(i), shape, dtype, offset=CDR_HEADER_SIZE, nbytes=field[1])
+
+    def indices(self, topic:str = None, start:int = None, end:int = None) -> np.ndarray:
+        """
+        Sample indices with start <= recv_ts < end (ns), optionally of one topic only.
+        """
+        recv_ts = self.index["recv_ts"]
+        lo = 0 if start is None else np.searchsorted(recv_ts, start, side="left")
+        hi = len(recv_ts) if end is None else np.searchsorted(recv_ts, end, side="left")
+        idx = np.arange(lo, hi)
+        if topic is not None:
+            idx = idx[self.index["topic"][lo:hi] == self._topic_index(topic)]
+        return idx
+
+    def at(self, t:int, topic:str) -> int | None:
+        """
+        Index of the last sample of topic received at or before t (ns), None if there is none.
+        """
+        idx = self.indices(topic, end=t + 1)
+        return int(idx[-1]) if len(idx) else None
+
+    def close(self):
+        self._data_file.close()
+        try:
+            self._view.release()
+            if self._mm:
+                self._mm.close()
+        except BufferError:
+            # arrays handed out by raw()/array() still reference the mapping, it is unmapped with them
+            pass
+
+class TeleaiReplayer(object):
+    """
+    Republishes a recording through TeleaiCommonPub_1, with the original inter-sample timing
+    scaled by 1/rate (rate=0: as fast as possible).
+    """
+    def __init__(self, log:TeleaiLog | str, domain_id:int = None, topics:list = None, rate:float = 1.0,
+                 remap:dict = None, qos:Qos = None, keep_timestamps:bool = False):
+        """
+        domain_id: default the recorded domain.
+        topics: subset of recorded topics to publish, default all.
+        remap: {recorded topic: published topic}
+        keep_timestamps: publish with the recorded source timestamps instead of now.
+        """
+        self.log = TeleaiLog(log) if isinstance(log, str) else log
+        self.rate = rate
+        self.keep_timestamps = keep_timestamps
+        domain_id = self.log.meta["domain_id"] if domain_id is None else domain_id
+        remap = remap or {}
+        self._pubs = {}
+        for name in topics or self.log.topics:
+            self._pubs[self.log._topic_index(name)] = TeleaiCommonPub_1(
+                domain_id, remap.get(name, name), self.log.struct_type(name), qos)
+        self._stop = threading.Event()
+
+    def run(self, start:int = None, end:int = None) -> int:
+        """
+        Blocking replay of the samples received in [start, end) (ns).
+        return: number of samples published.
+        """
+        idx = self.log.indices(start=start, end=end)
+        idx = idx[np.isin(self.log.index["topic"][idx], list(self._pubs))]
+        if not len(idx):
+            return 0
+        self._stop.clear()
+        rows = self.log.index[idx]
+        t0_log, t0 = int(rows["recv_ts"][0]), get_nano()
+        sent = 0
+        for i, row in zip(idx.tolist(), rows):
+            if self._stop.is_set():
+                break
+            if self.rate > 0:
+                wait = t0 + int((int(row["recv_ts"]) - t0_log) / self.rate) - get_nano()
+                if wait > 0:
+                    nano_sleep(wait)
+            ts = int(row["source_ts"]) if self.keep_timestamps else None
+            self._pubs[int(row["topic"])].write_serialized(self.log.raw(i), ts)
+            sent += 1
+        return sent
+
+    def stop(self):
+        self._stop.set()
+
+    def close(self):
+        for pub in self._pubs.values():
+            pub.close()
+        self._pubs = {}
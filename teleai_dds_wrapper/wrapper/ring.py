@@ -0,0 +1,111 @@
+from cyclonedds.qos import Qos
+import cyclonedds.idl as idl
+
+import itertools
+import numpy as np
+
+from teleai_dds_wrapper.utils.idl_utils import numpy_dtype, cdr_dtype_for_header
+from teleai_dds_wrapper.wrapper.qos_profiles import resolve_qos
+from teleai_dds_wrapper.wrapper.raw import CDR_HEADER_SIZE
+from teleai_dds_wrapper.wrapper.wrapper import _TeleaiSubBase
+
+class TeleaiRingSub(_TeleaiSubBase):
+    """
+    Keeps the last `depth` samples of a fixed-size type in a preallocated structured NumPy ring.
+    Received CDR bytes are decoded straight into the ring (no IdlStruct per sample), and
+    read_batch() returns everything new since the previous call as stacked arrays:
+
+        batch, stamps = sub.read_batch()
+        batch["left_arm_q"]   # (N, 7) float32
+        stamps                # (N,) int64 source timestamps
+    """
+    def __init__(self, domain_id:int, topic:str, struct_type:idl.IdlStruct, qos:Qos=None,
+                 depth:int=1024, **kwargs):
+        if kwargs.get("compressed"):
+            raise TypeError(f"RingSub for {topic}: compressed topics are not supported.")
+        self._ring_dtype = numpy_dtype(struct_type)
+        if self._ring_dtype is None:
+            raise TypeError(f"RingSub for {topic}: {struct_type.__name__} has variable-size fields.")
+        qos = resolve_qos(qos, struct_type, depth=depth)
+        self.depth = depth
+        self._ring = np.zeros(depth, dtype=self._ring_dtype)
+        self._stamps = np.zeros(depth, dtype=np.int64)
+        self._head = 0      # total samples written
+        self._tail = 0      # total samples handed out by read_batch
+        self.overrun = 0    # samples overwritten before read_batch saw them
+        self._cdr_dtypes = {}
+        super().__init__(domain_id, topic, struct_type, qos, **kwargs)
+
+    def _take(self, condition) -> list:
+        return self._take_raw(condition)
+
+    def _decode(self, samples:list) -> np.ndarray:
+        rows = []
+        # consecutive samples normally share one encapsulation (same writer), decode each run at once
+        for header, run in itertools.groupby(samples, key=lambda s: bytes(s[0][:CDR_HEADER_SIZE])):
+            run = list(run)
+            dtype = self._cdr_dtypes.get(header)
+            if dtype is None:
+                dtype = self._cdr_dtypes[header] = cdr_dtype_for_header(self._struct_type, header)
+            if dtype is None:
+                rows.append(np.array([self._from_struct(self._struct_type.deserialize(data)) for data, _ in run],
+                                     dtype=self._ring_dtype))
+                continue
+            end = CDR_HEADER_SIZE + dtype.itemsize
+            payload = b"".join([data[CDR_HEADER_SIZE:end] for data, _ in run])
+            rows.append(np.frombuffer(payload, dtype=dtype))
+        return rows[0] if len(rows) == 1 else np.concatenate([r.astype(self._ring_dtype) for r in rows])
+
+    def _from_struct(self, msg) -> tuple:
+        return tuple(np.frombuffer(v, np.uint8) if isinstance(v, (bytes, bytearray)) else v
+                     for v in (getattr(msg, name) for name in self._ring_dtype.names))
+
+    def _on_samples(self, samples:list):
+        records = self._decode(samples)
+        stamps = np.fromiter((info.source_timestamp for _, info in samples), dtype=np.int64, count=len(samples))
+        for _, info in samples:
+            self._received(info)
+        n = len(records)
+        with self._new_data:
+            self.pre_communication()
+            idx = (self._head + np.arange(n)) % self.depth
+            self._ring[idx] = records
+            self._stamps[idx] = stamps
+            self._head += n
+            self._recv_count += n
+            self.post_communication()
+            self._new_data.notify_all()
+        if self._callbacks:
+            for record, ts in zip(records, stamps.tolist()):
+                self._run_callbacks(record, ts)
+
+    def read_batch(self, timeout:float=None) -> tuple:
+        """
+        All samples received since the previous call, oldest first.
+        timeout: seconds; if given, block until at least one new sample is available.
+        return: (structured ndarray (N,), int64 source timestamps (N,)), both copies.
+        """
+        with self._new_data:
+            if timeout is not None:
+                self._new_data.wait_for(lambda: self._closed or self._head != self._tail, timeout)
+            n = self._head - self._tail
+            if n > self.depth:
+                self.overrun += n - self.depth
+                if self._stats is not None:
+                    for _ in range(n - self.depth):
+                        self._stats.on_overwrite()
+                n = self.depth
+            idx = (self._head - n + np.arange(n)) % self.depth
+            self._tail = self._head
+            return self._ring[idx], self._stamps[idx]
+
+    def read(self, timeout:float=None) -> np.void | None:
+        """
+        Latest sample as a structured scalar, or None if nothing was received yet.
+        """
+        with self._new_data:
+            if timeout is not None:
+                self._new_data.wait_for(lambda: self._closed or self._head != 0, timeout)
+            if self._head == 0:
+                return None
+            return self._ring[(self._head - 1) % self.depth].copy()
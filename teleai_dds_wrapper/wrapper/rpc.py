@@ -0,0 +1,384 @@
+from dataclasses import dataclass
+
+from cyclonedds.qos import Qos
+import cyclonedds.idl as idl
+import cyclonedds.idl.annotations as annotate
+import cyclonedds.idl.types as types
+
+import asyncio
+import concurrent.futures
+import heapq
+import os
+import struct
+import threading
+import time
+from collections import deque
+
+import numpy as np
+
+from teleai_dds_wrapper.utils import get_nano, get_mono_nano, logger
+from teleai_dds_wrapper.utils.fast_codec import fast_codec
+from teleai_dds_wrapper.wrapper.qos_profiles import resolve_qos
+from teleai_dds_wrapper.wrapper.raw import CDR_LE_HEADER
+from teleai_dds_wrapper.wrapper.tensor import TeleaiTensor, tensor_size, encode_tensor_into, decode_tensor
+from teleai_dds_wrapper.wrapper.wrapper import TeleaiCommonPub_1, _TeleaiSubBase
+
+# requests of one service go to "<service>/request", replies of all its clients to "<service>/reply"
+REQUEST_SUFFIX = "/request"
+REPLY_SUFFIX = "/reply"
+
+STATUS_OK = 0
+STATUS_ERROR = 1      # the handler raised, payload is the message
+STATUS_BUSY = 2       # rejected, the server is at max_concurrency + max_queue
+
+_LATENCY_WINDOW = 4096
+
+@dataclass
+@annotate.final
+class RpcEnvelope(idl.IdlStruct, typename="teleai_dds_wrapper.wrapper.RpcEnvelope"):
+    client_id: types.uint64
+    request_id: types.uint64
+    send_ns: types.int64        # client monotonic clock, echoed back unchanged
+    server_ns: types.int64      # reply: time the request spent in the server (queue + handler)
+    status: types.int32
+    payload: types.sequence[types.byte]     # serialized request/reply (CDR header included)
+
+# header and fixed fields of a serialized RpcEnvelope; every member is naturally aligned,
+# so XCDR1 and XCDR2 share the layout
+_ENVELOPE = struct.Struct("<4sQQqqiI")
+_ENVELOPE_BE = struct.Struct(">4sQQqqiI")
+
+class RpcError(Exception):
+    """
+    The server rejected the request or its handler raised.
+    """
+
+def _pack_envelope(client_id:int, request_id:int, send_ns:int, server_ns:int, status:int, payload) -> bytes:
+    return b"".join((_ENVELOPE.pack(CDR_LE_HEADER, client_id, request_id, send_ns, server_ns, status, len(payload)),
+                     payload))
+
+def _unpack_envelope(data) -> tuple:
+    """
+    return: (client_id, request_id, send_ns, server_ns, status, payload memoryview)
+    """
+    view = memoryview(data)
+    envelope = _ENVELOPE if view[1] & 1 else _ENVELOPE_BE
+    _, client_id, request_id, send_ns, server_ns, status, length = envelope.unpack_from(view)
+    return client_id, request_id, send_ns, server_ns, status, view[envelope.size:envelope.size + length]
+
+def _encode_payload(struct_type:idl.IdlStruct, msg) -> bytes:
+    if struct_type is TeleaiTensor and isinstance(msg, np.ndarray):
+        if not (msg.flags.c_contiguous or msg.flags.f_contiguous):
+            msg = np.ascontiguousarray(msg)
+        buf = bytearray(tensor_size(msg))
+        return memoryview(buf)[:encode_tensor_into(buf, msg, get_nano())]
+    fast = fast_codec(struct_type)
+    return fast.serialize(msg) if fast is not None else msg.serialize()
+
+def _decode_payload(struct_type:idl.IdlStruct, payload:memoryview):
+    if struct_type is TeleaiTensor:
+        return decode_tensor(payload)[0]
+    fast = fast_codec(struct_type)
+    return fast.deserialize(payload) if fast is not None else struct_type.deserialize(bytes(payload))
+
+def _percentiles_us(samples) -> tuple:
+    if not samples:
+        return None, None
+    p50, p99 = np.percentile(np.asarray(samples, dtype=np.float64) / 1e3, [50, 99])
+    return float(p50), float(p99)
+
+class _EnvelopeSub(_TeleaiSubBase):
+    """
+    Reader of RpcEnvelope samples, handed raw to on_envelope(data) on the listen thread.
+    """
+    def __init__(self, domain_id:int, topic:str, on_envelope, qos:Qos):
+        self._on_envelope = on_envelope
+        super().__init__(domain_id, topic, RpcEnvelope, qos)
+
+    def _take(self, condition) -> list:
+        return self._take_raw(condition)
+
+    def _on_samples(self, samples:list):
+        for data, info in samples:
+            self._received(info)
+            self._on_envelope(data)
+
+def _resolve(future:concurrent.futures.Future, result=None, error:Exception=None):
+    # the caller may have cancelled the future meanwhile
+    try:
+        if error is not None:
+            future.set_exception(error)
+        else:
+            future.set_result(result)
+    except concurrent.futures.InvalidStateError:
+        pass
+
+class _Call(object):
+    __slots__ = ("future", "send_ns", "deadline_ns")
+
+    def __init__(self, future:concurrent.futures.Future, send_ns:int, deadline_ns:int):
+        self.future = future
+        self.send_ns = send_ns
+        self.deadline_ns = deadline_ns
+
+class TeleaiRpcClient(object):
+    """
+    Request/reply on top of two topics, with several requests in flight. Each request carries
+    (client_id, request_id); replies are matched back to their future, so the controller can
+    pipeline inference calls instead of publishing one observation and polling for its result.
+
+        client = TeleaiRpcClient(0, "vla", TeleaiTensor, vla_inference_result_single)
+        client.wait_for_server(5.0)
+        futures = [client.call_async(obs) for obs in batch]     # concurrent.futures.Future
+        result = client.call(obs, timeout=0.2)                  # blocking
+        result = await client.acall(obs)                        # asyncio
+
+    TeleaiTensor requests/replies may be passed as plain ndarrays.
+    """
+    def __init__(self, domain_id:int, service:str, request_type:idl.IdlStruct, reply_type:idl.IdlStruct,
+                 timeout:float=1.0, qos:Qos=None):
+        """
+        timeout: default per-request timeout in seconds; the future fails with TimeoutError after it.
+        """
+        qos = resolve_qos(qos or "rpc", RpcEnvelope)
+        self._service = service
+        self._request_type = request_type
+        self._reply_type = reply_type
+        self.timeout = timeout
+        self.client_id = int.from_bytes(os.urandom(8), "little")
+        self._next_id = 1
+        self._calls:dict = {}       # request_id -> _Call
+        self._deadlines = []        # heap of (deadline_ns, request_id)
+        self._lock = threading.Lock()
+        self._wake = threading.Condition(self._lock)
+        self._closed = False
+        self.sent = 0
+        self.completed = 0
+        self.timeouts = 0
+        self.errors = 0
+        self._rtt_ns = deque(maxlen=_LATENCY_WINDOW)
+        self._server_ns = deque(maxlen=_LATENCY_WINDOW)
+
+        self._pub = TeleaiCommonPub_1(domain_id, service + REQUEST_SUFFIX, RpcEnvelope, qos)
+        self._sub = _EnvelopeSub(domain_id, service + REPLY_SUFFIX, self._on_reply, qos)
+        self._reaper = threading.Thread(target=self._expire, daemon=True)
+        self._reaper.start()
+
+    def wait_for_server(self, timeout:float=None) -> bool:
+        """
+        Block until a server matches both topics; requests sent earlier may be lost.
+        """
+        deadline = None if timeout is None else time.monotonic() + timeout
+        if not self._pub.wait_for_readers(1, timeout):
+            return False
+        return self._sub.wait_for_writers(1, None if deadline is None else max(0.0, deadline - time.monotonic()))
+
+    def call_async(self, request, timeout:float=None) -> concurrent.futures.Future:
+        """
+        Send request; the returned future resolves to the reply, or fails with TimeoutError / RpcError
+        (also at once when the client is closed).
+        """
+        payload = _encode_payload(self._request_type, request)
+        future = concurrent.futures.Future()
+        now = get_mono_nano()
+        timeout = self.timeout if timeout is None else timeout
+        with self._lock:
+            closed = self._closed
+            if not closed:
+                request_id = self._next_id
+                self._next_id += 1
+                deadline = now + int(timeout * 1e9)
+                self._calls[request_id] = _Call(future, now, deadline)
+                heapq.heappush(self._deadlines, (deadline, request_id))
+                if self._deadlines[0][1] == request_id:
+                    self._wake.notify()
+        if closed:
+            _resolve(future, error=RpcError(f"{self._service}: client closed"))
+            return future
+        try:
+            self._pub.write_serialized(_pack_envelope(self.client_id, request_id, now, 0, STATUS_OK, payload))
+        except Exception:
+            if not self._closed:
+                raise
+            # closed while sending: close() has failed the future already
+            return future
+        self.sent += 1
+        return future
+
+    def call(self, request, timeout:float=None):
+        return self.call_async(request, timeout).result()
+
+    async def acall(self, request, timeout:float=None):
+        return await asyncio.wrap_future(self.call_async(request, timeout))
+
+    def _on_reply(self, data):
+        client_id, request_id, send_ns, server_ns, status, payload = _unpack_envelope(data)
+        if client_id != self.client_id:
+            return
+        now = get_mono_nano()
+        with self._lock:
+            call = self._calls.pop(request_id, None)
+        if call is None:
+            # timed out already
+            return
+        if status == STATUS_OK:
+            try:
+                reply = _decode_payload(self._reply_type, payload)
+            except Exception as e:
+                self.errors += 1
+                _resolve(call.future, error=RpcError(f"{self._service}: cannot decode reply: {e!r}"))
+                return
+            self.completed += 1
+            self._rtt_ns.append(now - call.send_ns)
+            self._server_ns.append(server_ns)
+            _resolve(call.future, reply)
+            return
+        self.errors += 1
+        reason = "server busy" if status == STATUS_BUSY else bytes(payload).decode(errors="replace")
+        _resolve(call.future, error=RpcError(f"{self._service}: {reason}"))
+
+    def _expire(self):
+        while True:
+            expired = []
+            with self._lock:
+                if self._closed:
+                    return
+                if not self._deadlines:
+                    self._wake.wait()
+                    continue
+                deadline, request_id = self._deadlines[0]
+                now = get_mono_nano()
+                if now < deadline:
+                    self._wake.wait((deadline - now) / 1e9)
+                    continue
+                while self._deadlines and self._deadlines[0][0] <= now:
+                    _, request_id = heapq.heappop(self._deadlines)
+                    call = self._calls.pop(request_id, None)
+                    if call is not None:
+                        expired.append((request_id, call))
+            # futures are completed outside the lock, their callbacks may send new requests
+            for request_id, call in expired:
+                self.timeouts += 1
+                _resolve(call.future, error=TimeoutError(f"{self._service}: request {request_id} timed out"))
+
+    @property
+    def in_flight(self) -> int:
+        return len(self._calls)
+
+    def stats(self) -> dict:
+        """
+        End-to-end latency: rtt is send -> reply received on this client's clock, server the time
+        spent in the server, transport what remains (both directions of DDS delivery).
+        """
+        rtt = list(self._rtt_ns)
+        server = list(self._server_ns)
+        rtt_p50, rtt_p99 = _percentiles_us(rtt)
+        server_p50, server_p99 = _percentiles_us(server)
+        transport_p50, transport_p99 = _percentiles_us([r - s for r, s in zip(rtt, server)])
+        return {
+            "service": self._service,
+            "sent": self.sent,
+            "completed": self.completed,
+            "timeouts": self.timeouts,
+            "errors": self.errors,
+            "in_flight": self.in_flight,
+            "rtt_p50_us": rtt_p50, "rtt_p99_us": rtt_p99,
+            "server_p50_us": server_p50, "server_p99_us": server_p99,
+            "transport_p50_us": transport_p50, "transport_p99_us": transport_p99,
+        }
+
+    def close(self):
+        """
+        Pending futures fail with RpcError.
+        """
+        with self._lock:
+            if self._closed:
+                return
+            self._closed = True
+            calls, self._calls = self._calls, {}
+            self._wake.notify()
+        self._reaper.join()
+        for call in calls.values():
+            _resolve(call.future, error=RpcError(f"{self._service}: client closed"))
+        self._sub.close()
+        self._pub.close()
+
+class TeleaiRpcServer(object):
+    """
+    Serves handler(request) -> reply for TeleaiRpcClient. At most max_concurrency handlers run at
+    once (thread pool); up to max_queue further requests wait, anything beyond is answered
+    immediately with a busy status instead of piling up latency.
+
+        server = TeleaiRpcServer(0, "vla", TeleaiTensor, vla_inference_result_single, infer,
+                                 max_concurrency=2)
+    """
+    def __init__(self, domain_id:int, service:str, request_type:idl.IdlStruct, reply_type:idl.IdlStruct,
+                 handler, max_concurrency:int=1, max_queue:int=16, qos:Qos=None):
+        qos = resolve_qos(qos or "rpc", RpcEnvelope)
+        self._service = service
+        self._request_type = request_type
+        self._reply_type = reply_type
+        self._handler = handler
+        self._capacity = max_concurrency + max_queue
+        self._active = 0            # running + queued
+        self._lock = threading.Lock()
+        self.handled = 0
+        self.rejected = 0
+        self.errors = 0
+        self._handler_ns = deque(maxlen=_LATENCY_WINDOW)
+        self._executor = concurrent.futures.ThreadPoolExecutor(max_concurrency, thread_name_prefix=f"rpc-{service}")
+        self._pub = TeleaiCommonPub_1(domain_id, service + REPLY_SUFFIX, RpcEnvelope, qos)
+        self._sub = _EnvelopeSub(domain_id, service + REQUEST_SUFFIX, self._on_request, qos)
+        logger.info(f"Domain: {domain_id} RpcServer for {service} start.")
+
+    def _on_request(self, data):
+        received = get_mono_nano()
+        client_id, request_id, send_ns, _, _, payload = _unpack_envelope(data)
+        with self._lock:
+            busy = self._active >= self._capacity
+            if not busy:
+                self._active += 1
+        if busy:
+            self.rejected += 1
+            self._reply(client_id, request_id, send_ns, 0, STATUS_BUSY, b"")
+            return
+        # the payload view points into data, which the listen thread does not reuse
+        self._executor.submit(self._serve, client_id, request_id, send_ns, payload, received)
+
+    def _serve(self, client_id:int, request_id:int, send_ns:int, payload:memoryview, received:int):
+        try:
+            start = get_mono_nano()
+            reply = self._handler(_decode_payload(self._request_type, payload))
+            self._handler_ns.append(get_mono_nano() - start)
+            status, body = STATUS_OK, _encode_payload(self._reply_type, reply)
+            self.handled += 1
+        except Exception as e:
+            self.errors += 1
+            logger.error(f"RpcServer for {self._service}: handler raised {e!r}")
+            status, body = STATUS_ERROR, repr(e).encode()
+        finally:
+            with self._lock:
+                self._active -= 1
+        self._reply(client_id, request_id, send_ns, get_mono_nano() - received, status, body)
+
+    def _reply(self, client_id:int, request_id:int, send_ns:int, server_ns:int, status:int, body):
+        self._pub.write_serialized(_pack_envelope(client_id, request_id, send_ns, server_ns, status, body))
+
+    def stats(self) -> dict:
+        p50, p99 = _percentiles_us(list(self._handler_ns))
+        return {
+            "service": self._service,
+            "handled": self.handled,
+            "rejected": self.rejected,
+            "errors": self.errors,
+            "active": self._active,
+            "handler_p50_us": p50, "handler_p99_us": p99,
+        }
+
+    def close(self):
+        """
+        Stops taking requests and waits for the running handlers.
+        """
+        self._sub.close()
+        self._executor.shutdown(wait=True)
+        self._pub.close()
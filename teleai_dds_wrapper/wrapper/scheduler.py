@@ -0,0 +1,209 @@
+import heapq
+import itertools
+import os
+import threading
+from collections import deque
+
+import numpy as np
+
+from teleai_dds_wrapper.utils import get_mono_nano, sleep_until, logger
+
+# wake-up latencies kept per task for the jitter percentiles
+_JITTER_WINDOW = 4096
+# the last stretch before a deadline is slept with clock_nanosleep: precise, but add()/stop()
+# cannot cut it short; longer waits are on the scheduler's condition variable
+_PRECISE_SLEEP_NS = 2_000_000
+
+class _Task(object):
+    def __init__(self, callback, rate_hz:float, name:str, phase_ns:int):
+        self.callback = callback
+        self.name = name
+        self.period_ns = round(1e9 / rate_hz)
+        self.phase_ns = phase_ns
+        self.start_ns = 0
+        self.tick = 0                # deadline = start_ns + tick * period_ns, never accumulated
+        self.active = True
+        self.runs = 0
+        self.overruns = 0            # callback finished after its next deadline
+        self.skipped = 0             # periods dropped to catch up after an overrun
+        self.errors = 0
+        self.jitter_ns = deque(maxlen=_JITTER_WINDOW)
+        self.max_jitter_ns = 0
+        self.max_runtime_ns = 0
+
+    @property
+    def deadline(self) -> int:
+        return self.start_ns + self.tick * self.period_ns
+
+    def stats(self) -> dict:
+        jitter = np.asarray(self.jitter_ns, dtype=np.float64) / 1e3
+        p50, p99 = np.percentile(jitter, [50, 99]) if len(jitter) else (None, None)
+        return {
+            "name": self.name,
+            "rate_hz": 1e9 / self.period_ns,
+            "runs": self.runs,
+            "overruns": self.overruns,
+            "skipped": self.skipped,
+            "errors": self.errors,
+            "jitter_p50_us": p50,
+            "jitter_p99_us": p99,
+            "jitter_max_us": self.max_jitter_ns / 1e3,
+            "runtime_max_us": self.max_runtime_ns / 1e3,
+        }
+
+class TeleaiScheduler(object):
+    """
+    Runs periodic callbacks (e.g. 500 Hz arm commands, 30 Hz status) from one thread.
+    Each task wakes on absolute deadlines start + k * period (clock_nanosleep TIMER_ABSTIME),
+    so lateness never accumulates; a callback that overruns its next deadline skips the missed
+    periods instead of bursting.
+
+        sched = TeleaiScheduler(cpu=3, fifo_priority=80)
+        sched.add(lambda: pub.write(cmd), 500, "arm_cmd")
+        sched.add(publish_status, 30)
+        sched.start()
+    """
+    def __init__(self, cpu:int | set = None, fifo_priority:int = None):
+        """
+        cpu: pin the scheduler thread to this CPU (or set of CPUs).
+        fifo_priority: run the thread as SCHED_FIFO with this priority (1-99); needs CAP_SYS_NICE
+                       or an rtprio limit, otherwise a warning is logged and it stays SCHED_OTHER.
+        """
+        self._cpu = {cpu} if isinstance(cpu, int) else cpu
+        self._fifo_priority = fifo_priority
+        self._tasks = []
+        self._heap = []
+        self._seq = itertools.count()
+        self._lock = threading.Lock()
+        # notified by add() and stop(), so an idle or long-sleeping loop picks up the change at once
+        self._wakeup = threading.Condition(self._lock)
+        self._running = False
+        self._thread:threading.Thread = None
+
+    def add(self, callback, rate_hz:float, name:str = None, phase:float = 0.0) -> _Task:
+        """
+        phase: seconds after the first deadline, to spread tasks of the same rate.
+        The first deadline is one period after start(), or after add() if already running.
+        """
+        task = _Task(callback, rate_hz, name or getattr(callback, "__name__", "task"), int(phase * 1e9))
+        with self._wakeup:
+            self._tasks.append(task)
+            if self._running:
+                self._schedule_first(task, get_mono_nano())
+                self._wakeup.notify()
+        return task
+
+    def remove(self, task:_Task):
+        with self._lock:
+            task.active = False
+            self._tasks.remove(task)
+
+    def _schedule_first(self, task:_Task, now:int):
+        task.start_ns = now + task.phase_ns
+        task.tick = 1
+        heapq.heappush(self._heap, (task.deadline, next(self._seq), task))
+
+    def _setup_thread(self):
+        if self._cpu is not None:
+            try:
+                os.sched_setaffinity(0, self._cpu)
+            except OSError as e:
+                logger.warning(f"[Scheduler] cannot pin to CPU {self._cpu}: {e}")
+        if self._fifo_priority is not None:
+            try:
+                os.sched_setscheduler(0, os.SCHED_FIFO, os.sched_param(self._fifo_priority))
+            except PermissionError:
+                logger.warning(f"[Scheduler] SCHED_FIFO not permitted (needs CAP_SYS_NICE or rtprio limit), "
+                               f"running as SCHED_OTHER.")
+            except OSError as e:
+                logger.warning(f"[Scheduler] cannot set SCHED_FIFO {self._fifo_priority}: {e}")
+
+    def _next(self) -> tuple:
+        """
+        Wait for the earliest deadline until it is less than _PRECISE_SLEEP_NS away.
+        return: (deadline, task) popped from the heap, or (None, None) once stopped.
+        """
+        with self._wakeup:
+            while self._running:
+                if not self._heap:
+                    self._wakeup.wait()
+                    continue
+                deadline, _, task = self._heap[0]
+                if not task.active:
+                    heapq.heappop(self._heap)
+                    continue
+                remaining = deadline - get_mono_nano() - _PRECISE_SLEEP_NS
+                if remaining > 0:
+                    # woken early by add() (maybe an earlier deadline) or stop(): look again
+                    self._wakeup.wait(remaining / 1e9)
+                    continue
+                heapq.heappop(self._heap)
+                return deadline, task
+        return None, None
+
+    def _run(self):
+        self._setup_thread()
+        while self._running:
+            deadline, task = self._next()
+            if task is None:
+                break
+            sleep_until(deadline)
+            woke = get_mono_nano()
+            if not self._running:
+                break
+            try:
+                task.callback()
+            except Exception as e:
+                task.errors += 1
+                logger.error(f"[Scheduler] task {task.name} raised: {e!r}")
+            done = get_mono_nano()
+
+            jitter = woke - deadline
+            task.runs += 1
+            task.jitter_ns.append(jitter)
+            task.max_jitter_ns = max(task.max_jitter_ns, jitter)
+            task.max_runtime_ns = max(task.max_runtime_ns, done - woke)
+            task.tick += 1
+            if done > task.deadline:
+                task.overruns += 1
+                # resume on the first deadline still ahead, on the original grid
+                missed = (done - task.deadline) // task.period_ns + 1
+                task.skipped += missed
+                task.tick += missed
+            with self._lock:
+                if task.active:
+                    heapq.heappush(self._heap, (task.deadline, next(self._seq), task))
+
+    def start(self, block:bool = False):
+        """
+        block: run in the calling thread (pinning/priority then apply to it) until stop().
+        """
+        if self._running:
+            return
+        with self._lock:
+            self._running = True
+            self._heap = []
+            now = get_mono_nano()
+            for task in self._tasks:
+                self._schedule_first(task, now)
+        if block:
+            self._run()
+            return
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+        logger.info(f"[Scheduler] started with {len(self._tasks)} tasks.")
+
+    def stop(self):
+        """
+        Returns once the thread has finished the callback in progress, if any.
+        """
+        with self._wakeup:
+            self._running = False
+            self._wakeup.notify()
+        if self._thread is not None and self._thread is not threading.current_thread():
+            self._thread.join()
+        self._thread = None
+
+    def stats(self) -> list:
+        with self._lock:
+            return [task.stats() for task in self._tasks]
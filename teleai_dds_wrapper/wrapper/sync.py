@@ -0,0 +1,148 @@
+import bisect
+import threading
+
+from teleai_dds_wrapper.utils import logger
+
+_POLICIES = ("approximate", "exact")
+
+class _TopicQueue(object):
+    """
+    Received samples of one subscriber, kept sorted by source_timestamp.
+    """
+    def __init__(self, maxlen:int):
+        self.maxlen = maxlen
+        self.stamps = []
+        self.msgs = []
+        self.received = 0
+
+    def insert(self, msg, ts:int):
+        self.received += 1
+        if not self.stamps or ts >= self.stamps[-1]:
+            self.stamps.append(ts)
+            self.msgs.append(msg)
+        else:
+            # several writers on one topic may interleave slightly out of order
+            i = bisect.bisect_right(self.stamps, ts)
+            self.stamps.insert(i, ts)
+            self.msgs.insert(i, msg)
+        if len(self.stamps) > self.maxlen:
+            self.drop(len(self.stamps) - self.maxlen)
+
+    def drop(self, n:int):
+        del self.stamps[:n]
+        del self.msgs[:n]
+
+    def nearest(self, ts:int) -> int:
+        """
+        Index of the buffered sample closest to ts.
+        """
+        i = bisect.bisect_left(self.stamps, ts)
+        if i == len(self.stamps):
+            return i - 1
+        if i > 0 and ts - self.stamps[i - 1] <= self.stamps[i] - ts:
+            return i - 1
+        return i
+
+class TeleaiSync(object):
+    """
+    Matches samples of several subscribers by source_timestamp, e.g. a 30 Hz camera frame with the
+    1 kHz arm state closest to it:
+
+        cam = TeleaiCommonSub_1(0, "camera", commonCamera_640480)
+        arm = TeleaiCommonSub_1(0, "arm_state", roboticArm_double_state_info)
+        sync = TeleaiSync([cam, arm], slop=0.005)
+        (frame, state), (t_frame, t_state) = sync.read(timeout=0.1)
+
+    The slowest topic (fewest samples received) is the pivot: each of its samples is paired with the
+    nearest buffered sample of every other topic, found by bisection, once each other topic has a
+    sample at or past the pivot time. A set is emitted if every pair is within slop; each sample is
+    used at most once. policy="exact" requires identical timestamps.
+    """
+    def __init__(self, subs:list, slop:float = 0.01, policy:str = "approximate",
+                 queue_size:int = 256, callback=None):
+        """
+        subs: threaded subscribers (TeleaiCommonSub_1, TeleaiCommonSub_1q, TeleaiRingSub...).
+        slop: seconds, max distance between the pivot sample and each matched sample.
+        queue_size: samples buffered per topic; must cover slop at the fastest rate.
+        callback: callback(msgs, stamps) runs on a listen thread for every matched set.
+        """
+        if policy not in _POLICIES:
+            raise ValueError(f"TeleaiSync: unknown policy {policy!r}, expected one of {_POLICIES}")
+        if len(subs) < 2:
+            raise ValueError("TeleaiSync needs at least two subscribers")
+        self._subs = list(subs)
+        self._slop_nano = 0 if policy == "exact" else int(slop * 1e9)
+        self._queues = [_TopicQueue(queue_size) for _ in self._subs]
+        self._callback = callback
+        self._latest:tuple = None
+        self.matched = 0
+        self.dropped = 0    # pivot samples without a partner within slop
+
+        self.lock = threading.Lock()
+        self._new_match = threading.Condition(self.lock)
+        self._hooks = []
+        for i, sub in enumerate(self._subs):
+            hook = self._make_hook(i)
+            sub.add_callback(hook)
+            self._hooks.append(hook)
+        logger.info(f"Sync over {[sub._topic for sub in self._subs]} start ({policy}, slop {slop}s).")
+
+    def _make_hook(self, index:int):
+        def hook(msg, ts:int):
+            matches = []
+            with self._new_match:
+                self._queues[index].insert(msg, ts)
+                self._match(matches)
+                if matches:
+                    self._latest = matches[-1]
+                    self.matched += len(matches)
+                    self._new_match.notify_all()
+            if self._callback is not None:
+                for msgs, stamps in matches:
+                    self._callback(msgs, stamps)
+        return hook
+
+    def _match(self, out:list):
+        queues = self._queues
+        while all(q.stamps for q in queues):
+            p = min(range(len(queues)), key=lambda i: queues[i].received)
+            pivot = queues[p]
+            pts = pivot.stamps[0]
+            others = [q for i, q in enumerate(queues) if i != p]
+            # nothing older than pts - slop can match this or any later pivot sample
+            for q in others:
+                q.drop(bisect.bisect_left(q.stamps, pts - self._slop_nano))
+            if not all(q.stamps for q in others):
+                return
+            # wait until the nearest neighbour is final: every other topic has caught up to the pivot
+            if any(q.stamps[-1] < pts for q in others):
+                return
+            picks = [q.nearest(pts) if i != p else 0 for i, q in enumerate(queues)]
+            if any(abs(q.stamps[j] - pts) > self._slop_nano for q, j in zip(queues, picks)):
+                pivot.drop(1)
+                self.dropped += 1
+                continue
+            out.append((tuple(q.msgs[j] for q, j in zip(queues, picks)),
+                        tuple(q.stamps[j] for q, j in zip(queues, picks))))
+            for q, j in zip(queues, picks):
+                q.drop(j + 1)
+
+    def read(self, timeout:float = None) -> tuple | None:
+        """
+        Newest matched set not returned yet; older unread sets are skipped.
+        timeout: seconds; if given, block until a new set is matched.
+        return: ((msg, ...), (source_timestamp, ...)) in subscriber order, or None.
+        """
+        with self._new_match:
+            if timeout is not None and self._latest is None:
+                self._new_match.wait(timeout)
+            latest, self._latest = self._latest, None
+            return latest
+
+    def close(self):
+        """
+        Detach from the subscribers; the subscribers themselves stay open.
+        """
+        for sub, hook in zip(self._subs, self._hooks):
+            sub.remove_callback(hook)
+        self._hooks = []
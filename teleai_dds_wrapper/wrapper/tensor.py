@@ -0,0 +1,102 @@
+from dataclasses import dataclass
+
+import cyclonedds.idl as idl
+import cyclonedds.idl.annotations as annotate
+import cyclonedds.idl.types as types
+
+import struct
+import numpy as np
+
+from teleai_dds_wrapper.utils.buffer_pool import BufferPool
+from teleai_dds_wrapper.wrapper.raw import CDR_HEADER_SIZE, CDR_LE_HEADER
+
+@dataclass
+@annotate.final
+class TeleaiTensor(idl.IdlStruct, typename="teleai_dds_wrapper.wrapper.TeleaiTensor"):
+    """
+    Any ndarray on one topic type, no per-payload IDL struct needed. Written with
+    TeleaiCommonPub_1.write_array() and decoded by subscribers straight from the received
+    CDR bytes (never through deserialize(), which would build a Python list of the data).
+    """
+    timestamp: types.int64
+    dtype: str                              # numpy dtype.str, e.g. "<f4"
+    shape: types.sequence[types.uint32]
+    strides: types.sequence[types.int64]    # bytes, describe the layout of data (C or Fortran order)
+    data: types.sequence[types.byte]
+
+# pub side frame buffers, shared by all tensor publishers of the process
+tensor_pool = BufferPool()
+
+_U32 = {"<": struct.Struct("<I"), ">": struct.Struct(">I")}
+_I64 = {"<": struct.Struct("<q"), ">": struct.Struct(">q")}
+
+def _align(pos:int, n:int) -> int:
+    return (pos + n - 1) & ~(n - 1)
+
+def tensor_size(array:np.ndarray) -> int:
+    """
+    Upper bound of the serialized TeleaiTensor (CDR header included) for array.
+    """
+    return CDR_HEADER_SIZE + 8 + 4 + len(array.dtype.str) + 1 + 3 + 4 + 4 * array.ndim + 8 + 8 * array.ndim + 4 + array.nbytes
+
+def encode_tensor_into(buf:bytearray, array:np.ndarray, timestamp:int) -> int:
+    """
+    Serialize array as a little-endian XCDR1 TeleaiTensor into buf (at least tensor_size(array) long).
+    array must be C- or Fortran-contiguous.
+    return: number of bytes used.
+    """
+    view = memoryview(buf)
+    view[:CDR_HEADER_SIZE] = CDR_LE_HEADER
+    body = view[CDR_HEADER_SIZE:]
+    dtype = array.dtype.str.encode()
+    # offsets are relative to the body, 8-byte members aligned to 8 (XCDR1)
+    struct.pack_into("<q", body, 0, timestamp)
+    pos = 8
+    struct.pack_into(f"<I{len(dtype)}sx", body, pos, len(dtype) + 1, dtype)
+    pos = _align(pos + 4 + len(dtype) + 1, 4)
+    struct.pack_into(f"<I{array.ndim}I", body, pos, array.ndim, *array.shape)
+    pos += 4 + 4 * array.ndim
+    pos = _align(pos, 4)
+    struct.pack_into("<I", body, pos, array.ndim)
+    pos += 4
+    if array.ndim:
+        pos = _align(pos, 8)
+        struct.pack_into(f"<{array.ndim}q", body, pos, *array.strides)
+        pos += 8 * array.ndim
+    pos = _align(pos, 4)
+    struct.pack_into("<I", body, pos, array.nbytes)
+    pos += 4
+    # order="A" keeps a Fortran-ordered array's memory layout, matching the strides written above
+    body[pos:pos + array.nbytes] = array.reshape(-1, order="A").view(np.uint8)
+    return CDR_HEADER_SIZE + pos + array.nbytes
+
+def decode_tensor(data) -> tuple:
+    """
+    Read-only ndarray view over the data of a serialized TeleaiTensor (as taken with take_raw),
+    no copy and no per-element work.
+    return: (ndarray, timestamp)
+    """
+    view = memoryview(data)
+    order = "<" if view[1] & 1 else ">"
+    align_max = 4 if view[1] > 3 else 8     # XCDR2 caps alignment at 4
+    body = view[CDR_HEADER_SIZE:]
+    u32, i64 = _U32[order], _I64[order]
+
+    (timestamp,) = i64.unpack_from(body, 0)
+    pos = 8
+    (n,) = u32.unpack_from(body, pos)
+    dtype = np.dtype(bytes(body[pos + 4:pos + 4 + n - 1]).decode())
+    pos = _align(pos + 4 + n, 4)
+    (ndim,) = u32.unpack_from(body, pos)
+    shape = struct.unpack_from(f"{order}{ndim}I", body, pos + 4)
+    pos = _align(pos + 4 + 4 * ndim, 4)
+    (n,) = u32.unpack_from(body, pos)
+    pos += 4
+    if n:
+        pos = _align(pos, min(8, align_max))
+    strides = struct.unpack_from(f"{order}{n}q", body, pos)
+    pos = _align(pos + 8 * n, 4)
+    (nbytes,) = u32.unpack_from(body, pos)
+    pos += 4
+    array = np.ndarray(shape, dtype=dtype, buffer=body[pos:pos + nbytes], strides=strides)
+    return array, timestamp
@@ -1,157 +1,694 @@
-from cyclonedds.domain import DomainParticipant
-from cyclonedds.topic import Topic
 from cyclonedds.pub import DataWriter
 from cyclonedds.sub import DataReader
+from cyclonedds.core import Listener, WaitSet, ReadCondition, GuardCondition, SampleState, ViewState, InstanceState
 from cyclonedds.qos import Qos, Policy
 from cyclonedds.util import duration
 import cyclonedds.idl as idl
-from teleai_dds_wrapper.utils import get_nano, nano_sleep
+from teleai_dds_wrapper.utils import get_nano, get_mono_nano
+from teleai_dds_wrapper.utils.array_utils import get_buffer_field, as_byte_view, array_view
+from teleai_dds_wrapper.utils.mempool import bulk_type, reserve_chunks, release_chunks
+from teleai_dds_wrapper.utils.codec import get_codec, JpegCodec
+from teleai_dds_wrapper.utils.fast_codec import fast_codec
+from teleai_dds_wrapper.wrapper.compressed import CompressedFrame, compressed_topic, encode_frame, decode_frame, frame_shape
+from teleai_dds_wrapper.wrapper.metrics import TopicStats
+from teleai_dds_wrapper.wrapper.tensor import TeleaiTensor, tensor_pool, tensor_size, encode_tensor_into, decode_tensor
+from teleai_dds_wrapper.wrapper.qos_profiles import resolve_qos
+from teleai_dds_wrapper.wrapper.participant import acquire_participant, release_participant, acquire_topic, release_topic
+from teleai_dds_wrapper.wrapper.raw import write_raw, take_raw, CDR_HEADER_SIZE, CDR_LE_HEADER
 
 import threading
 from collections import deque
+import numpy as np
 
 from teleai_dds_wrapper.utils import logger
 
 class TeleaiCommonPub_1(object):
-    def __init__(self, domain_id:int, topic:str, struct_type:idl.IdlStruct, qos:Qos=None):
-        if not qos:
-            qos = Qos(
-                Policy.Reliability.Reliable(max_blocking_time=duration(milliseconds=0)),
-                Policy.Durability.Volatile,
-                Policy.History.KeepLast(1),
-                Policy.Deadline(duration(seconds=3600*24))
-            )
+    def __init__(self, domain_id:int, topic:str, struct_type:idl.IdlStruct, qos:Qos=None,
+                 metrics:bool=False, codec=None, clock_sync:bool=False, array_shape:tuple=None,
+                 array_dtype=np.uint8):
+        """
+        qos: Qos, a profile name (see qos_profiles), "auto" for the size-based choice,
+             or None for the "legacy" default.
+        metrics: record publish rate and offered-deadline misses, see stats().
+        clock_sync: run the domain's clock ping/echo service (see clock.py) in this process, so
+                    subscribers on other hosts can correct for this host's clock offset.
+        codec: "zlib" | "lz4" | "jpeg" | Codec, for octet-array types. Frames are additionally
+               published encoded on "<topic>/compressed" for remote subscribers (compressed=True),
+               only while such a reader is matched; the raw topic is unchanged.
+        array_shape, array_dtype: layout of the octet-array payload handed to the codec, e.g. (480, 640, 3);
+                                  required for "jpeg", which encodes (H, W) or (H, W, 3) uint8 images.
+        """
+        qos = resolve_qos(qos, struct_type)
+        self._domain_id = domain_id
         self._topic = topic
         self._struct_type = struct_type
-        self._dp = DomainParticipant(domain_id)
-        self._tp = Topic(self._dp, topic, struct_type)
-        self._dw = DataWriter(self._dp, self._tp, qos)
+        self._dp = acquire_participant(domain_id)
+        self._tp = acquire_topic(domain_id, topic, struct_type)
+        self._stats = TopicStats(topic, "pub") if metrics else None
+        # matched-status changes wake wait_for_readers() callers
+        self._matched = threading.Condition()
+        callbacks = {"on_publication_matched": self._on_matched,
+                     "on_offered_incompatible_qos": self._on_incompatible_qos}
+        if self._stats is not None:
+            callbacks["on_offered_deadline_missed"] = self._stats.on_deadline_missed
+        self._listener = Listener(**callbacks)
+        self._dw = DataWriter(self._dp, self._tp, qos, self._listener)
+        self._qos = qos
+        # tensors and RPC envelopes are accounted from the size of the samples actually written, see _reserve_payload()
+        self._chunks_per_payload = bulk_type(struct_type)
+        self._chunks = None if self._chunks_per_payload else reserve_chunks(topic, struct_type, qos, "Pub")
+        self._chunk_payload = 0
+        # fixed-size @final types are serialized in one struct.pack call instead of field by field
+        self._fast = fast_codec(struct_type)
+
+        # Octet-array types (camera frames) can be written straight from any buffer/ndarray:
+        # the payload is copied once into a preallocated CDR frame instead of bytes() + serialize().
+        self._buffer_field = get_buffer_field(struct_type)
+        self._frame = None
+        self._frame_lock = threading.Lock()
+
+        self._codec = None
+        self._zdw = None
+        self._array_shape = array_shape
+        self._array_dtype = array_dtype
+        if codec is not None:
+            if self._buffer_field is None:
+                raise TypeError(f"Pub for {topic}: codec needs an octet-array type, {struct_type.__name__} has none.")
+            self._codec = get_codec(codec)
+            if array_shape is not None and int(np.prod(array_shape)) * np.dtype(array_dtype).itemsize != self._buffer_field[1]:
+                raise ValueError(f"Pub for {topic}: array_shape {array_shape} of {np.dtype(array_dtype)} does not fill "
+                                 f"the {self._buffer_field[1]} bytes of {struct_type.__name__}.")
+            if isinstance(self._codec, JpegCodec) and (array_shape is None or len(array_shape) not in (2, 3)):
+                raise ValueError(f"Pub for {topic}: codec jpeg needs array_shape=(H, W) or (H, W, 3).")
+            self._ztp = acquire_topic(domain_id, compressed_topic(topic), CompressedFrame)
+            self._zdw = DataWriter(self._dp, self._ztp, qos)
+        self._clock = _acquire_clock(domain_id) if clock_sync else None
         logger.info(f"Domain: {domain_id} Pub for {topic} start.")
 
-    def write(self, info:idl.IdlStruct)->bool | None:
+    def write(self, info)->bool | None:
+        """
+        info: struct_type instance, or for octet-array types any buffer-protocol object / ndarray.
+        """
         # assert type(info) == self._struct_type, f"Pub for {self._topic} except type: {self._struct_type}, but {type(info)} was given."
         self.pre_communication()
-        self._dw.write(info)
+        if isinstance(info, idl.IdlStruct):
+            if self._fast is not None and type(info) is self._struct_type:
+                write_raw(self._dw, self._fast.serialize(info))
+            else:
+                self._dw.write(info)
+        else:
+            self._write_buffer(info)
+        if self._zdw is not None:
+            self._write_compressed(info)
+        if self._stats is not None:
+            self._stats.on_publish()
+        self.post_communication()
+
+    def _write_buffer(self, buf):
+        if self._buffer_field is None:
+            raise TypeError(f"Pub for {self._topic}: {self._struct_type.__name__} has no octet-array field to write a buffer into.")
+        view = as_byte_view(buf)
+        length = self._buffer_field[1]
+        if view.nbytes != length:
+            raise ValueError(f"Pub for {self._topic} expects {length} bytes, but {view.nbytes} were given.")
+        with self._frame_lock:
+            if self._frame is None:
+                self._frame = bytearray((CDR_HEADER_SIZE + length + 3) & ~3)
+                self._frame[:CDR_HEADER_SIZE] = CDR_LE_HEADER
+            self._frame[CDR_HEADER_SIZE:CDR_HEADER_SIZE + length] = view
+            write_raw(self._dw, self._frame)
+
+    def _write_compressed(self, info):
+        # encoding a frame costs milliseconds, skip it while no remote reader wants it
+        if self._zdw.get_publication_matched_status().current_count == 0:
+            return
+        if isinstance(info, idl.IdlStruct):
+            info = getattr(info, self._buffer_field[0])
+        if isinstance(info, np.ndarray) and (self._array_shape is None or info.shape == tuple(self._array_shape)):
+            array = info
+        elif self._array_shape is None:
+            array = np.frombuffer(as_byte_view(info), np.uint8)
+        else:
+            array = np.frombuffer(as_byte_view(info), self._array_dtype).reshape(self._array_shape)
+        write_raw(self._zdw, encode_frame(self._codec, array))
+
+    def write_array(self, array:np.ndarray, timestamp:int | None = None):
+        """
+        Publish any ndarray on a TeleaiTensor topic; shape, dtype and memory order travel with it.
+        timestamp: ns, stored in the message and used as the source timestamp, default now.
+        """
+        if self._struct_type is not TeleaiTensor:
+            raise TypeError(f"Pub for {self._topic}: write_array needs a TeleaiTensor topic, not {self._struct_type.__name__}.")
+        array = np.asarray(array)
+        if not (array.flags.c_contiguous or array.flags.f_contiguous):
+            array = np.ascontiguousarray(array)
+        if timestamp is None:
+            timestamp = get_nano()
+        self.pre_communication()
+        buf = tensor_pool.acquire(tensor_size(array))
+        try:
+            n = encode_tensor_into(buf, array, timestamp)
+            if n > self._chunk_payload:
+                self._reserve_payload(n)
+            write_raw(self._dw, memoryview(buf)[:n], timestamp)
+        finally:
+            tensor_pool.release(buf)
+        if self._stats is not None:
+            self._stats.on_publish()
         self.post_communication()
 
+    def _reserve_payload(self, nbytes:int):
+        # re-accounted only when the payload grows, so a pool that does not fit warns once per size step
+        with self._frame_lock:
+            if nbytes <= self._chunk_payload:
+                return
+            release_chunks(self._chunks)
+            self._chunks = reserve_chunks(self._topic, self._struct_type, self._qos, "Pub", nbytes)
+            self._chunk_payload = nbytes
+
+    def write_serialized(self, data, timestamp:int | None = None):
+        """
+        Publish an already serialized sample (CDR header included), e.g. one taken with take_raw or
+        read back from a recording. timestamp: source timestamp in ns, default now.
+        """
+        self.pre_communication()
+        if self._chunks_per_payload and len(data) > self._chunk_payload:
+            self._reserve_payload(len(data))
+        write_raw(self._dw, data, timestamp)
+        if self._stats is not None:
+            self._stats.on_publish()
+        self.post_communication()
+
+    def _on_matched(self, writer, status):
+        with self._matched:
+            self._matched.notify_all()
+
+    def _on_incompatible_qos(self, writer, status):
+        logger.warning(f"Pub for {self._topic}: a reader with incompatible QoS (policy id {status.last_policy_id}) "
+                       f"was not matched.")
+
+    @property
+    def matched_readers(self) -> int:
+        """
+        Readers currently matched, in this and other processes; 0 once closed.
+        """
+        dw = self._dw
+        return 0 if dw is None else dw.get_publication_matched_status().current_count
+
+    def wait_for_readers(self, n:int=1, timeout:float=None) -> bool:
+        """
+        Block until at least n readers are matched, e.g. before sending a first command.
+        Woken by discovery itself, so it returns as soon as the readers are known.
+        return: False if timeout (seconds) expired first, or the publisher was closed.
+        """
+        with self._matched:
+            self._matched.wait_for(lambda: self._dw is None or self.matched_readers >= n, timeout)
+            return self._dw is not None and self.matched_readers >= n
+
+    def stats(self) -> dict | None:
+        """
+        Snapshot of the metrics counters, None unless constructed with metrics=True.
+        """
+        return self._stats.stats() if self._stats is not None else None
+
+    def close(self):
+        """
+        Delete the writer and drop this wrapper's reference on the shared participant/topic.
+        """
+        if self._dw is None:
+            return
+        self._dw = None
+        # wake wait_for_readers() callers, they return False
+        with self._matched:
+            self._matched.notify_all()
+        self._tp = None
+        if self._zdw is not None:
+            self._zdw = None
+            self._ztp = None
+            release_topic(self._domain_id, compressed_topic(self._topic), CompressedFrame)
+        self._dp = None
+        release_chunks(self._chunks)
+        if self._clock is not None:
+            self._clock = None
+            _release_clock(self._domain_id)
+        release_topic(self._domain_id, self._topic, self._struct_type)
+        release_participant(self._domain_id)
+
     def pre_communication(self):
         pass
     def post_communication(self):
         pass
 
-class TeleaiCommonSub_1(object):
-    def __init__(self, domain_id:int, topic:str, struct_type:idl.IdlStruct, qos:Qos=None):
-        if not qos:
-            qos = Qos(
-                Policy.Reliability.Reliable(max_blocking_time=duration(milliseconds=0)),
-                Policy.Durability.Volatile,
-                Policy.History.KeepLast(1),
-                Policy.Deadline(duration(seconds=3600*24))
-            )
+_TAKE_BATCH = 64
+
+class _Decimator(object):
+    """
+    Drops samples on their SampleInfo alone, before the payload is decoded: keeps every nth
+    sample and/or at most max_rate samples per second of source time, per instance. The state
+    of an instance is dropped with its first not-alive sample (disposed, no writers left).
+    """
+    def __init__(self, max_rate:float=None, every_nth:int=None):
+        self._period = int(1e9 / max_rate) if max_rate else 0
+        self._nth = every_nth or 1
+        self._state = {}    # instance handle -> [samples seen, source timestamp the next one is due]
+        self.skipped = 0
+
+    def _accept(self, info) -> bool:
+        state = self._state.get(info.instance_handle)
+        if state is None:
+            state = self._state[info.instance_handle] = [0, 0]
+        state[0] += 1
+        if (state[0] - 1) % self._nth:
+            return False
+        if self._period:
+            ts = info.source_timestamp
+            if ts < state[1]:
+                return False
+            # due times advance on a fixed grid, so 30 Hz decimated to 5 Hz gives 5 Hz rather than
+            # 30/7 Hz; after a gap the grid restarts from this sample
+            state[1] = state[1] + self._period if ts - state[1] < self._period else ts + self._period
+        return True
+
+    def filter(self, samples:list) -> list:
+        """
+        samples: [(data, info), ...]; invalid samples (instance state changes) always pass.
+        """
+        kept = [(data, info) for data, info in samples if not info.valid_data or self._accept(info)]
+        self.skipped += len(samples) - len(kept)
+        for _, info in samples:
+            if info.instance_state != InstanceState.Alive:
+                self._state.pop(info.instance_handle, None)
+        return kept
+
+def _acquire_clock(domain_id:int):
+    # clock.py builds on the classes of this module
+    from teleai_dds_wrapper.wrapper.clock import acquire_clock
+    return acquire_clock(domain_id)
+
+def _release_clock(domain_id:int):
+    from teleai_dds_wrapper.wrapper.clock import release_clock
+    release_clock(domain_id)
+
+# decoded frames of a compressed subscriber are written round-robin into this many preallocated arrays
+_DECODE_BUFFERS = 3
+
+class _ReaderBase(object):
+    """
+    Reader setup, per-sample bookkeeping and teardown shared by the threaded subscribers
+    and AsyncTeleaiSub; they differ only in how samples are taken and handed out.
+    """
+    # instance states the reader takes; keyed readers also want dispose/no-writers notices
+    _INSTANCE_STATES = InstanceState.Alive
+
+    def _open_reader(self, domain_id:int, topic:str, struct_type:idl.IdlStruct, qos, callbacks:dict, role:str,
+                     metrics:bool=False, compressed:bool=False, clock_sync:bool=False, max_rate:float=None,
+                     every_nth:int=None, min_separation:float=None):
+        """
+        callbacks: Listener callbacks of the subclass, the metrics ones are added.
+        role: names the endpoint in mempool warnings.
+        """
+        qos = resolve_qos(qos, struct_type)
+        if min_separation:
+            qos = qos + Qos(Policy.TimeBasedFilter(duration(seconds=min_separation)))
+        self._domain_id = domain_id
         self._topic = topic
         self._struct_type = struct_type
-        self._dp = DomainParticipant(domain_id)
-        self._tp = Topic(self._dp, topic, struct_type)
-        self._dr = DataReader(self._dp, self._tp, qos)
-
-        self.msg = None
+        self._compressed = compressed
+        # what travels on the DDS topic
+        self._topic_name = compressed_topic(topic) if compressed else topic
+        self._sample_type = CompressedFrame if compressed else struct_type
+        self._dp = acquire_participant(domain_id)
+        self._tp = acquire_topic(domain_id, self._topic_name, self._sample_type)
+        self._stats = TopicStats(topic, "sub") if metrics else None
+        if self._stats is not None:
+            callbacks = dict(callbacks,
+                on_sample_lost=self._stats.on_sample_lost,
+                on_sample_rejected=self._stats.on_sample_rejected,
+                on_requested_deadline_missed=self._stats.on_deadline_missed,
+            )
+        self._listener = Listener(**callbacks)
+        self._dr = DataReader(self._dp, self._tp, qos, self._listener)
+        self._qos = qos
+        self._role = role
+        # tensors, compressed frames and RPC envelopes are accounted from the size of the samples received
+        self._chunks_per_payload = bulk_type(self._sample_type)
+        self._chunks = None if self._chunks_per_payload else reserve_chunks(topic, struct_type, qos, role)
+        self._chunk_payload = 0
+        self._fast = fast_codec(struct_type)
+        self._decimator = _Decimator(max_rate, every_nth) if max_rate or every_nth else None
 
-        self.lock = threading.Lock()
-        self._read_cmd_thread = threading.Thread(target=self._listen_cmd)
-        self._read_cmd_thread.daemon = True
-        self._read_cmd_thread.start()
-        
         self.last_recv_time:int = 0
+        self.last_latency:int = None
+        self._last_recv_mono = 0
         self.timeout_nano = duration(milliseconds=1000)
-        logger.info(f"Domain: {domain_id} Sub for {topic} start.")
+        self._clock = _acquire_clock(domain_id) if clock_sync else None
+
+    def _read_condition(self) -> ReadCondition:
+        # the decimator needs the not-alive notices to forget instances that are gone
+        states = InstanceState.Any if self._decimator is not None else self._INSTANCE_STATES
+        return ReadCondition(self._dr, ViewState.Any | states | SampleState.NotRead)
+
+    def _take_raw(self, condition, valid_only:bool=True) -> list:
+        """
+        return: [(serialized data, sample_info), ...] currently available, minus the samples
+                dropped by max_rate/every_nth.
+        """
+        samples = take_raw(self._dr, _TAKE_BATCH, condition)
+        if self._chunks_per_payload and samples:
+            nbytes = max(len(data) for data, _ in samples)
+            if nbytes > self._chunk_payload:
+                self._reserve_payload(nbytes)
+        if self._decimator is not None:
+            samples = self._decimator.filter(samples)
+        if valid_only:
+            samples = [(data, info) for data, info in samples if info.valid_data]
+        return samples
+
+    def _reserve_payload(self, nbytes:int):
+        release_chunks(self._chunks)
+        self._chunks = reserve_chunks(self._topic, self._sample_type, self._qos, self._role, nbytes)
+        self._chunk_payload = nbytes
+
+    def _received(self, info):
+        """
+        Per-sample bookkeeping: receive times, and the one-way latency, corrected for the
+        writer's clock offset with clock_sync.
+        """
+        self.last_recv_time = info.source_timestamp
+        self._last_recv_mono = get_mono_nano()
+        latency = get_nano() - info.source_timestamp
+        if self._clock is not None:
+            latency += self._clock.writer_offset(self._dr, info.publication_handle)
+        self.last_latency = latency
+        if self._stats is not None:
+            self._stats.on_receive(latency)
+
+    @property
+    def matched_writers(self) -> int:
+        """
+        Writers currently matched, in this and other processes; 0 once closed.
+        """
+        dr = self._dr
+        return 0 if dr is None else dr.get_subscription_matched_status().current_count
+
+    @property
+    def skipped(self) -> int:
+        """
+        Samples dropped by max_rate/every_nth.
+        """
+        return self._decimator.skipped if self._decimator is not None else 0
+
+    def stats(self) -> dict | None:
+        """
+        Snapshot of the metrics counters, None unless constructed with metrics=True.
+        """
+        return self._stats.stats() if self._stats is not None else None
 
-    def read(self)->idl.IdlStruct | None:
-        with self.lock:
-            return self.msg, self.last_recv_time
-    
-    def _listen_cmd(self):
-        for sample in self._dr.take_iter():
-            info = getattr(sample, "sample_info", None)
-            if info is None or not info.valid_data:
-                continue
-            msg = getattr(sample, "data", sample)
-
-            self.last_recv_time = info.source_timestamp
-            with self.lock:
-                self.pre_communication()
-                self.msg = msg
-                self.post_communication()
-            nano_sleep(duration(microseconds=100))
-  
     def isTimeout(self) -> bool:
-        return (get_nano() - self.last_recv_time) > self.timeout_nano
-    
-    def post_communication(self):
-        pass
+        """
+        No sample received for timeout_nano. Measured from the local (monotonic) receive time,
+        not the writer's source timestamp, so clock skew between hosts does not matter.
+        """
+        return (get_mono_nano() - self._last_recv_mono) > self.timeout_nano
 
-    def pre_communication(self):
-        pass
+    def _close_reader(self):
+        # delete the reader and drop this wrapper's references on the shared participant/topic
+        self._dr = None
+        self._tp = None
+        self._dp = None
+        release_chunks(self._chunks)
+        if self._clock is not None:
+            self._clock = None
+            _release_clock(self._domain_id)
+        release_topic(self._domain_id, self._topic_name, self._sample_type)
+        release_participant(self._domain_id)
 
-    def wait_for_connection(self):
-        while self.msg is None:
-            nano_sleep(duration(seconds=0.1))
-        nano_sleep(duration(seconds=0.1))
-
-class TeleaiCommonSub_1q(object):
-    def __init__(self, domain_id:int, topic:str, struct_type:idl.IdlStruct, qos:Qos=None):
-        if not qos:
-            qos = Qos(
-                Policy.Reliability.Reliable(max_blocking_time=duration(milliseconds=0)),
-                Policy.Durability.Volatile,
-                Policy.History.KeepLast(1),
-                Policy.Deadline(duration(seconds=3600*24))
-            )
-        self._domain_id = domain_id
-        self._topic = topic
-        self._struct_type = struct_type
-        self._dp = DomainParticipant(domain_id)
-        self._tp = Topic(self._dp, topic, struct_type)
-        self._dr = DataReader(self._dp, self._tp, qos)
+class _TeleaiSubBase(_ReaderBase):
+    """
+    Shared reader plumbing. The listen thread blocks on a WaitSet until data is available
+    (no sleep-polling) and wakes read(timeout=...) callers through a condition variable.
+    """
+    def __init__(self, domain_id:int, topic:str, struct_type:idl.IdlStruct, qos:Qos=None,
+                 array_shape:tuple=None, array_dtype=np.uint8, metrics:bool=False, compressed:bool=False,
+                 clock_sync:bool=False, max_rate:float=None, every_nth:int=None, min_separation:float=None):
+        """
+        qos: Qos, a profile name (see qos_profiles), "auto" for the size-based choice,
+             or None for the "legacy" default.
+        array_shape: if given, read() returns read-only ndarray views (e.g. (480, 640, 3))
+                     over the received octet-array payload instead of struct_type objects.
+        TeleaiTensor topics always yield read-only ndarray views (see read_array()).
+        compressed: read the encoded "<topic>/compressed" variant written by a publisher with codec=...;
+                    read() returns decoded ndarrays, reused after _DECODE_BUFFERS newer frames.
+        metrics: record receive rate, source-to-receive latency, overwritten/lost samples
+                 and deadline misses, see stats().
+        clock_sync: correct latencies (last_latency, stats()) for the clock offset of each sample's
+                    writer process, measured by the domain's clock ping/echo service (see clock.py).
+        max_rate: Hz, every_nth: keep 1 of n; for consumers of a fraction of a stream (previews, loggers).
+                  Applied per instance on the sample metadata, skipped samples are never decoded.
+        min_separation: seconds; DDS TIME_BASED_FILTER on the reader, closer samples are dropped
+                        before they reach the reader cache. Must not exceed the QoS deadline.
+        """
+        self._tensor = struct_type is TeleaiTensor
+        # matched-status changes wake wait_for_writers() callers
+        self._matched = threading.Condition()
+        callbacks = {"on_subscription_matched": self._on_matched,
+                     "on_requested_incompatible_qos": self._on_incompatible_qos}
+        self._open_reader(domain_id, topic, struct_type, qos, callbacks, "Sub", metrics=metrics,
+                          compressed=compressed, clock_sync=clock_sync, max_rate=max_rate,
+                          every_nth=every_nth, min_separation=min_separation)
 
-        self.q = deque(maxlen=1)
+        self._array_shape = array_shape
+        self._array_dtype = array_dtype
+        if array_shape is not None:
+            self._buffer_field = get_buffer_field(struct_type)
+            if self._buffer_field is None:
+                raise TypeError(f"Sub for {topic}: {struct_type.__name__} has no octet-array field to view as ndarray.")
+        self._decode_buffers = None
+        self._decode_index = 0
+
+        self.lock = threading.Lock()
+        self._new_data = threading.Condition(self.lock)
+        self._recv_count = 0
+        self._callbacks = []
+        self._closed = False
+        self._guard = GuardCondition(self._dp)
         self._read_cmd_thread = threading.Thread(target=self._listen_cmd)
         self._read_cmd_thread.daemon = True
         self._read_cmd_thread.start()
-        
-        self.last_recv_time:int = 0
-        self.timeout_nano = duration(milliseconds=1000)
         logger.info(f"Domain: {domain_id} Sub for {topic} start.")
 
-    def read(self)->idl.IdlStruct | None:
-        if self.q:
-            return self.q.popleft()  
-        else: 
-            return None
-    
     def _listen_cmd(self):
-        for sample in self._dr.take_iter():
-            info = getattr(sample, "sample_info", None)
-            if info is None or not info.valid_data:
+        waitset = WaitSet(self._dp)
+        condition = self._read_condition()
+        waitset.attach(condition)
+        waitset.attach(self._guard)
+        while not self._closed:
+            samples = self._take(condition)
+            if not samples:
+                waitset.wait(duration(infinite=True))
                 continue
-            msg = getattr(sample, "data", sample)
-
-            self.last_recv_time = info.source_timestamp
-            self.pre_communication()
-            self.q.append(msg)
-            self.post_communication()
-            nano_sleep(duration(milliseconds=1))
-  
-    def isTimeout(self) -> bool:
-        return (get_nano() - self.last_recv_time) > self.timeout_nano
-    
+            self._on_samples(samples)
+
+    def _on_samples(self, samples:list):
+        for msg, info in samples:
+            self._received(info)
+            with self._new_data:
+                self._store(msg)
+                self._recv_count += 1
+                self._new_data.notify_all()
+            self._run_callbacks(msg, info.source_timestamp)
+
+    def _run_callbacks(self, msg, ts:int):
+        # a raising callback must not end the listen thread, the subscriber would stop receiving
+        for callback in self._callbacks:
+            try:
+                callback(msg, ts)
+            except Exception as e:
+                logger.error(f"Sub for {self._topic}: callback {getattr(callback, '__name__', callback)} raised: {e!r}")
+
+    def add_callback(self, callback):
+        """
+        callback(msg, source_timestamp) runs on the listen thread for every received sample;
+        exceptions are logged.
+        """
+        self._callbacks = self._callbacks + [callback]
+
+    def remove_callback(self, callback):
+        self._callbacks = [c for c in self._callbacks if c is not callback]
+
+    def _take(self, condition) -> list:
+        """
+        return: [(msg, sample_info), ...] for every valid sample currently available.
+        """
+        if self._compressed:
+            frames = [(self._decode_frame(data), info) for data, info in self._take_raw(condition)]
+            return [(frame, info) for frame, info in frames if frame is not None]
+        if self._tensor:
+            # the ndarray is built over the received bytes from the header fields, data is never a list
+            return [(decode_tensor(data)[0], info) for data, info in self._take_raw(condition)]
+        if self._array_shape is None and self._fast is not None:
+            return [(self._fast.deserialize(data), info) for data, info in self._take_raw(condition)]
+        if self._array_shape is None and self._decimator is not None:
+            return [(self._struct_type.deserialize(data), info) for data, info in self._take_raw(condition)]
+        if self._array_shape is None:
+            return [(getattr(sample, "data", sample), sample.sample_info)
+                    for sample in self._dr.take(_TAKE_BATCH, condition)
+                    if sample.sample_info.valid_data]
+        # Skip deserialization: hand out an ndarray view over the received CDR bytes.
+        return [(array_view(data, self._array_shape, self._array_dtype,
+                            offset=CDR_HEADER_SIZE, nbytes=self._buffer_field[1]), info)
+                for data, info in self._take_raw(condition)]
+
+    def _decode_frame(self, data) -> np.ndarray | None:
+        """
+        return: the decoded frame, None (logged) if it cannot be decoded.
+        """
+        try:
+            shape, dtype = frame_shape(data)
+            buffers = self._decode_buffers
+            if buffers is None or buffers[0].shape != shape or buffers[0].dtype != dtype:
+                # first frame, or the publisher changed resolution/format
+                buffers = self._decode_buffers = [np.empty(shape, dtype) for _ in range(_DECODE_BUFFERS)]
+            out = buffers[self._decode_index]
+            self._decode_index = (self._decode_index + 1) % _DECODE_BUFFERS
+            decode_frame(data, out)
+            return out if self._array_shape is None else out.reshape(self._array_shape)
+        except Exception as e:
+            logger.error(f"Sub for {self._topic}: dropped a compressed frame that cannot be decoded: {e!r}")
+            return None
+
+    def _store(self, msg):
+        """
+        Keep msg for read(); subclasses that keep samples their own way override _on_samples instead.
+        """
+
+    def _on_matched(self, reader, status):
+        with self._matched:
+            self._matched.notify_all()
+
+    def _on_incompatible_qos(self, reader, status):
+        logger.warning(f"Sub for {self._topic}: a writer with incompatible QoS (policy id {status.last_policy_id}) "
+                       f"was not matched.")
+
+    def wait_for_writers(self, n:int=1, timeout:float=None) -> bool:
+        """
+        Block until at least n writers are matched; woken by discovery, no polling.
+        return: False if timeout (seconds) expired first, or the subscriber was closed.
+        """
+        with self._matched:
+            self._matched.wait_for(lambda: self._closed or self.matched_writers >= n, timeout)
+            return not self._closed and self.matched_writers >= n
+
+    def wait_for_connection(self, timeout:float=None) -> bool:
+        """
+        Block until the first sample has been received.
+        return: False if timeout (seconds) expired first; the log then says whether no writer
+                was matched yet or a matched writer has not sent anything.
+        """
+        with self._new_data:
+            self._new_data.wait_for(lambda: self._closed or self._recv_count > 0, timeout)
+            connected = self._recv_count > 0
+        if connected:
+            logger.info(f"Wait finished. Domain: {self._domain_id} Sub for {self._topic} connected")
+            return True
+        matched = self.matched_writers
+        if self._closed:
+            logger.warning(f"Domain: {self._domain_id} Sub for {self._topic}: closed while waiting for a connection.")
+        elif matched == 0:
+            logger.warning(f"Domain: {self._domain_id} Sub for {self._topic}: no writer matched within {timeout} s.")
+        else:
+            logger.warning(f"Domain: {self._domain_id} Sub for {self._topic}: {matched} writer(s) "
+                           f"matched but silent for {timeout} s.")
+        return False
+
+    def close(self):
+        """
+        Stop the listen thread, delete the reader and drop this wrapper's reference
+        on the shared participant/topic.
+        """
+        if self._closed:
+            return
+        self._closed = True
+        # wake every waiter, their predicates check _closed
+        with self._matched:
+            self._matched.notify_all()
+        with self._new_data:
+            self._new_data.notify_all()
+        self._guard.set(True)
+        self._read_cmd_thread.join()
+        self._guard = None
+        self._close_reader()
+
     def post_communication(self):
         pass
 
     def pre_communication(self):
         pass
 
-    def wait_for_connection(self):
-        while not self.q:
-            nano_sleep(duration(seconds=0.1))
-        nano_sleep(duration(seconds=0.1))
-        logger.info(f"Wait finished. Domain: {self._domain_id} Sub for {self._topic} connected")
+class TeleaiCommonSub_1(_TeleaiSubBase):
+    def __init__(self, domain_id:int, topic:str, struct_type:idl.IdlStruct, qos:Qos=None, **kwargs):
+        self.msg = None
+        self._read_count = 0
+        super().__init__(domain_id, topic, struct_type, qos, **kwargs)
+
+    def read(self, timeout:float=None)->tuple:
+        """
+        return: (latest msg, its source timestamp).
+        timeout: seconds; if given, block until a sample newer than the last read() arrives.
+                 (None, last_recv_time) is returned when none arrived in time.
+        """
+        with self._new_data:
+            if timeout is not None:
+                self._new_data.wait_for(lambda: self._closed or self._recv_count != self._read_count, timeout)
+                if self._recv_count == self._read_count:
+                    return None, self.last_recv_time
+            self._read_count = self._recv_count
+            return self.msg, self.last_recv_time
+
+    def read_array(self, timeout:float=None) -> tuple:
+        """
+        TeleaiTensor topics: (latest ndarray, its timestamp), same blocking rules as read().
+        """
+        if not self._tensor:
+            raise TypeError(f"Sub for {self._topic}: read_array needs a TeleaiTensor topic, not {self._struct_type.__name__}.")
+        return self.read(timeout)
+
+    def _store(self, msg):
+        self.pre_communication()
+        if self._stats is not None and self.msg is not None and self._recv_count != self._read_count:
+            self._stats.on_overwrite()
+        self.msg = msg
+        self.post_communication()
+
+class TeleaiCommonSub_1q(_TeleaiSubBase):
+    def __init__(self, domain_id:int, topic:str, struct_type:idl.IdlStruct, qos:Qos=None, **kwargs):
+        self.q = deque(maxlen=1)
+        super().__init__(domain_id, topic, struct_type, qos, **kwargs)
+
+    def read(self, timeout:float=None)->idl.IdlStruct | None:
+        """
+        Pop the latest msg, or None if nothing new arrived.
+        timeout: seconds; if given, block up to timeout for a new msg instead of returning None at once.
+        """
+        with self._new_data:
+            if not self.q and timeout is not None:
+                self._new_data.wait_for(lambda: self._closed or self.q, timeout)
+            if self.q:
+                return self.q.popleft()
+            else:
+                return None
+
+    def read_array(self, timeout:float=None) -> np.ndarray | None:
+        """
+        TeleaiTensor topics: pop the latest ndarray, or None, same blocking rules as read().
+        """
+        if not self._tensor:
+            raise TypeError(f"Sub for {self._topic}: read_array needs a TeleaiTensor topic, not {self._struct_type.__name__}.")
+        return self.read(timeout)
+
+    def _store(self, msg):
+        self.pre_communication()
+        if self._stats is not None and self.q:
+            self._stats.on_overwrite()
+        self.q.append(msg)
+        self.post_communication()
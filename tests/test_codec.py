@@ -0,0 +1,71 @@
+import struct
+
+import numpy as np
+import pytest
+
+from teleai_dds_wrapper.utils import codec
+from teleai_dds_wrapper.utils.codec import HEADER_SIZE, decode_header, decode_into, encode
+
+@pytest.mark.parametrize("name", ["raw", "zlib"])
+@pytest.mark.parametrize("array", [
+    np.arange(480 * 640 * 3, dtype=np.uint8).reshape(480, 640, 3),
+    np.linspace(0, 1, 12, dtype="<f4").reshape(3, 4),
+    np.linspace(0, 1, 12, dtype=">f4").reshape(3, 4),
+    np.arange(5, dtype=">i8"),
+], ids=["rgb", "f4_le", "f4_be", "i8_be"])
+def test_round_trip(name, array):
+    data = encode(name, array)
+    coder, shape, dtype = decode_header(data)
+    assert coder.name == name
+    assert shape == array.shape
+    # the byte order travels in the header, so a big-endian array is not reinterpreted as little-endian
+    assert dtype.str == array.dtype.str
+    decoded = decode_into(data)
+    assert decoded.dtype.str == array.dtype.str
+    np.testing.assert_array_equal(decoded, array)
+
+def test_decode_into_a_preallocated_array():
+    array = np.arange(24, dtype=np.uint16).reshape(4, 6)
+    out = np.empty((2, 12), np.uint16)
+    assert decode_into(encode("zlib", array), out) is out
+    np.testing.assert_array_equal(out.reshape(4, 6), array)
+    with pytest.raises(ValueError):
+        decode_into(encode("zlib", array), np.empty(24, np.uint8))
+
+def test_header_layout():
+    data = encode("raw", np.zeros((2, 3), ">u2"))
+    magic, version, codec_id, dtype, ndim, d0, d1, d2, size = struct.unpack_from("<2sBB3sBIIII", data)
+    assert HEADER_SIZE == 24
+    assert (magic, version, codec_id, dtype, ndim, d0, d1, d2, size) == (b"TC", 2, 0, b">u2", 2, 2, 3, 0, 12)
+
+def test_strided_input_is_encoded_contiguous():
+    array = np.arange(20, dtype=np.int32).reshape(4, 5)[:, ::2]
+    np.testing.assert_array_equal(decode_into(encode("zlib", array)), array)
+
+def test_rejected_inputs():
+    with pytest.raises(ValueError):
+        encode("zlib", np.zeros((1, 1, 1, 1)))
+    with pytest.raises(ValueError):
+        encode("zlib", np.zeros(3, "U16"))     # dtype.str does not fit the 3 header bytes
+    with pytest.raises(ValueError):
+        encode("brotli", np.zeros(3))
+    with pytest.raises(ValueError):
+        decode_header(b"XX" + encode("raw", np.zeros(3))[2:])
+
+def test_register_codec():
+    class _Negate(codec.Codec):
+        name, id = "test_negate", 200
+
+        def encode(self, array):
+            return (~array).tobytes()
+
+        def decode_into(self, payload, out):
+            out.reshape(-1)[:] = ~np.frombuffer(payload, out.dtype)
+
+    codec.register_codec(_Negate)
+    try:
+        array = np.arange(10, dtype=np.uint8)
+        np.testing.assert_array_equal(decode_into(encode("test_negate", array)), array)
+    finally:
+        del codec._CODECS[_Negate.name]
+        codec._instances.pop(_Negate.name, None)
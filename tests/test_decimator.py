@@ -0,0 +1,43 @@
+from types import SimpleNamespace
+
+from cyclonedds.core import InstanceState
+
+from teleai_dds_wrapper.wrapper.wrapper import _Decimator
+
+def _samples(rate:float, seconds:float, handle:int = 1, start:int = 0) -> list:
+    period = int(1e9 / rate)
+    return [(None, SimpleNamespace(valid_data=True, instance_state=InstanceState.Alive,
+                                   instance_handle=handle, source_timestamp=start + i * period))
+            for i in range(int(rate * seconds))]
+
+def test_max_rate_keeps_the_target_rate():
+    # 30 Hz -> 5 Hz: a grid of due times gives 5 Hz, restarting the wait at each kept sample would give 30/7 Hz
+    decimator = _Decimator(max_rate=5)
+    kept = decimator.filter(_samples(30, 3))
+    assert len(kept) == 15
+    assert decimator.skipped == 75
+
+def test_max_rate_restarts_the_grid_after_a_gap():
+    decimator = _Decimator(max_rate=5)
+    decimator.filter(_samples(30, 1))
+    kept = decimator.filter(_samples(30, 1, start=10 * 10**9))
+    assert kept[0][1].source_timestamp == 10 * 10**9
+    assert len(kept) == 5
+
+def test_every_nth():
+    decimator = _Decimator(every_nth=3)
+    kept = decimator.filter(_samples(30, 1))
+    assert [info.source_timestamp for _, info in kept] == [info.source_timestamp for _, info in _samples(30, 1)[::3]]
+
+def test_instances_are_decimated_separately():
+    decimator = _Decimator(every_nth=2)
+    kept = decimator.filter(_samples(10, 1, handle=1) + _samples(10, 1, handle=2))
+    assert len(kept) == 10
+
+def test_invalid_samples_pass_and_drop_the_instance_state():
+    decimator = _Decimator(max_rate=5)
+    decimator.filter(_samples(30, 1, handle=1) + _samples(30, 1, handle=2))
+    disposed = SimpleNamespace(valid_data=False, instance_state=InstanceState.NotAliveDisposed,
+                               instance_handle=1, source_timestamp=2 * 10**9)
+    assert decimator.filter([(None, disposed)]) == [(None, disposed)]
+    assert list(decimator._state) == [2]
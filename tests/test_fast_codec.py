@@ -0,0 +1,49 @@
+from dataclasses import dataclass
+
+import cyclonedds.idl as idl
+import cyclonedds.idl.annotations as annotate
+import cyclonedds.idl.types as types
+from cyclonedds.idl._support import Endianness
+import pytest
+
+from teleai_dds_wrapper.commonInfo.msg.dds_ import process_state, roboticArm_double_control_info, uint_1d
+from teleai_dds_wrapper.utils.fast_codec import fast_codec
+
+@dataclass
+@annotate.final
+class _Mixed(idl.IdlStruct, typename="tests.fast_codec.Mixed"):
+    flag: bool
+    stamp: types.int64                      # 8-byte member after a 1-byte one: XCDR1 and XCDR2 pad differently
+    q: types.array[types.float64, 3]
+    raw: types.array[types.byte, 5]
+    small: types.int16
+
+def _mixed() -> _Mixed:
+    return _Mixed(flag=True, stamp=-(1 << 40), q=[0.5, -1.25, 3e9], raw=b"\x01\x02\x03\x04\x05", small=-7)
+
+def _arm() -> roboticArm_double_control_info:
+    return roboticArm_double_control_info(left_arm_q=[i * 0.5 for i in range(7)], right_arm_q=[-i * 0.25 for i in range(7)],
+                                          left_gripper_action=1, right_gripper_action=255)
+
+@pytest.mark.parametrize("msg", [_mixed(), _arm(), uint_1d(data=200)])
+def test_serialize_matches_the_generic_codec(msg):
+    codec = fast_codec(type(msg))
+    assert codec is not None
+    data = msg.serialize()
+    assert codec.serialize(msg) == data
+    assert codec.size == len(data)
+    assert codec.deserialize(data) == msg
+
+@pytest.mark.parametrize("endianness", [Endianness.Little, Endianness.Big])
+@pytest.mark.parametrize("xcdr2", [False, True])
+def test_deserialize_any_encapsulation(endianness, xcdr2):
+    msg = _mixed()
+    data = msg.serialize(endianness=endianness, use_version_2=xcdr2)
+    assert fast_codec(_Mixed).deserialize(data) == msg
+
+def test_deserialize_accepts_a_memoryview():
+    msg = _arm()
+    assert fast_codec(type(msg)).deserialize(memoryview(msg.serialize())) == msg
+
+def test_keyed_and_variable_size_types_keep_the_generic_path():
+    assert fast_codec(process_state) is None
@@ -0,0 +1,58 @@
+import pytest
+
+from teleai_dds_wrapper.commonInfo.msg.dds_ import commonCamera_640480, float_7d, process_state
+from teleai_dds_wrapper.utils import mempool
+from teleai_dds_wrapper.wrapper.rpc import RpcEnvelope
+from teleai_dds_wrapper.wrapper.tensor import TeleaiTensor
+
+def test_payload_chunk_size_rounds_up_with_the_header():
+    assert mempool.payload_chunk_size(0) == mempool.MIN_CHUNK_SIZE
+    assert mempool.payload_chunk_size(256 - mempool.CHUNK_OVERHEAD) == 256
+    assert mempool.payload_chunk_size(256 - mempool.CHUNK_OVERHEAD + 1) == 512
+
+def test_chunk_size_per_type():
+    assert mempool.chunk_size(float_7d) == 256
+    assert mempool.chunk_size(commonCamera_640480) == 1 << 20
+    # strings/sequences are planned at the variable size
+    assert mempool.chunk_size(process_state) == mempool.payload_chunk_size(mempool.VARIABLE_SIZE)
+    assert mempool.chunk_size(process_state, 100) == 256
+
+def test_plan_groups_types_into_tiers():
+    specs = [{"type": float_7d, "publishers": 2, "subscribers": 3, "pub_depth": 4, "sub_depth": 1},
+             {"type": process_state, "max_bytes": 100},
+             {"type": commonCamera_640480}]
+    pools = mempool.plan_mempools(specs, headroom=2.0, min_count=1)
+    # float_7d: 2 * (4 + 1) + 3 * (1 + 1) = 16 chunks, process_state: 4, x2 headroom
+    assert pools == [{"size": 256, "count": 40, "types": ["float_7d", "process_state"]},
+                     {"size": 1 << 20, "count": 8, "types": ["commonCamera_640480"]}]
+    assert mempool.footprint(pools) == 256 * 40 + (1 << 20) * 8
+
+def test_plan_keeps_the_minimum_count():
+    pools = mempool.plan_mempools([{"type": float_7d}])
+    assert pools[0]["count"] == mempool.MIN_POOL_COUNT
+
+def test_toml_round_trip(tmp_path):
+    pools = mempool.plan_mempools([{"type": float_7d}, {"type": commonCamera_640480}], min_count=1)
+    path = tmp_path / "roudi.toml"
+    path.write_text(mempool.to_toml(pools))
+    assert mempool.read_mempools(str(path)) == [{"size": p["size"], "count": p["count"]} for p in pools]
+
+def test_bulk_types():
+    assert mempool.bulk_type(TeleaiTensor)
+    assert mempool.bulk_type(RpcEnvelope)
+    assert not mempool.bulk_type(float_7d)
+
+def test_bulk_types_are_planned_only_with_a_max_payload():
+    defaults = {"publishers": 1, "subscribers": 1, "pub_depth": 1, "sub_depth": 1}
+    assert "TeleaiTensor" not in mempool._type_defaults(defaults, 0)
+    with pytest.raises(ValueError, match="--max-payload"):
+        mempool._parse_spec("RpcEnvelope:1:1:1", mempool._type_defaults(defaults, 0))
+    by_name = mempool._type_defaults(defaults, 1000)
+    spec = mempool._parse_spec("TeleaiTensor:2:3:4", by_name)
+    assert (spec["publishers"], spec["subscribers"], spec["pub_depth"], spec["max_bytes"]) == (2, 3, 4, 1000)
+    assert mempool.plan_mempools([spec], min_count=1)[0]["size"] == mempool.payload_chunk_size(1000)
+
+def test_default_layout_has_no_large_tier(tmp_path):
+    path = tmp_path / "roudi.toml"
+    mempool.main(["--output", str(path)])
+    assert max(p["size"] for p in mempool.read_mempools(str(path))) == 1 << 20
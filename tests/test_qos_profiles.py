@@ -0,0 +1,79 @@
+from cyclonedds.qos import Qos, Policy
+from cyclonedds.util import duration
+import pytest
+
+from teleai_dds_wrapper.commonInfo.msg.dds_ import commonCamera_640480, float_7d
+from teleai_dds_wrapper.wrapper.qos_profiles import _PROFILES, load_qos_profiles, qos_profile, resolve_qos
+
+@pytest.fixture(autouse=True)
+def _restore_profiles():
+    saved = dict(_PROFILES)
+    yield
+    _PROFILES.clear()
+    _PROFILES.update(saved)
+
+def test_toml(tmp_path):
+    path = tmp_path / "qos.toml"
+    path.write_text('[profiles.cam_remote]\nbase = "sensor"\nhistory = 2\nlifespan_ms = 100\n\n'
+                    '[profiles.log]\nreliability = "reliable"\nmax_blocking_ms = 50\ndurability = "transient_local"\nhistory = "all"\n')
+    assert load_qos_profiles(str(path)) == ["cam_remote", "log"]
+    qos = qos_profile("cam_remote")
+    assert qos[Policy.Reliability] == Policy.Reliability.BestEffort
+    assert qos[Policy.History] == Policy.History.KeepLast(2)
+    assert qos[Policy.Lifespan] == Policy.Lifespan(duration(milliseconds=100))
+    qos = qos_profile("log")
+    assert qos[Policy.Reliability] == Policy.Reliability.Reliable(max_blocking_time=duration(milliseconds=50))
+    assert qos[Policy.Durability] == Policy.Durability.TransientLocal
+    assert qos[Policy.History] == Policy.History.KeepAll
+
+_XML = """<dds{xmlns}><qos_library name="lib">
+<qos_profile name="arm" base_name="lib::control">
+  <datawriter_qos>
+    <reliability><kind>RELIABLE_RELIABILITY_QOS</kind>
+      <max_blocking_time><sec>0</sec><nanosec>5000000</nanosec></max_blocking_time></reliability>
+    <history><kind>KEEP_LAST_HISTORY_QOS</kind><depth>4</depth></history>
+    <deadline><period><sec>DURATION_INFINITY</sec></period></deadline>
+  </datawriter_qos>
+  <datareader_qos>
+    <durability><kind>TRANSIENT_LOCAL_DURABILITY_QOS</kind></durability>
+    <latency_budget><duration><sec>1</sec><nanosec>500000000</nanosec></duration></latency_budget>
+  </datareader_qos>
+</qos_profile>
+</qos_library></dds>
+"""
+
+@pytest.mark.parametrize("xmlns", ["", ' xmlns="http://www.omg.org/dds/"'], ids=["plain", "namespaced"])
+def test_xml(tmp_path, xmlns):
+    path = tmp_path / "qos.xml"
+    path.write_text(_XML.format(xmlns=xmlns))
+    assert load_qos_profiles(str(path)) == ["arm"]
+    qos = qos_profile("arm")
+    assert qos[Policy.Reliability] == Policy.Reliability.Reliable(max_blocking_time=duration(milliseconds=5))
+    assert qos[Policy.History] == Policy.History.KeepLast(4)
+    assert qos[Policy.Durability] == Policy.Durability.TransientLocal
+    assert qos[Policy.LatencyBudget] == Policy.LatencyBudget(duration(milliseconds=1500))
+    # an infinite deadline sets nothing: the base profile ("control") has none
+    assert qos[Policy.Deadline] is None
+
+def test_files_without_profiles_are_rejected(tmp_path):
+    path = tmp_path / "empty.xml"
+    path.write_text("<dds><qos_library name='lib'/></dds>")
+    with pytest.raises(ValueError):
+        load_qos_profiles(str(path))
+
+def test_bad_values_are_rejected(tmp_path):
+    path = tmp_path / "qos.toml"
+    path.write_text('[profiles.x]\nreliability = "sometimes"\n')
+    with pytest.raises(ValueError):
+        load_qos_profiles(str(path))
+
+def test_resolve_qos():
+    assert resolve_qos(None, float_7d) == qos_profile("legacy")
+    assert resolve_qos("auto", commonCamera_640480) == qos_profile("sensor")
+    assert resolve_qos("auto", float_7d) == qos_profile("control")
+    assert resolve_qos("bulk", float_7d, depth=3)[Policy.History] == Policy.History.KeepLast(3)
+    qos = Qos(Policy.Reliability.BestEffort)
+    assert resolve_qos(qos, float_7d) is qos
+    assert resolve_qos(qos, float_7d, depth=2)[Policy.History] == Policy.History.KeepLast(2)
+    with pytest.raises(ValueError):
+        resolve_qos("fast", float_7d)
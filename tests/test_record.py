@@ -0,0 +1,94 @@
+import json
+import os
+import time
+
+import numpy as np
+import pytest
+
+from teleai_dds_wrapper.commonInfo.msg.dds_ import float_7d, uint_100d
+from teleai_dds_wrapper.wrapper.record import TeleaiLog, TeleaiRecorder, _ALIGN, _INDEX_DTYPE, _INDEX_FILE, _META_FILE
+from teleai_dds_wrapper.wrapper.raw import CDR_HEADER_SIZE
+from teleai_dds_wrapper.wrapper.wrapper import TeleaiCommonPub_1
+
+DOMAIN = 41
+
+def _wait(predicate, timeout:float = 5.0):
+    deadline = time.monotonic() + timeout
+    while not predicate() and time.monotonic() < deadline:
+        time.sleep(0.01)
+    assert predicate()
+
+@pytest.fixture
+def recording(tmp_path):
+    """
+    A closed recording of 10 float_7d and 5 uint_100d samples, interleaved.
+    return: (path, [(topic, msg), ...] in write order)
+    """
+    path = str(tmp_path / "run")
+    rec = TeleaiRecorder(path, DOMAIN, {"arm": float_7d, "raw": uint_100d})
+    arm = TeleaiCommonPub_1(DOMAIN, "arm", float_7d)
+    raw = TeleaiCommonPub_1(DOMAIN, "raw", uint_100d)
+    assert arm.wait_for_readers(1, 5) and raw.wait_for_readers(1, 5)
+    written = []
+    for i in range(10):
+        msg = float_7d(data=[i + j / 4 for j in range(7)])     # exact in float32
+        arm.write(msg)
+        written.append(("arm", msg))
+        # one sample in flight at a time, so the receive order is the write order
+        _wait(lambda: rec.count == len(written))
+        if i % 2:
+            msg = uint_100d(data=bytes((i + j) % 256 for j in range(100)))
+            raw.write(msg)
+            written.append(("raw", msg))
+            _wait(lambda: rec.count == len(written))
+    arm.close()
+    raw.close()
+    rec.close()
+    return path, written
+
+def test_index_rows_point_at_the_serialized_samples(recording):
+    path, written = recording
+    log = TeleaiLog(path)
+    assert len(log) == len(written)
+    assert log.meta["count"] == len(written)
+    for i, (topic, msg) in enumerate(written):
+        assert log.topic(i) == topic
+        assert bytes(log.raw(i)) == msg.serialize()
+        assert log.sample(i) == msg
+        # sample bodies start on an aligned offset, so array views are aligned
+        assert (log.index[i]["offset"] + CDR_HEADER_SIZE) % _ALIGN == 0
+    assert np.all(np.diff(log.index["recv_ts"]) >= 0)
+    log.close()
+
+def test_topic_queries(recording):
+    path, written = recording
+    log = TeleaiLog(path)
+    raw = log.indices("raw")
+    assert [log.topic(i) for i in raw] == ["raw"] * 5
+    last = int(log.index["recv_ts"][-1])
+    assert log.at(last, "arm") == max(log.indices("arm"))
+    assert log.at(int(log.index["recv_ts"][0]) - 1, "arm") is None
+    np.testing.assert_array_equal(log.array(raw[0]), np.frombuffer(written[2][1].data, np.uint8))
+    with pytest.raises(KeyError):
+        log.indices("camera")
+    log.close()
+
+def test_a_killed_recording_is_readable(recording):
+    path, written = recording
+    # as a recorder killed mid-run leaves it: meta.json from the start, a partial last index row
+    with open(os.path.join(path, _META_FILE)) as f:
+        meta = json.load(f)
+    meta["end_time"] = meta["count"] = None
+    with open(os.path.join(path, _META_FILE), "w") as f:
+        json.dump(meta, f)
+    with open(os.path.join(path, _INDEX_FILE), "ab") as f:
+        f.write(b"\x00" * (_INDEX_DTYPE.itemsize // 2))
+    log = TeleaiLog(path)
+    assert len(log) == len(written)
+    assert log.sample(len(log) - 1) == written[-1][1]
+    log.close()
+
+def test_a_recording_is_not_overwritten(recording):
+    path, _ = recording
+    with pytest.raises(FileExistsError):
+        TeleaiRecorder(path, DOMAIN, {"arm": float_7d})
@@ -0,0 +1,59 @@
+import threading
+import time
+
+from teleai_dds_wrapper.wrapper.scheduler import TeleaiScheduler
+
+def test_rate():
+    sched = TeleaiScheduler()
+    sched.add(lambda: None, 200, "tick")
+    sched.start()
+    time.sleep(0.5)
+    sched.stop()
+    stats = sched.stats()[0]
+    # deadlines on a fixed grid: a late wake-up skips periods rather than adding runs
+    assert 80 <= stats["runs"] + stats["skipped"] <= 101
+
+def test_add_wakes_an_idle_scheduler():
+    sched = TeleaiScheduler()
+    sched.start()
+    time.sleep(0.05)
+    ran = threading.Event()
+    added = time.monotonic()
+    sched.add(ran.set, 100)
+    assert ran.wait(1.0)
+    # first deadline is one period (10 ms) after add()
+    assert time.monotonic() - added < 0.05
+    sched.stop()
+
+def test_add_preempts_a_long_sleep():
+    sched = TeleaiScheduler()
+    sched.add(lambda: None, 0.5)        # next deadline 2 s away
+    sched.start()
+    time.sleep(0.05)
+    ran = threading.Event()
+    added = time.monotonic()
+    sched.add(ran.set, 50)
+    assert ran.wait(1.0)
+    assert time.monotonic() - added < 0.1
+    sched.stop()
+
+def test_stop_does_not_wait_out_the_sleep():
+    sched = TeleaiScheduler()
+    sched.add(lambda: None, 0.5)
+    sched.start()
+    time.sleep(0.05)
+    stopped = time.monotonic()
+    sched.stop()
+    assert time.monotonic() - stopped < 0.1
+
+def test_removed_tasks_stop_running():
+    sched = TeleaiScheduler()
+    runs = []
+    task = sched.add(lambda: runs.append(1), 100)
+    sched.start()
+    time.sleep(0.1)
+    sched.remove(task)
+    n = len(runs)
+    time.sleep(0.1)
+    sched.stop()
+    assert n > 0 and len(runs) <= n + 1
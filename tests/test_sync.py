@@ -0,0 +1,87 @@
+import pytest
+
+from teleai_dds_wrapper.wrapper.sync import TeleaiSync
+
+MS = 10**6
+
+class _FakeSub(object):
+    """
+    Stands in for a threaded subscriber: publish() runs the callbacks like the listen thread would.
+    """
+    def __init__(self, topic:str):
+        self._topic = topic
+        self._callbacks = []
+
+    def add_callback(self, callback):
+        self._callbacks.append(callback)
+
+    def remove_callback(self, callback):
+        self._callbacks.remove(callback)
+
+    def publish(self, msg, ts:int):
+        for callback in list(self._callbacks):
+            callback(msg, ts)
+
+def _feed(events:list):
+    # events: (sub, msg, ts) in arrival order
+    for sub, msg, ts in events:
+        sub.publish(msg, ts)
+
+def test_camera_matches_the_nearest_arm_state():
+    cam, arm = _FakeSub("camera"), _FakeSub("arm")
+    matches = []
+    sync = TeleaiSync([cam, arm], slop=0.005, callback=lambda msgs, stamps: matches.append((msgs, stamps)))
+    # arm at 1 kHz, camera every 33 ms and slightly off the arm grid
+    events = [(arm, f"arm{t}", t * MS) for t in range(100)]
+    for i, t in enumerate((10, 43, 76)):
+        events.insert(t + 1 + i, (cam, f"cam{t}", t * MS + MS // 3))
+    _feed(events)
+    assert [msgs for msgs, _ in matches] == [("cam10", "arm10"), ("cam43", "arm43"), ("cam76", "arm76")]
+    assert sync.matched == 3 and sync.dropped == 0
+
+def test_pivot_waits_for_the_other_topic_to_catch_up():
+    a, b = _FakeSub("a"), _FakeSub("b")
+    sync = TeleaiSync([a, b], slop=0.01)
+    _feed([(a, "a0", 100 * MS), (b, "b0", 95 * MS)])
+    # b0 is within slop, but b has not reached the pivot time yet: a later b sample may be nearer
+    assert sync.read() is None
+    _feed([(b, "b1", 101 * MS)])
+    assert sync.read() == (("a0", "b1"), (100 * MS, 101 * MS))
+
+def test_unmatched_pivot_samples_are_dropped():
+    a, b = _FakeSub("a"), _FakeSub("b")
+    sync = TeleaiSync([a, b], slop=0.001)
+    _feed([(a, "a0", 0), (b, "b0", 50 * MS), (a, "a1", 50 * MS)])
+    assert sync.read() == (("a1", "b0"), (50 * MS, 50 * MS))
+    assert sync.dropped == 1
+
+def test_exact_policy_requires_identical_stamps():
+    a, b = _FakeSub("a"), _FakeSub("b")
+    sync = TeleaiSync([a, b], policy="exact")
+    _feed([(a, "a0", 10), (b, "b0", 11), (a, "a1", 20), (b, "b1", 20)])
+    assert sync.read() == (("a1", "b1"), (20, 20))
+
+def test_out_of_order_samples_are_sorted():
+    a, b = _FakeSub("a"), _FakeSub("b")
+    sync = TeleaiSync([a, b], slop=0.001)
+    _feed([(b, "b1", 20 * MS), (b, "b0", 10 * MS), (a, "a0", 10 * MS)])
+    assert sync.read() == (("a0", "b0"), (10 * MS, 10 * MS))
+
+def test_read_returns_the_newest_set_once():
+    a, b = _FakeSub("a"), _FakeSub("b")
+    sync = TeleaiSync([a, b], slop=0.001)
+    _feed([(a, "a0", 0), (b, "b0", 0), (a, "a1", MS), (b, "b1", MS)])
+    assert sync.read(timeout=0.1)[0] == ("a1", "b1")
+    assert sync.read() is None
+
+def test_close_detaches_from_the_subscribers():
+    a, b = _FakeSub("a"), _FakeSub("b")
+    sync = TeleaiSync([a, b])
+    sync.close()
+    assert a._callbacks == [] and b._callbacks == []
+
+def test_arguments_are_checked():
+    with pytest.raises(ValueError):
+        TeleaiSync([_FakeSub("a")])
+    with pytest.raises(ValueError):
+        TeleaiSync([_FakeSub("a"), _FakeSub("b")], policy="nearest")
@@ -0,0 +1,49 @@
+import numpy as np
+from cyclonedds.idl._support import Endianness
+import pytest
+
+from teleai_dds_wrapper.wrapper.tensor import TeleaiTensor, decode_tensor, encode_tensor_into, tensor_size
+
+def _roundtrip(array:np.ndarray) -> tuple:
+    buf = bytearray(tensor_size(array))
+    n = encode_tensor_into(buf, array, 123)
+    return decode_tensor(bytes(buf[:n]))
+
+@pytest.mark.parametrize("array", [
+    np.arange(24, dtype=np.float32).reshape(2, 3, 4),
+    np.asfortranarray(np.arange(12, dtype=np.int64).reshape(3, 4)),
+    np.arange(6, dtype=">u2"),
+    np.array(3.5),
+    np.zeros((0, 5), np.float64),
+], ids=["c_order", "f_order", "big_endian", "scalar", "empty"])
+def test_encode_decode(array):
+    decoded, timestamp = _roundtrip(array)
+    assert timestamp == 123
+    assert decoded.dtype == array.dtype
+    assert decoded.shape == array.shape
+    assert decoded.strides == array.strides
+    np.testing.assert_array_equal(decoded, array)
+
+def test_encoding_matches_serialize():
+    array = np.asfortranarray(np.arange(12, dtype=np.float32).reshape(3, 4))
+    buf = bytearray(tensor_size(array))
+    n = encode_tensor_into(buf, array, 7)
+    msg = TeleaiTensor(timestamp=7, dtype=array.dtype.str, shape=list(array.shape), strides=list(array.strides),
+                       data=array.reshape(-1, order="A").view(np.uint8).tobytes())
+    assert bytes(buf[:n]) == msg.serialize()
+
+@pytest.mark.parametrize("endianness", [Endianness.Little, Endianness.Big])
+@pytest.mark.parametrize("xcdr2", [False, True])
+def test_decode_strided_tensor_from_any_encapsulation(endianness, xcdr2):
+    # every other column of a 4x6 block: the strides describe a layout that is neither C nor F order
+    base = np.arange(24, dtype=np.int32).reshape(4, 6)
+    expected = base[:, ::2]
+    msg = TeleaiTensor(timestamp=-1, dtype=base.dtype.str, shape=list(expected.shape), strides=list(expected.strides),
+                       data=base.tobytes())
+    decoded, timestamp = decode_tensor(msg.serialize(endianness=endianness, use_version_2=xcdr2))
+    assert timestamp == -1
+    np.testing.assert_array_equal(decoded, expected)
+
+def test_decoded_array_is_a_read_only_view():
+    decoded, _ = _roundtrip(np.ones(4, np.uint8))
+    assert not decoded.flags.writeable